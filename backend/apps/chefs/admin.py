@@ -1,9 +1,10 @@
 from django.contrib import admin
+from core.admin import ShardedModelAdmin
 from .models import ChefProfile
 
 
 @admin.register(ChefProfile)
-class ChefProfileAdmin(admin.ModelAdmin):
+class ChefProfileAdmin(ShardedModelAdmin):
     list_display = ['user', 'organization', 'default_pay_rate', 'calendar_color', 'is_active']
     list_filter = ['membership__organization', 'membership__is_active']
     search_fields = ['membership__user__email', 'membership__user__first_name']
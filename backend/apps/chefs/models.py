@@ -1,4 +1,5 @@
 from django.db import models
+from core.identity import resolve
 from apps.organizations.models import OrganizationMembership
 
 
@@ -48,15 +49,15 @@ class ChefProfile(models.Model):
     
     @property
     def user(self):
-        return self.membership.user
+        return resolve(resolve(self, 'membership'), 'user')
     
     @property
     def organization(self):
-        return self.membership.organization
+        return resolve(resolve(self, 'membership'), 'organization')
     
     @property
     def is_active(self):
-        return self.membership.is_active
+        return resolve(self, 'membership').is_active
     
     def __str__(self):
         return f'{self.user.full_name} - {self.organization.name}'
@@ -1,14 +1,22 @@
-from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
+from rest_framework import serializers
 from apps.organizations.models import OrganizationMembership
 from apps.users.models import InvitationToken
 from core.email import send_chef_invitation_email
+from core.fields import BatchedListSerializer
+from core.fieldsets import SparseFieldsMixin
 from .models import ChefProfile
 
 User = get_user_model()
 
 
-class ChefProfileSerializer(serializers.ModelSerializer):
+def with_event_count(queryset):
+    """`queryset` annotated with the `event_count` the serializer reports, instead of a count per row."""
+    return queryset.annotate(event_count=models.Count('events', filter=models.Q(events__is_deleted=False)))
+
+
+class ChefProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Use ChefProfile.id (not membership.id) so it matches what Event.chef expects
     email = serializers.EmailField(source='user.email', read_only=True)
     first_name = serializers.CharField(source='user.first_name', read_only=True)
@@ -27,11 +35,25 @@ class ChefProfileSerializer(serializers.ModelSerializer):
             'is_active', 'has_accepted_invite', 'event_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'calendar_color', 'event_count', 'created_at', 'updated_at']
+        list_serializer_class = BatchedListSerializer
+        sparse_sources = {
+            'email': ['membership__user__email'],
+            'first_name': ['membership__user__first_name'],
+            'last_name': ['membership__user__last_name'],
+            'full_name': ['membership__user__first_name', 'membership__user__last_name'],
+            'phone': ['membership__user__phone'],
+            'is_active': ['membership__is_active'],
+            'has_accepted_invite': ['membership__user__password'],
+            # Annotated by with_event_count, or counted with a query of its own
+            'event_count': [],
+        }
 
     def get_has_accepted_invite(self, obj):
         return obj.user.has_usable_password()
 
     def get_event_count(self, obj):
+        if hasattr(obj, 'event_count'):
+            return obj.event_count
         return obj.events.filter(is_deleted=False).count()
 
 
@@ -0,0 +1,36 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.testing import api_client, make_chef, make_client, make_event, make_organization
+
+
+class ChefListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, cls.admin = make_organization()
+        cls.client_row = make_client(cls.organization)
+
+    def get_chefs(self):
+        api = api_client(self.admin)
+        api.get('/api/chefs/')  # Warms the user and shard caches
+        with CaptureQueriesContext(connection) as queries:
+            response = api.get('/api/chefs/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), {chef['first_name']: chef for chef in response.json()}
+
+    def test_queries_do_not_grow_with_chefs(self):
+        busy = make_chef(self.organization, 'Busy')
+        make_event(self.client_row, busy)
+        make_event(self.client_row, busy)
+        make_event(self.client_row, busy).soft_delete()
+        few, _ = self.get_chefs()
+        for name in ('Idle', 'Other', 'Third'):
+            make_event(self.client_row, make_chef(self.organization, name))
+        many, chefs = self.get_chefs()
+
+        self.assertEqual(few, many)
+        self.assertEqual(chefs['Busy']['event_count'], 2)
+        self.assertEqual(chefs['Idle']['event_count'], 1)
+        self.assertEqual(chefs['Busy']['email'], f'busy@{self.organization.slug}.test')
+        self.assertTrue(chefs['Busy']['is_active'])
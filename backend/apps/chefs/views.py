@@ -2,6 +2,7 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from core.fieldsets import SparseQuerysetMixin
 from core.mixins import TenantMixin
 from core.permissions import IsAdmin
 from core.email import send_chef_invitation_email
@@ -11,20 +12,22 @@ from .serializers import (
     ChefProfileSerializer,
     ChefProfileUpdateSerializer,
     ChefInviteSerializer,
-    ChefSelfSerializer
+    ChefSelfSerializer,
+    with_event_count,
 )
 
 
-class ChefListView(TenantMixin, generics.ListAPIView):
+class ChefListView(SparseQuerysetMixin, TenantMixin, generics.ListAPIView):
     serializer_class = ChefProfileSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     
     def get_queryset(self):
         if not self.request.organization:
             return ChefProfile.objects.none()
-        return ChefProfile.objects.filter(
+        # Joins replaced by batched loading where the list serializer can (see core/fields.py)
+        return with_event_count(ChefProfile.objects.filter(
             membership__organization=self.request.organization
-        ).select_related('membership__user')
+        )).select_related('membership__user')
 
 
 class ChefInviteView(TenantMixin, generics.CreateAPIView):
@@ -42,18 +45,18 @@ class ChefInviteView(TenantMixin, generics.CreateAPIView):
         )
 
 
-class ChefDetailView(TenantMixin, generics.RetrieveUpdateAPIView):
+class ChefDetailView(SparseQuerysetMixin, TenantMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated, IsAdmin]
     
     def get_queryset(self):
         if not self.request.organization:
             return ChefProfile.objects.none()
-        return ChefProfile.objects.filter(
+        return with_event_count(ChefProfile.objects.filter(
             membership__organization=self.request.organization
-        ).select_related('membership__user')
+        )).select_related('membership__user')
     
     def get_object(self):
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
         return generics.get_object_or_404(queryset, id=self.kwargs['pk'])
     
     def get_serializer_class(self):
@@ -1,9 +1,25 @@
 from django.contrib import admin
-from .models import Client
+from core.admin import ShardedModelAdmin
+from .models import ArchivedClient, Client
 
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ShardedModelAdmin):
     list_display = ['name', 'email', 'phone', 'organization', 'is_deleted', 'created_at']
     list_filter = ['organization', 'is_deleted']
     search_fields = ['name', 'email', 'phone']
+
+
+@admin.register(ArchivedClient)
+class ArchivedClientAdmin(ShardedModelAdmin):
+    list_display = ['name', 'organization', 'deleted_at', 'archived_at']
+    list_filter = ['organization']
+    search_fields = ['name']
+    # Restores go through manage.py restore_archive
+    exclude = ['payload']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('organizations', '0003_organization_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedClient',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_clients', to='organizations.organization')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
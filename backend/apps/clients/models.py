@@ -28,3 +28,22 @@ class Client(models.Model):
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.save()
+
+
+class ArchivedClient(models.Model):
+    """
+    A soft-deleted client moved out of the live table (see
+    apps/events/archive.py). The full row is kept compressed in `payload`.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='archived_clients')
+    name = models.CharField(max_length=200)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
@@ -1,9 +1,15 @@
 from django.db import models
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsMixin
 from .models import Client
 
 
-class ClientSerializer(serializers.ModelSerializer):
+def with_event_count(queryset):
+    """`queryset` annotated with the `event_count` the serializer reports, instead of a count per row."""
+    return queryset.annotate(event_count=models.Count('events', filter=models.Q(events__is_deleted=False)))
+
+
+class ClientSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     event_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -13,8 +19,12 @@ class ClientSerializer(serializers.ModelSerializer):
             'allergies', 'notes', 'event_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'event_count', 'created_at', 'updated_at']
+        # Annotated by with_event_count, or counted with a query of its own
+        sparse_sources = {'event_count': []}
     
     def get_event_count(self, obj):
+        if hasattr(obj, 'event_count'):
+            return obj.event_count
         return obj.events.filter(is_deleted=False).count()
 
 
@@ -23,6 +33,7 @@ class ClientDetailSerializer(ClientSerializer):
     
     class Meta(ClientSerializer.Meta):
         fields = ClientSerializer.Meta.fields + ['total_revenue']
+        sparse_sources = {**ClientSerializer.Meta.sparse_sources, 'total_revenue': []}
     
     def get_total_revenue(self, obj):
         request = self.context.get('request')
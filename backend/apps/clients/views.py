@@ -1,12 +1,13 @@
 from rest_framework import generics, filters
 from rest_framework.permissions import IsAuthenticated
+from core.fieldsets import SparseQuerysetMixin
 from core.mixins import TenantQuerysetMixin
 from core.permissions import IsAdminOrReadOnly
 from .models import Client
-from .serializers import ClientSerializer, ClientDetailSerializer
+from .serializers import ClientSerializer, ClientDetailSerializer, with_event_count
 
 
-class ClientListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
+class ClientListCreateView(SparseQuerysetMixin, TenantQuerysetMixin, generics.ListCreateAPIView):
     queryset = Client.objects.filter(is_deleted=False)
     serializer_class = ClientSerializer
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
@@ -15,11 +16,14 @@ class ClientListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
     
+    def get_queryset(self):
+        return with_event_count(super().get_queryset())
+    
     def perform_create(self, serializer):
         serializer.save(organization=self.request.organization)
 
 
-class ClientDetailView(TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+class ClientDetailView(SparseQuerysetMixin, TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Client.objects.filter(is_deleted=False)
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     
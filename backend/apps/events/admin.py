@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Event
+from core.admin import ShardedModelAdmin
+from .models import ArchivedEvent, ChefPayout, Event, PayoutRun
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(ShardedModelAdmin):
     list_display = ['display_name', 'client', 'chef_name', 'date', 'status', 'client_pay', 'is_deleted']
     list_filter = ['status', 'is_deleted', 'organization', 'date']
     search_fields = ['name', 'client__name']
@@ -12,3 +13,34 @@ class EventAdmin(admin.ModelAdmin):
     def chef_name(self, obj):
         return obj.chef.user.full_name if obj.chef else '-'
     chef_name.short_description = 'Chef'
+
+
+class ChefPayoutInline(admin.TabularInline):
+    model = ChefPayout
+    extra = 0
+    readonly_fields = ['chef', 'amount', 'event_count', 'created_at']
+    fields = ['chef', 'amount', 'event_count', 'paid_at', 'created_at']
+
+
+@admin.register(PayoutRun)
+class PayoutRunAdmin(ShardedModelAdmin):
+    list_display = ['__str__', 'organization', 'event_count', 'total_amount', 'created_at']
+    list_filter = ['organization']
+    readonly_fields = ['period_start', 'period_end', 'event_count', 'total_amount', 'created_by']
+    inlines = [ChefPayoutInline]
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(ShardedModelAdmin):
+    list_display = ['__str__', 'organization', 'date', 'status', 'client_pay', 'is_deleted', 'archived_at']
+    list_filter = ['status', 'is_deleted', 'organization']
+    search_fields = ['client_label']
+    date_hierarchy = 'date'
+    # Restores go through manage.py restore_archive
+    exclude = ['payload']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
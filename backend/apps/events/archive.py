@@ -0,0 +1,203 @@
+"""
+Archival of events and clients out of the live tables.
+
+Soft-deleted events and clients are archived ARCHIVE_DELETED_AFTER_DAYS after
+deletion, and completed events once they are ARCHIVE_COMPLETED_AFTER_YEARS
+old, paid and settled. Rows move in chunks to ArchivedEvent/ArchivedClient,
+with the full row compressed in `payload` next to the columns finance reports
+aggregate. Finance views and the report builder read through to the archive
+for periods that start before the archival horizon, and `restore_events`/
+`restore_clients` put rows back exactly as they were.
+
+A client is only archived once none of its events are live. Notification
+logs of archived events are dropped, and chef apps are told archived events
+are gone (see apps/sync). Queries go to the active shard.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.chefs.models import ChefProfile
+from apps.clients.models import ArchivedClient, Client
+from apps.notifications.models import NotificationLog
+from core.rows import delete_in, insert_raw, pack, unpack
+from . import calendar, live, reports, signals
+from .models import ArchivedEvent, Event
+
+
+def completed_horizon(today=None):
+    """Completed events dated before this are archived."""
+    today = today or timezone.now().date()
+    return reports.add_months(today, -12 * settings.ARCHIVE_COMPLETED_AFTER_YEARS)
+
+
+def spans_archive(start):
+    """Whether a period starting at `start` may include archived events."""
+    return start < completed_horizon()
+
+
+def archived_events(organization, start, end):
+    """Archived, not deleted events in the period; empty without a query when none can be."""
+    if not spans_archive(start):
+        return ArchivedEvent.objects.none()
+    return ArchivedEvent.objects.filter(
+        organization=organization,
+        is_deleted=False,
+        date__gte=start,
+        date__lte=end,
+    )
+
+
+def archivable_events(now=None):
+    now = now or timezone.now()
+    deleted = Q(
+        is_deleted=True,
+        deleted_at__lt=now - timedelta(days=settings.ARCHIVE_DELETED_AFTER_DAYS),
+    )
+    # Unpaid or unsettled events still matter to receivables and payouts
+    completed = Q(
+        is_deleted=False,
+        status=Event.Status.COMPLETED,
+        payment_received=True,
+        date__lt=completed_horizon(now.date()),
+    ) & (Q(payout_run__isnull=False) | Q(chef__isnull=True))
+    return Event.objects.filter(deleted | completed)
+
+
+def archivable_clients(now=None):
+    now = now or timezone.now()
+    return Client.objects.filter(
+        is_deleted=True,
+        deleted_at__lt=now - timedelta(days=settings.ARCHIVE_DELETED_AFTER_DAYS),
+    ).exclude(Exists(Event.objects.filter(client=OuterRef('pk'))))
+
+
+def _invalidate(events, removed):
+    by_organization = defaultdict(list)
+    for event in events:
+        by_organization[event.organization_id].append(event)
+
+    def invalidate():
+        for organization_id, organization_events in by_organization.items():
+            calendar.invalidate_months(organization_id, [event.date for event in organization_events])
+            reports.invalidate(organization_id)
+            signals.events_changed.send(
+                Event,
+                organization_id=organization_id,
+                events=[(event.pk, event.chef_id) for event in organization_events],
+                removed=removed,
+                clients=[] if removed else [(event.chef_id, event.client_id) for event in organization_events],
+            )
+            live.publish(
+                organization_id,
+                [event.pk for event in organization_events],
+                [event.date for event in organization_events],
+                [event.chef_id for event in organization_events],
+                removed,
+            )
+
+    return invalidate
+
+
+def archive_events(queryset, chunk_size=None):
+    """Move every event in `queryset` to the archive. Returns the number archived."""
+    chunk_size = chunk_size or settings.ARCHIVE_CHUNK_SIZE
+    using = router.db_for_write(Event)
+    archived = 0
+    while True:
+        events = list(queryset.using(using).select_related('client').order_by('pk')[:chunk_size])
+        if not events:
+            break
+        pks = [event.pk for event in events]
+        with transaction.atomic(using=using):
+            ArchivedEvent.objects.using(using).bulk_create([
+                ArchivedEvent(
+                    id=event.pk,
+                    client_label=event.client.name,
+                    payload=pack(event),
+                    **{name: getattr(event, name) for name in ArchivedEvent.SUMMARY_FIELDS}
+                )
+                for event in events
+            ])
+            delete_in(NotificationLog, pks, using, field_name='event')
+            delete_in(Event, pks, using)
+            transaction.on_commit(_invalidate(events, removed=True), using=using)
+        archived += len(events)
+        if len(events) < chunk_size:
+            break
+    return archived
+
+
+def archive_clients(queryset, chunk_size=None):
+    """Move every client in `queryset` to the archive. Returns the number archived."""
+    chunk_size = chunk_size or settings.ARCHIVE_CHUNK_SIZE
+    using = router.db_for_write(Client)
+    archived = 0
+    while True:
+        clients = list(queryset.using(using).order_by('pk')[:chunk_size])
+        if not clients:
+            break
+        with transaction.atomic(using=using):
+            ArchivedClient.objects.using(using).bulk_create([
+                ArchivedClient(
+                    id=client.pk,
+                    organization_id=client.organization_id,
+                    name=client.name,
+                    deleted_at=client.deleted_at,
+                    payload=pack(client),
+                )
+                for client in clients
+            ])
+            delete_in(Client, [client.pk for client in clients], using)
+        archived += len(clients)
+        if len(clients) < chunk_size:
+            break
+    return archived
+
+
+def restore_clients(queryset):
+    """Move archived clients back to the live table. Returns the number restored."""
+    using = router.db_for_write(Client)
+    with transaction.atomic(using=using):
+        archived = list(queryset.using(using))
+        insert_raw(Client, [unpack(Client, row.payload) for row in archived], using)
+        delete_in(ArchivedClient, [row.pk for row in archived], using)
+    return len(archived)
+
+
+def restore_events(queryset):
+    """Move archived events (and their archived clients) back. Returns the number restored."""
+    using = router.db_for_write(Event)
+    with transaction.atomic(using=using):
+        archived = list(queryset.using(using))
+        events = [unpack(Event, row.payload) for row in archived]
+
+        client_ids = {event.client_id for event in events}
+        restore_clients(ArchivedClient.objects.filter(pk__in=client_ids))
+        # A chef removed since archival is unassigned, as on delete
+        chef_ids = set(ChefProfile.objects.using(using).filter(
+            pk__in={event.chef_id for event in events},
+        ).values_list('pk', flat=True))
+        for event in events:
+            if event.chef_id not in chef_ids:
+                event.chef_id = None
+
+        insert_raw(Event, events, using)
+        delete_in(ArchivedEvent, [row.pk for row in archived], using)
+        transaction.on_commit(_invalidate(events, removed=False), using=using)
+    return len(events)
+
+
+def archive(now=None, exclude_organizations=(), chunk_size=None):
+    """Archive everything due on the active shard. Returns counts for logging."""
+    events = archivable_events(now).exclude(organization_id__in=exclude_organizations)
+    clients = archivable_clients(now).exclude(organization_id__in=exclude_organizations)
+    return {
+        'events': archive_events(events, chunk_size),
+        # After events, so clients whose last events just went can follow
+        'clients': archive_clients(clients, chunk_size),
+    }
@@ -0,0 +1,166 @@
+"""
+Month-sized calendar shards cached per organization and scope.
+
+Each shard holds the serialized calendar events of one month for one scope
+(all events, unassigned events, one chef's events). Shard keys embed a
+per-month version and a per-organization generation, so an Event write only
+has to bump the versions of the months it touched, and a change to data
+every month renders (chef colors, chef/client names) bumps the generation.
+"""
+import calendar
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from core.metrics import record_cache
+from .models import Event
+from .serializers import EventCalendarSerializer
+
+UNASSIGNED_COLOR = '#9E9E9E'
+
+
+def month_bounds(year, month):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def months_between(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _version_key(organization_id, year, month):
+    return f'calendar:month:{organization_id}:{year}-{month:02d}'
+
+
+def _generation_key(organization_id):
+    return f'calendar:gen:{organization_id}'
+
+
+def _token():
+    # Timestamps rather than counters: an evicted key can't come back with a
+    # value an old shard key was built from
+    return time.time_ns()
+
+
+def _versions(organization_id, months):
+    keys = {_version_key(organization_id, y, m): (y, m) for y, m in months}
+    keys[_generation_key(organization_id)] = None
+    found = cache.get_many(list(keys))
+    missing = {key: _token() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    generation = found.pop(_generation_key(organization_id))
+    return {keys[key]: f'{generation}.{value}' for key, value in found.items()}
+
+
+def invalidate_months(organization_id, dates):
+    months = {(d.year, d.month) for d in dates if d}
+    cache.set_many(
+        {_version_key(organization_id, y, m): _token() for y, m in months},
+        timeout=None,
+    )
+
+
+def invalidate_organization(organization_id):
+    cache.set(_generation_key(organization_id), _token(), timeout=None)
+
+
+def scope_queryset(request, scope):
+    qs = Event.objects.filter(
+        organization=request.organization,
+        is_deleted=False,
+    ).exclude(status='cancelled')
+    if scope.startswith('chef:'):
+        return qs.filter(chef_id=int(scope.split(':', 1)[1]))
+    if scope == 'unassigned':
+        return qs.filter(chef__isnull=True)
+    if scope.startswith('membership:'):
+        return qs.filter(chef__membership__id=int(scope.split(':', 1)[1]))
+    return qs
+
+
+def get_scope(request):
+    """Cache scope for the request, or None if the user can't see the calendar."""
+    membership = request.membership
+    if membership.role == 'chef':
+        chef_profile = getattr(membership, 'chef_profile', None)
+        return f'chef:{chef_profile.id}' if chef_profile else None
+
+    chef_id = request.query_params.get('chef_id')
+    if chef_id == 'unassigned':
+        return 'unassigned'
+    if chef_id and chef_id.isdigit():
+        return f'membership:{chef_id}'
+    return 'all'
+
+
+def get_shards(request, scope, months):
+    """Return {(year, month): (version, [events])}, building only missing shards."""
+    months = list(months)
+    organization_id = request.organization.id
+    versions = _versions(organization_id, months)
+    keys = {
+        (y, m): f'calendar:shard:{organization_id}:{scope}:{y}-{m:02d}:{versions[(y, m)]}'
+        for y, m in months
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    shards = {}
+    to_store = {}
+    for (y, m), key in keys.items():
+        record_cache('calendar_shard', key in cached)
+        if key in cached:
+            events = cached[key]
+        else:
+            start, end = month_bounds(y, m)
+            qs = scope_queryset(request, scope).filter(
+                date__gte=start, date__lte=end
+            ).select_related('client', 'chef__membership__user')
+            events = list(EventCalendarSerializer(qs, many=True).data)
+            to_store[key] = events
+        shards[(y, m)] = (versions[(y, m)], events)
+    if to_store:
+        cache.set_many(to_store, timeout=settings.CALENDAR_SHARD_TTL)
+    return shards
+
+
+def day_summaries(queryset, include_revenue=False):
+    """
+    Per-day aggregates from one GROUP BY over (date, chef color).
+
+    Grouping by color as well keeps it a single portable query; the handful
+    of rows per day are folded into one entry here.
+    """
+    rows = queryset.values('date', 'chef__calendar_color').annotate(
+        event_count=Count('id'),
+        guest_count=Sum('guest_count'),
+        revenue=Sum('client_pay'),
+    ).order_by('date', 'chef__calendar_color')
+
+    days = {}
+    for row in rows:
+        day = days.setdefault(row['date'], {
+            'date': str(row['date']),
+            'event_count': 0,
+            'guest_count': 0,
+            'chef_colors': [],
+            'revenue': 0,
+        })
+        day['event_count'] += row['event_count']
+        day['guest_count'] += row['guest_count'] or 0
+        day['chef_colors'].append(row['chef__calendar_color'] or UNASSIGNED_COLOR)
+        day['revenue'] += row['revenue'] or 0
+
+    summaries = list(days.values())
+    for day in summaries:
+        if include_revenue:
+            day['revenue'] = str(day['revenue'])
+        else:
+            del day['revenue']
+    return summaries
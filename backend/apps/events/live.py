@@ -0,0 +1,320 @@
+"""
+Live change notifications for open calendars and dashboards.
+
+Event writes publish a compact message once they commit, e.g.
+`{"events":[12],"dates":["2026-10-22"],"chefs":[3],"removed":false}`, on the
+organization's Redis channel. Each ASGI worker keeps one pub/sub connection,
+subscribed to the channels of organizations with open streams, and fans
+messages out to per-stream queues, so an idle stream costs a queue and a
+timer, not a connection or a thread. Without REDIS_URL messages go straight
+to the streams of the current process instead, for tests and local
+development.
+
+Browsers connect with EventSource to `/api/events/stream/?ticket=...`, the
+ticket coming from an authenticated POST (EventSource can't send the JWT).
+Chefs only receive messages about events they are or were assigned to. A
+stream that falls LIVE_QUEUE_SIZE messages behind gets `{"reset":true}`
+instead, and should refetch. The membership a ticket was issued for is
+checked on connect and then every LIVE_MEMBERSHIP_CHECK_SECONDS, in one
+query for all streams of the process; streams of deactivated or removed
+members, or of admins demoted to chef, are closed.
+
+config/asgi.py routes the stream path to `application` below rather than
+through Django, whose ASGI handler keeps a thread per request for its sync
+middleware and signals for as long as the response streams.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+
+from core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH = '/api/events/stream/'
+CHANNEL_PREFIX = 'live:org:'
+TICKET_SALT = 'events.live'
+RETRY_MS = 5000
+RESET = 'data: {"reset":true}\n\n'
+CLOSE = None  # Queued to end a stream
+
+
+def channel(organization_id):
+    return f'{CHANNEL_PREFIX}{organization_id}'
+
+
+def make_ticket(organization_id, membership_id, chef_id=None):
+    return signing.dumps({'o': organization_id, 'm': membership_id, 'c': chef_id}, salt=TICKET_SALT)
+
+
+def read_ticket(ticket):
+    """(organization id, membership id, chef id or None), or raises signing.BadSignature."""
+    data = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.LIVE_TICKET_MAX_AGE)
+    return data['o'], data['m'], data['c']
+
+
+def allowed_memberships(streams):
+    """
+    The membership ids among `streams`, {membership id: (organization id,
+    chef id or None)}, that may still receive what their ticket granted.
+    """
+    from apps.organizations.models import OrganizationMembership
+
+    close_old_connections()
+    try:
+        rows = OrganizationMembership.objects.filter(
+            pk__in=streams, is_active=True, user__is_active=True,
+        ).values_list('pk', 'organization_id', 'role', 'chef_profile__id')
+        allowed = set()
+        for pk, organization_id, role, chef_id in rows:
+            ticket_organization, ticket_chef = streams[pk]
+            if ticket_organization != organization_id:
+                continue
+            # Chef streams stay with their chef profile, the others need an admin
+            if role == 'chef':
+                still_allowed = ticket_chef is not None and ticket_chef == chef_id
+            else:
+                still_allowed = ticket_chef is None
+            if still_allowed:
+                allowed.add(pk)
+        return allowed
+    finally:
+        close_old_connections()
+
+
+def publish(organization_id, events, dates, chefs, removed=False):
+    """Notify open streams that `events` changed. Never raises."""
+    message = json.dumps({
+        'events': sorted(events),
+        'dates': sorted({str(date) for date in dates if date}),
+        'chefs': sorted({chef for chef in chefs if chef}),
+        'removed': removed,
+    }, separators=(',', ':'))
+    client = get_redis()
+    if client is None:
+        if _hub is not None:
+            _hub.deliver_threadsafe(organization_id, message)
+        return
+    try:
+        client.publish(channel(organization_id), message)
+    except Exception:
+        # Streams are a convenience; a Redis hiccup must not fail the write
+        logger.warning('Could not publish live update for organization %s', organization_id, exc_info=True)
+
+
+class Hub:
+    """The streams open in this process, by organization."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.streams = {}  # organization id -> {queue: (membership id, chef id)}
+        self.checker = None
+
+    async def subscribe(self, organization_id, membership_id, chef_id=None):
+        queue = asyncio.Queue(maxsize=settings.LIVE_QUEUE_SIZE)
+        streams = self.streams.setdefault(organization_id, {})
+        streams[queue] = (membership_id, chef_id)
+        if len(streams) == 1:
+            await self.listen(organization_id)
+        if self.checker is None or self.checker.done():
+            self.checker = self.loop.create_task(self.check_memberships())
+        return queue
+
+    async def unsubscribe(self, organization_id, queue):
+        streams = self.streams.get(organization_id, {})
+        streams.pop(queue, None)
+        if not streams and self.streams.pop(organization_id, None) is not None:
+            await self.unlisten(organization_id)
+
+    async def listen(self, organization_id):
+        pass
+
+    async def unlisten(self, organization_id):
+        pass
+
+    async def check_memberships(self):
+        # Returns once no stream is open; subscribe() starts it again
+        while self.streams:
+            await asyncio.sleep(settings.LIVE_MEMBERSHIP_CHECK_SECONDS)
+            open_streams = [
+                (queue, organization_id, membership_id, chef_id)
+                for organization_id, streams in list(self.streams.items())
+                for queue, (membership_id, chef_id) in list(streams.items())
+            ]
+            if not open_streams:
+                return
+            try:
+                allowed = await sync_to_async(allowed_memberships)({
+                    membership_id: (organization_id, chef_id)
+                    for _, organization_id, membership_id, chef_id in open_streams
+                })
+            except Exception:
+                logger.warning('Could not check live stream memberships', exc_info=True)
+                continue
+            for queue, _, membership_id, _ in open_streams:
+                if membership_id not in allowed:
+                    self.close(queue)
+
+    def close(self, queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSE)
+
+    def deliver(self, organization_id, message):
+        streams = self.streams.get(organization_id)
+        if not streams:
+            return
+        chefs = json.loads(message).get('chefs', ())
+        frame = f'data: {message}\n\n'
+        for queue, (_, chef_id) in list(streams.items()):
+            if chef_id is not None and chef_id not in chefs:
+                continue
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                dropped = [queue.get_nowait() for _ in range(queue.qsize())]
+                queue.put_nowait(CLOSE if CLOSE in dropped else RESET)
+
+    def deliver_threadsafe(self, organization_id, message):
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.deliver, organization_id, message)
+
+
+class RedisHub(Hub):
+    """A Hub fed by one Redis pub/sub connection per process."""
+
+    def __init__(self, loop):
+        super().__init__(loop)
+        import redis.asyncio
+
+        self.pubsub = redis.asyncio.Redis.from_url(settings.REDIS_URL).pubsub(
+            ignore_subscribe_messages=True,
+        )
+        self.reader = None
+
+    async def listen(self, organization_id):
+        await self.pubsub.subscribe(channel(organization_id))
+        if self.reader is None or self.reader.done():
+            self.reader = self.loop.create_task(self.read())
+
+    async def unlisten(self, organization_id):
+        await self.pubsub.unsubscribe(channel(organization_id))
+
+    async def read(self):
+        # Returns once nothing is subscribed; listen() starts it again
+        while self.streams:
+            try:
+                async for message in self.pubsub.listen():
+                    if message['type'] == 'message':
+                        organization_id = int(message['channel'].decode().removeprefix(CHANNEL_PREFIX))
+                        self.deliver(organization_id, message['data'].decode())
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The connection resubscribes its channels when it reconnects
+                logger.warning('Live update subscription failed; retrying', exc_info=True)
+                await asyncio.sleep(1)
+
+
+_hub = None
+
+
+def get_hub():
+    global _hub
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub.loop is not loop:
+        _hub = RedisHub(loop) if get_redis() is not None else Hub(loop)
+    return _hub
+
+
+async def stream(organization_id, membership_id, chef_id=None):
+    """Server-sent events for one open stream, with a comment as heartbeat."""
+    hub = get_hub()
+    queue = await hub.subscribe(organization_id, membership_id, chef_id)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                frame = ': ping\n\n'
+            if frame is CLOSE:
+                return
+            yield frame
+    finally:
+        await hub.unsubscribe(organization_id, queue)
+
+
+def _cors_headers(scope):
+    origin = dict(scope['headers']).get(b'origin')
+    if origin and (
+        getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False)
+        or origin.decode() in getattr(settings, 'CORS_ALLOWED_ORIGINS', ())
+    ):
+        return [(b'access-control-allow-origin', origin), (b'vary', b'Origin')]
+    return []
+
+
+async def _respond(send, status, detail, headers):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), *headers],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': detail}).encode()})
+
+
+async def _disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def application(scope, receive, send):
+    """ASGI app serving STREAM_PATH."""
+    cors = _cors_headers(scope)
+    if scope['method'] != 'GET':
+        await _respond(send, 405, 'Method not allowed.', [(b'allow', b'GET'), *cors])
+        return
+    ticket = parse_qs(scope['query_string'].decode()).get('ticket', [''])[0]
+    try:
+        organization_id, membership_id, chef_id = read_ticket(ticket)
+    except signing.BadSignature:
+        await _respond(send, 403, 'Invalid or expired ticket.', cors)
+        return
+    allowed = await sync_to_async(allowed_memberships)({membership_id: (organization_id, chef_id)})
+    if membership_id not in allowed:
+        await _respond(send, 403, 'Membership is no longer active.', cors)
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            # Stops nginx-style proxies from buffering the stream
+            (b'x-accel-buffering', b'no'),
+            *cors,
+        ],
+    })
+    frames = stream(organization_id, membership_id, chef_id)
+
+    async def pump():
+        async for frame in frames:
+            await send({'type': 'http.response.body', 'body': frame.encode(), 'more_body': True})
+
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(_disconnected(receive))]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await frames.aclose()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from apps.events.archive import archivable_clients, archivable_events, archive
+from core.sharding import shards, use_shard
+
+
+class Command(BaseCommand):
+    help = 'Move old soft-deleted and completed events, and soft-deleted clients, to the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived.')
+
+    def handle(self, *args, **options):
+        for alias in shards():
+            with use_shard(alias):
+                if options['dry_run']:
+                    counts = {'events': archivable_events().count(), 'clients': archivable_clients().count()}
+                else:
+                    counts = archive(chunk_size=options['chunk_size'])
+            self.stdout.write(f"{alias}: {counts['events']} events, {counts['clients']} clients")
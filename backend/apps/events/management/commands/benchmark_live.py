@@ -0,0 +1,123 @@
+import asyncio
+import statistics
+import threading
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.events import live
+from apps.organizations.models import OrganizationMembership
+
+
+class Connection:
+    """One EventSource-like client driving the ASGI app in process."""
+
+    def __init__(self, application, ticket):
+        self.application = application
+        self.ticket = ticket
+        self.connected = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.status = None
+        self.received = []
+        self.arrived = asyncio.Event()
+        self.body_sent = False
+
+    async def receive(self):
+        if not self.body_sent:
+            self.body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.closing.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+            if self.status != 200:
+                self.connected.set()  # Refused, nothing more will come
+        elif message.get('body', b'').startswith(b'retry:'):
+            self.connected.set()
+        elif message.get('body', b'').startswith(b'data:'):
+            self.received.append(time.perf_counter())
+            self.arrived.set()
+
+    async def run(self):
+        await self.application({
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': live.STREAM_PATH,
+            'raw_path': live.STREAM_PATH.encode(),
+            'query_string': f'ticket={self.ticket}'.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }, self.receive, self.send)
+
+
+class Command(BaseCommand):
+    help = 'Hold many idle live update streams in one process and time fan-out to all of them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=1000)
+        parser.add_argument('--messages', type=int, default=10)
+        parser.add_argument('--organization', type=int, default=1)
+
+    def handle(self, *args, **options):
+        membership = OrganizationMembership.objects.filter(
+            organization_id=options['organization'], role='admin', is_active=True, user__is_active=True,
+        ).first()
+        if membership is None:
+            raise CommandError('--organization needs an active admin.')
+        ticket = live.make_ticket(membership.organization_id, membership.pk)
+        asyncio.run(self.benchmark(options['subscribers'], options['messages'], membership.organization_id, ticket))
+
+    async def benchmark(self, subscribers, messages, organization_id, ticket):
+        from config.asgi import application
+
+        threads = threading.active_count()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        connections = [Connection(application, ticket) for _ in range(subscribers)]
+        tasks = [asyncio.ensure_future(connection.run()) for connection in connections]
+        await asyncio.gather(*(connection.connected.wait() for connection in connections))
+        connect_time = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        streaming_threads = threading.active_count()
+        refused = sum(connection.status != 200 for connection in connections)
+        if refused:
+            raise CommandError(f'{refused} streams were refused.')
+
+        # Idle for a moment, as open browsers mostly are
+        await asyncio.sleep(0.5)
+
+        latencies = []
+        for i in range(messages):
+            for connection in connections:
+                connection.arrived.clear()
+            sent = time.perf_counter()
+            # From a thread, like a commit hook in a sync view
+            await asyncio.to_thread(live.publish, organization_id, [i], ['2026-01-01'], [])
+            await asyncio.gather(*(connection.arrived.wait() for connection in connections))
+            latencies.append((max(connection.received[-1] for connection in connections) - sent) * 1000)
+
+        for connection in connections:
+            connection.closing.set()
+        await asyncio.gather(*tasks)
+
+        hub = live.get_hub()
+        self.stdout.write(f'hub: {type(hub).__name__}')
+        self.stdout.write(f'subscribers: {subscribers}, connected in {connect_time * 1000:.0f} ms')
+        self.stdout.write(f'memory: {memory / subscribers / 1024:.1f} KiB per idle stream')
+        self.stdout.write(f'threads: {threads} before connecting, {streaming_threads} while streaming')
+        self.stdout.write(f'fan-out to all, mean: {statistics.mean(latencies):.2f} ms')
+        self.stdout.write(f'fan-out to all, max:  {max(latencies):.2f} ms')
+        if hub.streams:
+            self.stdout.write(self.style.ERROR(f'Streams left open: {hub.streams}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Every stream was closed on disconnect.'))
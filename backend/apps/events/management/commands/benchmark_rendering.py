@@ -0,0 +1,98 @@
+import io
+import statistics
+import time
+from datetime import date, time as clock, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from apps.chefs.models import ChefProfile
+from apps.clients.models import Client
+from apps.events.models import Event
+from apps.events.serializers import EventDetailSerializer, EventListSerializer
+from apps.organizations.models import OrganizationMembership
+from apps.users.models import User
+from core.middleware import CompressionMiddleware
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Time JSON encoding, parsing and compression of a large event list response.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--detail', action='store_true', help='Use the event detail serializer.')
+
+    def handle(self, *args, **options):
+        data = self.build(options['events'], options['detail'])
+        repeat = options['repeat']
+
+        expected, json_ms = _timed(lambda: JSONRenderer().render(data), repeat)
+        rendered, orjson_ms = _timed(lambda: ORJSONRenderer().render(data), repeat)
+        self.stdout.write(f'response: {options["events"]} events, {len(expected) / 1024:.0f} KiB')
+        self.stdout.write(f'render  json: {json_ms:8.1f} ms   orjson: {orjson_ms:8.1f} ms   ({json_ms / orjson_ms:.1f}x)')
+        if rendered != expected:
+            self.stdout.write(self.style.ERROR('orjson output differs from JSONRenderer.'))
+            return
+
+        parsed_json, json_ms = _timed(lambda: JSONParser().parse(io.BytesIO(expected)), repeat)
+        parsed_orjson, orjson_ms = _timed(lambda: ORJSONParser().parse(io.BytesIO(expected)), repeat)
+        self.stdout.write(f'parse   json: {json_ms:8.1f} ms   orjson: {orjson_ms:8.1f} ms   ({json_ms / orjson_ms:.1f}x)')
+        if parsed_orjson != parsed_json:
+            self.stdout.write(self.style.ERROR('orjson parses differently from JSONParser.'))
+            return
+
+        for encoding, compress in CompressionMiddleware.COMPRESSORS.items():
+            compressed, ms = _timed(lambda: compress(expected), repeat)
+            self.stdout.write(
+                f'{encoding:<5} {len(compressed) / 1024:6.0f} KiB '
+                f'({len(compressed) / len(expected):.0%}) in {ms:.1f} ms'
+            )
+        self.stdout.write(self.style.SUCCESS('orjson output is identical to JSONRenderer.'))
+
+    def build(self, count, detail):
+        """Serialized unsaved events, with the text, money, date and time fields real ones have."""
+        chefs = [
+            ChefProfile(
+                id=i,
+                calendar_color='#4CAF50',
+                membership=OrganizationMembership(user=User(first_name=f'Chef {i}', last_name='Ünal', email=f'chef{i}@example.com')),
+            )
+            for i in range(1, 21)
+        ]
+        clients = [
+            Client(id=i, name=f'Client {i} – Café', email=f'client{i}@example.com', phone='555-0100')
+            for i in range(1, 501)
+        ]
+        start = date(2026, 1, 1)
+        events = [
+            Event(
+                id=i,
+                client=clients[i % len(clients)],
+                chef=chefs[i % len(chefs)] if i % 7 else None,
+                name='' if i % 3 else f'Dinner party {i}',
+                date=start + timedelta(days=i % 730),
+                start_time=clock(18, 30),
+                end_time=clock(22, 0) if i % 2 else None,
+                guest_count=8 + i % 20,
+                client_pay=Decimal('1250.00') + i % 100,
+                chef_pay=Decimal('400.50'),
+                menu_notes='Tasting menu\nNo shellfish',
+                status=Event.Status.UPCOMING,
+            )
+            for i in range(1, count + 1)
+        ]
+        serializer = EventDetailSerializer if detail else EventListSerializer
+        return serializer(events, many=True).data
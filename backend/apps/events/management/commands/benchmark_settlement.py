@@ -0,0 +1,76 @@
+import datetime
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.chefs.models import ChefProfile
+from apps.clients.models import Client
+from apps.events.models import Event
+from apps.events.payouts import settle
+from apps.organizations.models import Organization, OrganizationMembership
+from apps.users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Time a payout settlement run over generated events. All data is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000)
+        parser.add_argument('--chefs', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['events'], options['chefs'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, event_count, chef_count):
+        organization = Organization.objects.create(name='Settlement benchmark')
+        client = Client.objects.create(organization=organization, name='Benchmark client')
+        chefs = []
+        for i in range(chef_count):
+            user = User.objects.create_user(f'benchmark-chef-{i}@example.com', None)
+            membership = OrganizationMembership.objects.create(
+                user=user, organization=organization, role='chef'
+            )
+            chefs.append(ChefProfile.objects.create(membership=membership))
+
+        start = datetime.date(2024, 1, 1)
+        self.stdout.write(f'Creating {event_count} completed events...')
+        Event.objects.bulk_create(
+            (
+                Event(
+                    organization=organization,
+                    client=client,
+                    chef=chefs[i % chef_count],
+                    date=start + datetime.timedelta(days=i % 365),
+                    start_time=datetime.time(18, 0),
+                    guest_count=10,
+                    client_pay=Decimal('500.00'),
+                    chef_pay=Decimal('200.00'),
+                    location='Benchmark',
+                    status=Event.Status.COMPLETED,
+                )
+                for i in range(event_count)
+            ),
+            batch_size=5000,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            run = settle(organization, start, start + datetime.timedelta(days=364))
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'settled events: {run.event_count}')
+        self.stdout.write(f'chef payouts:   {run.payouts.count()}')
+        self.stdout.write(f'total amount:   {run.total_amount}')
+        self.stdout.write(f'queries:        {len(queries)}')
+        self.stdout.write(f'elapsed:        {elapsed * 1000:.1f} ms')
@@ -0,0 +1,43 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.events.models import Event
+from apps.events.partitions import ensure_partitions, is_partitioned, partitions, scanned_partitions
+from core.sharding import shards
+
+
+class Command(BaseCommand):
+    help = 'Create missing yearly event partitions and check that date-range queries are pruned.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=None, help='One alias from DATABASE_SHARDS (default: all).')
+        parser.add_argument('--years-ahead', type=int, default=None)
+        parser.add_argument('--explain', action='store_true', help='Print the plan of a current-month query.')
+
+    def handle(self, *args, **options):
+        aliases = [options['database']] if options['database'] else shards()
+        for alias in aliases:
+            if not is_partitioned(alias):
+                self.stdout.write(f'{alias}: events_event is not partitioned')
+                continue
+            created = ensure_partitions(options['years_ahead'], using=alias)
+            for name in created:
+                self.stdout.write(f'{alias}: created {name}')
+            self.stdout.write(f"{alias}: {', '.join(partitions(alias))}")
+            if options['explain']:
+                self.explain(alias)
+
+    def explain(self, alias):
+        # The shape of the dashboard and current-month finance queries
+        today = timezone.now().date()
+        start = today.replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        queryset = Event.objects.using(alias).filter(
+            is_deleted=False, date__gte=start, date__lt=end,
+        ).order_by('date')
+        self.stdout.write(queryset.explain())
+        scanned = scanned_partitions(queryset)
+        self.stdout.write(f"{alias}: current month reads {', '.join(scanned)}")
+        if len(scanned) != 1:
+            raise CommandError(f'Expected the plan to read one partition, not {len(scanned)}.')
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.clients.models import ArchivedClient
+from apps.events.archive import restore_clients, restore_events
+from apps.events.models import ArchivedEvent
+from core.sharding import shard_for, use_shard
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date {value}. Use YYYY-MM-DD.')
+
+
+class Command(BaseCommand):
+    help = "Move an organization's archived events (and their clients) or clients back to the live tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization_id', type=int)
+        parser.add_argument('--start', type=parse_date, help='Restore events dated on or after this day.')
+        parser.add_argument('--end', type=parse_date, help='Restore events dated on or before this day.')
+        parser.add_argument('--events', type=int, nargs='+', default=[], help='Restore these event ids.')
+        parser.add_argument('--clients', type=int, nargs='+', default=[], help='Restore these client ids.')
+
+    def handle(self, *args, **options):
+        organization_id = options['organization_id']
+        if not (options['start'] or options['end'] or options['events'] or options['clients']):
+            raise CommandError('Pass --start/--end, --events or --clients.')
+
+        with use_shard(shard_for(organization_id)):
+            clients = 0
+            if options['clients']:
+                clients = restore_clients(ArchivedClient.objects.filter(
+                    organization_id=organization_id, pk__in=options['clients'],
+                ))
+            events = ArchivedEvent.objects.filter(organization_id=organization_id)
+            if options['events']:
+                events = events.filter(pk__in=options['events'])
+            elif options['start'] or options['end']:
+                if options['start']:
+                    events = events.filter(date__gte=options['start'])
+                if options['end']:
+                    events = events.filter(date__lte=options['end'])
+            else:
+                events = events.none()
+            restored = restore_events(events)
+        self.stdout.write(f'Restored {restored} events and {clients} clients')
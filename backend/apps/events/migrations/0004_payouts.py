@@ -0,0 +1,68 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chefs', '0001_initial'),
+        ('clients', '0001_initial'),
+        ('events', '0003_event_unpaid_index'),
+        ('organizations', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payout_runs', to='organizations.organization')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChefPayout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('event_count', models.PositiveIntegerField()),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('chef', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payouts', to='chefs.chefprofile')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chef_payouts', to='organizations.organization')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payouts', to='events.payoutrun')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='payout_run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='events', to='events.payoutrun'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('payout_run__isnull', True), ('status', 'completed')), fields=['organization', 'date'], name='events_unsettled_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chefpayout',
+            index=models.Index(fields=['organization', 'chef', 'paid_at'], name='chef_payouts_owed_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='chefpayout',
+            constraint=models.UniqueConstraint(fields=('run', 'chef'), name='unique_chef_payout_per_run'),
+        ),
+    ]
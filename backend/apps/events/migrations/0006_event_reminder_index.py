@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chefs', '0001_initial'),
+        ('clients', '0001_initial'),
+        ('events', '0005_event_upcoming_index'),
+        ('organizations', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('chef__isnull', False), ('is_deleted', False), ('status', 'upcoming')), fields=['date'], name='events_reminder_idx'),
+        ),
+    ]
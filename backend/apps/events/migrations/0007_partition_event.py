@@ -0,0 +1,100 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:40
+
+import datetime
+
+from django.db import migrations
+
+TABLE = 'events_event'
+OLD_TABLE = 'events_event_old'
+SEQUENCE = 'events_event_id_seq'
+YEARS_AHEAD = 2
+
+
+def _rebuild(schema_editor, partitioned):
+    """
+    Recreate events_event, partitioned by year of `date` or plain, keeping
+    its rows, columns, indexes and foreign keys. Postgres only; the table is
+    locked for the duration of the copy.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_get_indexdef(indexrelid) FROM pg_index '
+            'WHERE indrelid = %s::regclass AND NOT indisprimary',
+            [TABLE],
+        )
+        # Partitioned indexes are reported as ON ONLY, which wouldn't
+        # cascade to partitions
+        indexes = [row[0].replace(' ON ONLY ', ' ON ') for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            + (' PARTITION BY RANGE ("date")' if partitioned else '')
+        )
+        if partitioned:
+            this_year = datetime.date.today().year
+            cursor.execute(
+                'SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int '
+                f'FROM {OLD_TABLE}'
+            )
+            first, last = cursor.fetchone()
+            first = min(first or this_year, this_year)
+            last = max(last or this_year, this_year) + YEARS_AHEAD
+            for year in range(first, last + 1):
+                cursor.execute(
+                    f'CREATE TABLE {TABLE}_y{year} PARTITION OF {TABLE} '
+                    f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+                )
+            # Catches dates outside every yearly partition
+            cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+        else:
+            # The id default points at the sequence; keep it when the
+            # partitioned table goes
+            cursor.execute(f'ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}')
+        cursor.execute(f'DROP TABLE {OLD_TABLE}')
+
+        # The primary key of a partitioned table must include the partition
+        # key. Ids still come from one sequence, so id alone stays unique.
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY ' + ('(id, date)' if partitioned else '(id)'))
+        if partitioned:
+            # Identity columns need Postgres 17 on partitioned tables
+            cursor.execute(f'CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+            cursor.execute(f"SELECT setval('{SEQUENCE}', COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}")
+            cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        for definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {quote(name)} {definition}')
+
+
+def partition(apps, schema_editor):
+    _rebuild(schema_editor, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    _rebuild(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_reminder_index'),
+        # Nothing may reference events_event(id) alone once it's partitioned
+        ('notifications', '0002_event_without_constraint'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chefs', '0001_initial'),
+        ('events', '0007_partition_event'),
+        ('organizations', '0003_organization_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('client_id', models.BigIntegerField()),
+                ('client_label', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('upcoming', 'Upcoming'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('client_pay', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('chef_pay', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('guest_count', models.PositiveIntegerField()),
+                ('deposit_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('deposit_received', models.BooleanField(default=False)),
+                ('payment_received', models.BooleanField(default=False)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('chef', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='chefs.chefprofile')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to='organizations.organization')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['organization', 'date'], name='archived_events_org_date_idx')],
+            },
+        ),
+    ]
@@ -1,11 +1,21 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
+from core.identity import resolve
 from apps.organizations.models import Organization
 from apps.clients.models import Client
 from apps.chefs.models import ChefProfile
 
 
+class SettledEventError(ValidationError):
+    pass
+
+
 class Event(models.Model):
+    # A settled event's pay is already part of a chef payout
+    SETTLED_FIELDS = ('payout_run_id', 'chef_id', 'chef_pay', 'status', 'is_deleted')
+
     class Status(models.TextChoices):
         UPCOMING = 'upcoming', 'Upcoming'
         COMPLETED = 'completed', 'Completed'
@@ -41,6 +51,13 @@ class Event(models.Model):
     chef_notes = models.TextField(blank=True, help_text='Editable by assigned chef')
     
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.UPCOMING)
+    payout_run = models.ForeignKey(
+        'PayoutRun',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='events'
+    )
     
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -50,15 +67,57 @@ class Event(models.Model):
     
     class Meta:
         ordering = ['date', 'start_time']
+        indexes = [
+            # Receivables only ever scan unpaid events, which stay a small
+            # fraction of the table as history grows
+            models.Index(
+                fields=['organization', 'date'],
+                name='events_unpaid_idx',
+                condition=models.Q(payment_received=False, is_deleted=False) & ~models.Q(status='cancelled'),
+            ),
+            # Upcoming events: dashboards and the nightly auto-completion
+            models.Index(
+                fields=['organization', 'date'],
+                name='events_upcoming_idx',
+                condition=models.Q(status='upcoming', is_deleted=False),
+            ),
+            # The reminder scan's date window, across organizations
+            models.Index(
+                fields=['date'],
+                name='events_reminder_idx',
+                condition=models.Q(status='upcoming', is_deleted=False, chef__isnull=False),
+            ),
+            # Completed events a payout run has yet to settle
+            models.Index(
+                fields=['organization', 'date'],
+                name='events_unsettled_idx',
+                condition=models.Q(status='completed', payout_run__isnull=True, is_deleted=False),
+            ),
+        ]
     
     def __str__(self):
         return self.display_name
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored date so a reschedule can invalidate both months,
+        # the chef so a reassignment can be synced to both chefs, and the
+        # client so a chef is sent the new one
+        instance._loaded_date = instance.__dict__.get('date')
+        instance._loaded_chef_id = instance.__dict__.get('chef_id')
+        instance._loaded_client_id = instance.__dict__.get('client_id')
+        instance._loaded_settled = {
+            name: instance.__dict__[name] for name in cls.SETTLED_FIELDS if name in instance.__dict__
+        }
+        return instance
+    
     @property
     def display_name(self):
         if self.name:
             return self.name
-        return f'{self.client.name} Event'
+        client = resolve(self, 'client')
+        return f'{client.name} Event'
     
     @property
     def profit(self):
@@ -66,12 +125,122 @@ class Event(models.Model):
             return self.client_pay - self.chef_pay
         return self.client_pay
     
+    def check_settled(self):
+        """Raise SettledEventError if this changes what a chef payout already includes."""
+        loaded = getattr(self, '_loaded_settled', {})
+        if not loaded.get('payout_run_id'):
+            return
+        if any(getattr(self, name) != value for name, value in loaded.items()):
+            raise SettledEventError(
+                'Chef, chef pay and status cannot change, and the event cannot be '
+                'deleted, once an event has been settled.'
+            )
+
+    def clean(self):
+        self.check_settled()
+
     def soft_delete(self):
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.save()
     
     def save(self, *args, **kwargs):
-        if not self.location and self.client.address:
-            self.location = self.client.address
+        self.check_settled()
+        if not self.location:
+            client = resolve(self, 'client')
+            if client.address:
+                self.location = client.address
         super().save(*args, **kwargs)
+
+
+class PayoutRun(models.Model):
+    """A settlement of chef pay for completed events in a period."""
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='payout_runs')
+    period_start = models.DateField()
+    period_end = models.DateField()
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    event_count = models.PositiveIntegerField(default=0)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'Payout run {self.period_start} - {self.period_end}'
+
+
+class ChefPayout(models.Model):
+    """What one payout run owes one chef."""
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='chef_payouts')
+    run = models.ForeignKey(PayoutRun, on_delete=models.CASCADE, related_name='payouts')
+    chef = models.ForeignKey(ChefProfile, on_delete=models.PROTECT, related_name='payouts')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    event_count = models.PositiveIntegerField()
+    paid_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'chef'], name='unique_chef_payout_per_run'),
+        ]
+        indexes = [
+            models.Index(fields=['organization', 'chef', 'paid_at'], name='chef_payouts_owed_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.chef} - {self.amount}'
+
+
+class ArchivedEvent(models.Model):
+    """
+    An event moved out of the live table (see archive.py). The columns
+    finance reports aggregate are kept as they were, including chef and
+    client; the full row is kept compressed in `payload`.
+    """
+    # Columns copied from the event as-is
+    SUMMARY_FIELDS = [
+        'organization_id', 'client_id', 'chef_id', 'date', 'status', 'client_pay', 'chef_pay',
+        'guest_count', 'deposit_amount', 'deposit_received', 'payment_received', 'is_deleted',
+    ]
+
+    id = models.BigIntegerField(primary_key=True)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='archived_events')
+    # The client may be archived too, so only its id and name are kept
+    client_id = models.BigIntegerField()
+    client_label = models.CharField(max_length=200)
+    chef = models.ForeignKey(
+        ChefProfile,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Event.Status.choices)
+    client_pay = models.DecimalField(max_digits=10, decimal_places=2)
+    chef_pay = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    guest_count = models.PositiveIntegerField()
+    deposit_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    deposit_received = models.BooleanField(default=False)
+    payment_received = models.BooleanField(default=False)
+    is_deleted = models.BooleanField(default=False)
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['organization', 'date'], name='archived_events_org_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.client_label} Event ({self.date}, archived)'
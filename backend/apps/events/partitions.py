@@ -0,0 +1,80 @@
+"""
+Yearly range partitions of the events table.
+
+On Postgres, events_event is partitioned by year of `date` (migration 0007),
+so queries with a date range, which is nearly all of them (dashboard,
+calendar, finances, reminders), only touch the partitions for those years.
+Lookups by id alone still check every partition's index.
+
+Partitions are created EVENT_PARTITION_YEARS_AHEAD years in advance by a
+periodic task. Events dated outside every partition land in
+events_event_default and are moved into their partition when it's created.
+Elsewhere (SQLite) the table is a plain one and all of this is a no-op.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+TABLE = 'events_event'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_PATTERN = re.compile(rf'\b{TABLE}_(?:y\d{{4}}|default)\b')
+
+
+def partition_name(year):
+    return f'{TABLE}_y{year}'
+
+
+def is_partitioned(using='default'):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [TABLE])
+        return cursor.fetchone() is not None
+
+
+def partitions(using='default'):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname',
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_partition(year, using='default'):
+    """Create and attach the partition for `year`, taking over its rows from the default partition."""
+    name = partition_name(year)
+    start, end = f'{year}-01-01', f'{year + 1}-01-01'
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved',
+            [start, end],
+        )
+        # Attaching builds the partition's copies of the table's indexes
+        cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+    return name
+
+
+def ensure_partitions(years_ahead=None, using='default'):
+    """Create any missing partitions from this year on. Returns the names created."""
+    if not is_partitioned(using):
+        return []
+    years_ahead = settings.EVENT_PARTITION_YEARS_AHEAD if years_ahead is None else years_ahead
+    existing = set(partitions(using))
+    this_year = timezone.now().year
+    return [
+        create_partition(year, using)
+        for year in range(this_year, this_year + years_ahead + 1)
+        if partition_name(year) not in existing
+    ]
+
+
+def scanned_partitions(queryset):
+    """The partitions Postgres plans to read for `queryset`, from its EXPLAIN."""
+    return sorted(set(PARTITION_PATTERN.findall(queryset.explain())))
@@ -0,0 +1,79 @@
+"""
+Chef payout settlement.
+
+A settlement run claims every completed, unsettled event in a period with a
+single UPDATE, then snapshots per-chef totals into ChefPayout rows with one
+GROUP BY and a bulk insert, all in one transaction. What an organization owes
+its chefs is then read from ChefPayout rather than re-aggregated from events.
+"""
+from decimal import Decimal
+
+from django.db import router, transaction
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from .models import ChefPayout, Event, PayoutRun
+
+BATCH_SIZE = 1000
+
+
+def unsettled_events(organization, period_start, period_end):
+    # Matches the events_unsettled_idx predicate
+    return Event.objects.filter(
+        organization=organization,
+        status=Event.Status.COMPLETED,
+        payout_run__isnull=True,
+        is_deleted=False,
+        date__gte=period_start,
+        date__lte=period_end,
+        chef__isnull=False,
+    )
+
+
+def settle(organization, period_start, period_end, user=None):
+    """Settle the period and return the PayoutRun, or None if nothing was owed."""
+    zero = Value(Decimal('0'), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+    # The organization row is central; its events may live on a shard
+    with transaction.atomic(), transaction.atomic(using=router.db_for_write(Event)):
+        # Serializes runs per organization so two admins can't race for the
+        # same events
+        Organization.objects.select_for_update().filter(pk=organization.pk).first()
+
+        run = PayoutRun.objects.create(
+            organization=organization,
+            period_start=period_start,
+            period_end=period_end,
+            created_by=user,
+        )
+        event_count = unsettled_events(organization, period_start, period_end).update(
+            payout_run=run,
+            updated_at=timezone.now(),
+        )
+        if not event_count:
+            transaction.set_rollback(True)
+            return None
+
+        totals = Event.objects.filter(payout_run=run).values('chef_id').annotate(
+            amount=Coalesce(Sum('chef_pay'), zero),
+            event_count=Count('id'),
+        ).order_by()
+        payouts = [
+            ChefPayout(
+                organization=organization,
+                run=run,
+                chef_id=row['chef_id'],
+                amount=row['amount'],
+                event_count=row['event_count'],
+            )
+            for row in totals
+        ]
+        ChefPayout.objects.bulk_create(payouts, batch_size=BATCH_SIZE)
+
+        run.event_count = event_count
+        run.total_amount = sum((payout.amount for payout in payouts), Decimal('0'))
+        run.save(update_fields=['event_count', 'total_amount'])
+
+    return run
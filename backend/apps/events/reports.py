@@ -0,0 +1,318 @@
+"""
+Ad-hoc event reports compiled to a single GROUP BY query.
+
+A report is a set of dimensions to group by and metrics to aggregate over a
+date range. With a comparison period, both periods are fetched in the same
+query (metrics are aggregated with a FILTER per period) and previous-period
+time buckets are shifted onto the current period's buckets in Python.
+Results are cached per organization and report parameters until an event in
+the organization changes. Periods reaching back past the archival horizon
+also aggregate archived events (see archive.py).
+"""
+import hashlib
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, ExtractIsoWeekDay, TruncMonth, TruncWeek
+
+from core.metrics import record_cache
+from . import archive
+from .models import ArchivedEvent, Event
+
+ZERO = Value(Decimal('0'), output_field=DecimalField(max_digits=10, decimal_places=2))
+
+# name -> {column: expression, or None for a plain model field}; the first
+# column identifies the group, the rest are labels
+DIMENSIONS = {
+    'chef': {
+        'chef_id': None,
+        'chef_first_name': F('chef__membership__user__first_name'),
+        'chef_last_name': F('chef__membership__user__last_name'),
+    },
+    'client': {
+        'client_id': None,
+        'client_name': F('client__name'),
+    },
+    'month': {'month': TruncMonth('date')},
+    'week': {'week': TruncWeek('date')},
+    'status': {'status': None},
+    'weekday': {'weekday': ExtractIsoWeekDay('date')},
+}
+TIME_DIMENSIONS = ('month', 'week')
+
+# Archived events keep the client's name rather than a join to it
+ARCHIVED_COLUMNS = {'client_name': F('client_label')}
+
+METRICS = {
+    'revenue': (lambda q: Sum('client_pay', filter=q), Decimal),
+    'chef_pay': (lambda q: Sum('chef_pay', filter=q), Decimal),
+    'profit': (lambda q: Sum(F('client_pay') - Coalesce('chef_pay', ZERO), filter=q), Decimal),
+    'guest_count': (lambda q: Sum('guest_count', filter=q), int),
+    'event_count': (lambda q: Count('id', filter=q), int),
+    'deposit_outstanding': (
+        lambda q: Sum('deposit_amount', filter=q & Q(deposit_received=False)),
+        Decimal,
+    ),
+}
+
+COMPARISONS = ('previous', 'year')
+
+
+class ReportError(ValueError):
+    pass
+
+
+def add_months(value, months):
+    month_index = value.year * 12 + value.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    # Clamp the day, e.g. Mar 31 - 1 month -> Feb 28
+    next_month = date(year + (month == 12), month % 12 + 1, 1)
+    return date(year, month, min(value.day, (next_month - timedelta(days=1)).day))
+
+
+def comparison_shift(start, end, dimensions, compare):
+    """How far back the comparison period lies, as ('months'|'days', n)."""
+    if 'month' in dimensions:
+        if compare == 'year':
+            return ('months', 12)
+        return ('months', (end.year - start.year) * 12 + end.month - start.month + 1)
+    if 'week' in dimensions:
+        # Whole weeks, so shifted dates land in the matching week bucket
+        if compare == 'year':
+            return ('days', 52 * 7)
+        return ('days', ((end - start).days // 7 + 1) * 7)
+    if compare == 'year':
+        return ('months', 12)
+    return ('days', (end - start).days + 1)
+
+
+def shift(value, amount, sign=-1):
+    unit, n = amount
+    if unit == 'months':
+        return add_months(value, sign * n)
+    return value + timedelta(days=sign * n)
+
+
+def time_buckets(dimension, start, end):
+    if dimension == 'month':
+        bucket = start.replace(day=1)
+        while bucket <= end:
+            yield bucket
+            bucket = add_months(bucket, 1)
+    else:
+        bucket = start - timedelta(days=start.weekday())
+        while bucket <= end:
+            yield bucket
+            bucket += timedelta(days=7)
+
+
+def _version_key(organization_id):
+    return f'reports:version:{organization_id}'
+
+
+def invalidate(organization_id):
+    cache.set(_version_key(organization_id), time.time_ns(), timeout=None)
+
+
+def _serialize(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return str(value)
+    return value
+
+
+class Report:
+    def __init__(self, organization, start, end, dimensions, metrics, compare=None, statuses=None):
+        unknown = [d for d in dimensions if d not in DIMENSIONS]
+        if unknown:
+            raise ReportError(f'Unknown dimension: {unknown[0]}. Choose from {", ".join(DIMENSIONS)}.')
+        unknown = [m for m in metrics if m not in METRICS]
+        if unknown:
+            raise ReportError(f'Unknown metric: {unknown[0]}. Choose from {", ".join(METRICS)}.')
+        if not metrics:
+            raise ReportError('At least one metric is required.')
+        if len(dimensions) > settings.REPORT_MAX_DIMENSIONS:
+            raise ReportError(f'At most {settings.REPORT_MAX_DIMENSIONS} dimensions are allowed.')
+        if len(set(dimensions)) != len(dimensions):
+            raise ReportError('Dimensions must not repeat.')
+        if all(d in dimensions for d in TIME_DIMENSIONS):
+            raise ReportError('Use either month or week, not both.')
+        if compare and compare not in COMPARISONS:
+            raise ReportError(f'compare must be one of {", ".join(COMPARISONS)}.')
+
+        self.organization = organization
+        self.start, self.end = start, end
+        self.dimensions = dimensions
+        self.metrics = metrics
+        self.compare = compare
+        self.statuses = statuses or []
+        self.shift = comparison_shift(start, end, dimensions, compare) if compare else None
+
+    @property
+    def previous_period(self):
+        if not self.shift:
+            return None
+        return shift(self.start, self.shift), shift(self.end, self.shift)
+
+    def cache_key(self):
+        params = json.dumps([
+            str(self.start), str(self.end), self.dimensions, self.metrics,
+            self.compare, sorted(self.statuses),
+        ])
+        digest = hashlib.sha1(params.encode()).hexdigest()
+        version = cache.get(_version_key(self.organization.id))
+        if version is None:
+            version = time.time_ns()
+            cache.add(_version_key(self.organization.id), version, timeout=None)
+        return f'reports:{self.organization.id}:{version}:{digest}'
+
+    def queryset(self, model=Event):
+        current = Q(date__gte=self.start, date__lte=self.end)
+        period = current
+        if self.shift:
+            previous_start, previous_end = self.previous_period
+            previous = Q(date__gte=previous_start, date__lte=previous_end)
+            period = current | previous
+
+        qs = model.objects.filter(period, organization=self.organization, is_deleted=False)
+        if self.statuses:
+            qs = qs.filter(status__in=self.statuses)
+
+        group_by = {}
+        for dimension in self.dimensions:
+            group_by.update(DIMENSIONS[dimension])
+        if model is ArchivedEvent:
+            group_by.update((c, e) for c, e in ARCHIVED_COLUMNS.items() if c in group_by)
+        if group_by:
+            qs = qs.values(
+                *[column for column, expression in group_by.items() if expression is None],
+                **{column: expression for column, expression in group_by.items() if expression is not None}
+            )
+
+        aggregates = {}
+        for metric in self.metrics:
+            build, _ = METRICS[metric]
+            aggregates[metric] = build(current)
+            if self.shift:
+                aggregates[f'{metric}_previous'] = build(previous)
+
+        if not group_by:
+            return None, qs.aggregate(**aggregates)
+        return list(group_by), qs.annotate(**aggregates).order_by(*group_by)
+
+    def _empty_metrics(self):
+        row = {}
+        for metric in self.metrics:
+            kind = METRICS[metric][1]
+            row[metric] = kind(0)
+            if self.shift:
+                row[f'{metric}_previous'] = kind(0)
+        return row
+
+    def results(self):
+        """Query results from the live table and, when the periods reach back far enough, the archive."""
+        columns, result = self.queryset()
+        results = [result]
+        earliest = self.previous_period[0] if self.shift else self.start
+        if archive.spans_archive(earliest):
+            results.append(self.queryset(ArchivedEvent)[1])
+        return columns, results
+
+    def run(self):
+        columns, results = self.results()
+        if columns is None:
+            totals = self._empty_metrics()
+            for result in results:
+                for metric, value in result.items():
+                    totals[metric] += value or 0
+            return self._finish([totals])
+
+        bucket_columns = [next(iter(DIMENSIONS[d])) for d in self.dimensions]
+        time_dimension = next((d for d in self.dimensions if d in TIME_DIMENSIONS), None)
+        time_index = self.dimensions.index(time_dimension) if time_dimension else None
+        buckets = set(time_buckets(time_dimension, self.start, self.end)) if time_dimension else None
+
+        merged = {}
+
+        def target(row, key):
+            if key not in merged:
+                merged[key] = {column: row[column] for column in columns}
+                merged[key].update(zip(bucket_columns, key))
+                merged[key].update(self._empty_metrics())
+            return merged[key]
+
+        for row in chain.from_iterable(results):
+            key = tuple(row[column] for column in bucket_columns)
+            if time_dimension is None or key[time_index] in buckets:
+                current = target(row, key)
+                for metric in self.metrics:
+                    current[metric] += row[metric] or 0
+            if self.shift:
+                if time_dimension:
+                    # Credit previous-period values to the matching current bucket
+                    key = list(key)
+                    key[time_index] = shift(key[time_index], self.shift, sign=1)
+                    key = tuple(key)
+                    if key[time_index] not in buckets:
+                        continue
+                previous = target(row, key)
+                for metric in self.metrics:
+                    previous[f'{metric}_previous'] += row[f'{metric}_previous'] or 0
+
+        if time_dimension:
+            # Every combination of the other dimensions gets every bucket
+            others = {}
+            for key, row in merged.items():
+                others.setdefault(key[:time_index] + key[time_index + 1:], row)
+            if not others and len(self.dimensions) == 1:
+                others[()] = {column: None for column in columns}
+            for rest, sample in others.items():
+                for bucket in buckets:
+                    key = rest[:time_index] + (bucket,) + rest[time_index:]
+                    target(sample, key)
+
+        rows = [merged[key] for key in sorted(merged, key=self._sort_key)]
+        return self._finish(rows)
+
+    def _sort_key(self, key):
+        return tuple((value is None, value) for value in key)
+
+    def _finish(self, rows):
+        for row in rows:
+            if 'chef_first_name' in row:
+                first, last = row.pop('chef_first_name'), row.pop('chef_last_name')
+                row['chef_name'] = f'{first} {last}' if row['chef_id'] else None
+        return [{k: _serialize(v) for k, v in row.items()} for row in rows]
+
+    def to_dict(self):
+        previous = self.previous_period
+        return {
+            'period': {
+                'start_date': str(self.start),
+                'end_date': str(self.end),
+            },
+            'comparison': {
+                'start_date': str(previous[0]),
+                'end_date': str(previous[1]),
+            } if previous else None,
+            'dimensions': self.dimensions,
+            'metrics': self.metrics,
+            'rows': self.run(),
+        }
+
+    def cached(self):
+        key = self.cache_key()
+        data = cache.get(key)
+        record_cache('reports', data is not None)
+        if data is None:
+            data = self.to_dict()
+            cache.set(key, data, timeout=settings.REPORT_CACHE_TTL)
+        return data
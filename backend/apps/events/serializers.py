@@ -1,10 +1,10 @@
 from rest_framework import serializers
-from .models import Event
-from apps.clients.models import Client
-from apps.chefs.models import ChefProfile
+from core.fields import BatchedListSerializer, TenantClientField, TenantChefField
+from core.fieldsets import SparseFieldsMixin
+from .models import ChefPayout, Event, PayoutRun
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.name', read_only=True)
     chef_name = serializers.SerializerMethodField()
     chef_color = serializers.SerializerMethodField()
@@ -17,6 +17,12 @@ class EventListSerializer(serializers.ModelSerializer):
             'client', 'client_name', 'chef', 'chef_name', 'chef_color',
             'guest_count', 'status', 'client_pay'
         ]
+        list_serializer_class = BatchedListSerializer
+        sparse_sources = {
+            'display_name': ['name', 'client__name'],
+            'chef_name': ['chef__membership__user__first_name', 'chef__membership__user__last_name'],
+            'chef_color': ['chef__calendar_color'],
+        }
     
     def get_chef_name(self, obj):
         if obj.chef:
@@ -29,7 +35,7 @@ class EventListSerializer(serializers.ModelSerializer):
         return '#9E9E9E'
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.name', read_only=True)
     client_email = serializers.CharField(source='client.email', read_only=True)
     client_phone = serializers.CharField(source='client.phone', read_only=True)
@@ -53,6 +59,14 @@ class EventDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'profit', 'created_at', 'updated_at']
+        sparse_sources = {
+            'display_name': ['name', 'client__name'],
+            'chef_name': ['chef__membership__user__first_name', 'chef__membership__user__last_name'],
+            'chef_email': ['chef__membership__user__email'],
+            'chef_phone': ['chef__membership__user__phone'],
+            'chef_color': ['chef__calendar_color'],
+            'profit': ['client_pay', 'chef_pay'],
+        }
     
     def get_chef_name(self, obj):
         return obj.chef.user.full_name if obj.chef else None
@@ -68,6 +82,10 @@ class EventDetailSerializer(serializers.ModelSerializer):
 
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
+    # Scoped to request.organization, so cross-tenant ids fail the lookup itself
+    client = TenantClientField()
+    chef = TenantChefField(allow_null=True, required=False)
+
     class Meta:
         model = Event
         fields = [
@@ -78,9 +96,6 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
         ]
     
     def validate_client(self, value):
-        request = self.context['request']
-        if value.organization != request.organization:
-            raise serializers.ValidationError('Invalid client.')
         if value.is_deleted:
             raise serializers.ValidationError('Cannot assign deleted client.')
         return value
@@ -88,15 +103,27 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
     def validate_chef(self, value):
         if value is None:
             return value
-        request = self.context['request']
-        if value.organization != request.organization:
-            raise serializers.ValidationError('Invalid chef.')
         if not value.is_active:
             raise serializers.ValidationError('Cannot assign inactive chef.')
         return value
 
+    def validate(self, attrs):
+        # A settled event's pay is already part of a chef payout
+        if self.instance and self.instance.payout_run_id:
+            chef = attrs.get('chef', self.instance.chef)
+            changed = (
+                ('chef' in attrs and getattr(chef, 'pk', None) != self.instance.chef_id)
+                or ('chef_pay' in attrs and attrs['chef_pay'] != self.instance.chef_pay)
+                or ('status' in attrs and attrs['status'] != self.instance.status)
+            )
+            if changed:
+                raise serializers.ValidationError(
+                    'Chef, chef pay and status cannot change once an event has been settled.'
+                )
+        return attrs
 
-class EventChefViewSerializer(serializers.ModelSerializer):
+
+class EventChefViewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.name', read_only=True)
     client_email = serializers.CharField(source='client.email', read_only=True)
     client_phone = serializers.CharField(source='client.phone', read_only=True)
@@ -117,6 +144,8 @@ class EventChefViewSerializer(serializers.ModelSerializer):
             'location', 'guest_count', 'allergies', 'menu_notes',
             'chef_pay', 'status'
         ]
+        list_serializer_class = BatchedListSerializer
+        sparse_sources = {'display_name': ['name', 'client__name']}
 
 
 class EventCalendarSerializer(serializers.ModelSerializer):
@@ -151,3 +180,34 @@ class EventCalendarSerializer(serializers.ModelSerializer):
             'location': obj.location,
             'status': obj.status
         }
+
+
+class ChefPayoutSerializer(serializers.ModelSerializer):
+    chef_name = serializers.CharField(source='chef.user.full_name', read_only=True)
+    period_start = serializers.DateField(source='run.period_start', read_only=True)
+    period_end = serializers.DateField(source='run.period_end', read_only=True)
+
+    class Meta:
+        model = ChefPayout
+        fields = [
+            'id', 'run', 'period_start', 'period_end', 'chef', 'chef_name',
+            'amount', 'event_count', 'paid_at', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class PayoutRunSerializer(serializers.ModelSerializer):
+    payouts = ChefPayoutSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = PayoutRun
+        fields = [
+            'id', 'period_start', 'period_end', 'total_amount', 'event_count',
+            'created_by', 'created_at', 'payouts'
+        ]
+        read_only_fields = ['id', 'total_amount', 'event_count', 'created_by', 'created_at', 'payouts']
+
+    def validate(self, attrs):
+        if attrs['period_end'] < attrs['period_start']:
+            raise serializers.ValidationError('period_end must not be before period_start.')
+        return attrs
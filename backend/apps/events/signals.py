@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from apps.clients.models import Client
+from apps.chefs.models import ChefProfile
+from . import calendar, live, reports
+from .models import Event
+
+User = get_user_model()
+
+# Sent with organization_id, events as (id, chef id) pairs and removed, once
+# bulk updates or archival that bypass Event.save() have committed. Restores
+# also send clients as (chef id, client id) pairs for the clients they bring back
+events_changed = Signal()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_months(sender, instance, signal, **kwargs):
+    dates = [instance.date, getattr(instance, '_loaded_date', None)]
+    instance._loaded_date = instance.date
+    organization_id = instance.organization_id
+    pk = instance.pk
+    chefs = [instance.chef_id, getattr(instance, '_loaded_chef_id', None)]
+    removed = signal is post_delete or instance.is_deleted
+
+    def invalidate():
+        calendar.invalidate_months(organization_id, dates)
+        reports.invalidate(organization_id)
+        live.publish(organization_id, [pk], dates, chefs, removed)
+
+    transaction.on_commit(invalidate, using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client_calendars(sender, instance, **kwargs):
+    # Client names appear in every shard (and report) the client has events in
+    organization_id = instance.organization_id
+
+    def invalidate():
+        calendar.invalidate_organization(organization_id)
+        reports.invalidate(organization_id)
+
+    transaction.on_commit(invalidate, using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=ChefProfile)
+def invalidate_chef_calendars(sender, instance, **kwargs):
+    organization_id = instance.membership.organization_id
+
+    def invalidate():
+        calendar.invalidate_organization(organization_id)
+        reports.invalidate(organization_id)
+
+    transaction.on_commit(invalidate, using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_calendars(sender, instance, created, **kwargs):
+    if created:
+        return
+    organization_ids = list(instance.memberships.values_list('organization_id', flat=True))
+
+    def invalidate():
+        for organization_id in organization_ids:
+            calendar.invalidate_organization(organization_id)
+            reports.invalidate(organization_id)
+
+    transaction.on_commit(invalidate, using=kwargs.get('using'))
@@ -0,0 +1,60 @@
+import logging
+
+from celery import shared_task
+from apps.organizations.models import Organization, OrganizationShard
+from core.sharding import CENTRAL, lookup, shards, use_shard
+from .archive import archive
+from .partitions import ensure_partitions
+from .transitions import complete_past_events
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def complete_past_events_task():
+    """
+    Complete yesterday's (and any older) upcoming events in every organization.
+
+    Scheduled hourly so each organization is handled shortly after its own
+    local midnight; runs with nothing to do are a single indexed query per
+    organization.
+    """
+    counts = {}
+    for organization in Organization.objects.only('id', 'timezone').iterator():
+        alias, is_moving = lookup(organization.id)
+        if is_moving:
+            continue  # Picked up by the next run, on its new shard
+        with use_shard(alias):
+            updated = complete_past_events(organization)
+        if updated:
+            counts[organization.id] = updated
+    logger.info(
+        'Auto-completed %d past events across %d organizations',
+        sum(counts.values()), len(counts),
+    )
+    return counts
+
+
+@shared_task(ignore_result=True)
+def create_event_partitions_task():
+    """Create next years' event partitions on every shard ahead of time."""
+    created = {alias: ensure_partitions(using=alias) for alias in shards()}
+    for alias, names in created.items():
+        if names:
+            logger.info('Created event partitions on %s: %s', alias, ', '.join(names))
+    return created
+
+
+@shared_task(ignore_result=True)
+def archive_events_task():
+    """Archive old deleted and completed events, and deleted clients, on every shard."""
+    # Rows of an organization being moved must stay put until it's done
+    moving = list(OrganizationShard.objects.using(CENTRAL).filter(
+        is_moving=True,
+    ).values_list('organization_id', flat=True))
+    counts = {}
+    for alias in shards():
+        with use_shard(alias):
+            counts[alias] = archive(exclude_organizations=moving)
+        logger.info('Archived %(events)d events and %(clients)d clients', counts[alias])
+    return counts
@@ -0,0 +1,338 @@
+"""
+Event writes through the API, and live update streams (see live.py) driven
+through their ASGI app on the in-process hub. The stream tests fake the
+membership checks, so they need no database.
+"""
+import asyncio
+import datetime
+import json
+from contextlib import contextmanager
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+
+from apps.events import live
+from apps.events.models import Event, PayoutRun
+from apps.events.transitions import complete_past_events
+from apps.events.serializers import EventListSerializer
+from core import identity
+from core.testing import api_client, make_chef, make_client, make_event, make_organization
+
+STREAMS = 1000
+ORGANIZATION = 1
+
+
+def selects_from(queries, table):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+    ]
+
+
+class EventWriteRelationsTests(TestCase):
+    """Client and chef ids are checked with one lookup each, scoped to the organization."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, cls.admin = make_organization()
+        cls.client_row = make_client(cls.organization)
+        cls.chef = make_chef(cls.organization)
+        other, _ = make_organization('Other Kitchen')
+        cls.other_client = make_client(other, 'Other Client')
+        cls.other_chef = make_chef(other, 'Olga')
+
+    def setUp(self):
+        self.api = api_client(self.admin)
+
+    def payload(self, **fields):
+        return {
+            'client': self.client_row.pk, 'chef': self.chef.pk, 'date': '2030-05-04',
+            'start_time': '18:00', 'guest_count': 6, 'client_pay': '450.00', **fields,
+        }
+
+    def assert_one_scoped_lookup(self, queries):
+        for table in ('clients_client', 'chefs_chefprofile'):
+            lookups = selects_from(queries, table)
+            self.assertEqual(len(lookups), 1, lookups)
+            self.assertIn('organization_id', lookups[0])
+
+    def test_create_looks_up_each_relation_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.post('/api/events/', self.payload(), format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assert_one_scoped_lookup(queries)
+
+    def test_update_looks_up_each_relation_once(self):
+        event = make_event(self.client_row)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.patch(
+                f'/api/events/{event.pk}/', {'client': self.client_row.pk, 'chef': self.chef.pk}, format='json',
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assert_one_scoped_lookup(queries)
+        event.refresh_from_db()
+        self.assertEqual(event.chef_id, self.chef.pk)
+
+    def test_other_organizations_rows_are_rejected(self):
+        response = self.api.post(
+            '/api/events/', self.payload(client=self.other_client.pk, chef=self.other_chef.pk), format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['client'], ['Invalid client.'])
+        self.assertEqual(response.data['chef'], ['Invalid chef.'])
+        self.assertFalse(Event.objects.exists())
+
+    def test_deleted_client_and_inactive_chef_are_rejected(self):
+        self.client_row.soft_delete()
+        self.chef.membership.is_active = False
+        self.chef.membership.save()
+        response = self.api.post('/api/events/', self.payload(), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['client'], ['Cannot assign deleted client.'])
+        self.assertEqual(response.data['chef'], ['Cannot assign inactive chef.'])
+
+
+class Stream:
+    """An EventSource-like client of live.application."""
+
+    def __init__(self, ticket):
+        self.ticket = ticket
+        self.status = None
+        self.messages = []
+        self.opened = asyncio.Event()
+        self.received = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.requested = False
+        self.task = None
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.closing.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+            if self.status != 200:
+                self.opened.set()
+            return
+        body = message.get('body', b'').decode()
+        if body.startswith('retry:'):
+            self.opened.set()
+        elif body.startswith('data:'):
+            self.messages.append(json.loads(body.removeprefix('data:')))
+            self.received.set()
+
+    def open(self):
+        self.task = asyncio.ensure_future(live.application({
+            'type': 'http',
+            'method': 'GET',
+            'path': live.STREAM_PATH,
+            'query_string': f'ticket={self.ticket}'.encode(),
+            'headers': [(b'host', b'localhost')],
+        }, self.receive, self.send))
+        return self.opened.wait()
+
+
+class TransitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, _ = make_organization(timezone='Pacific/Kiritimati')
+        cls.client_row = make_client(cls.organization)
+
+    def test_completes_past_events_in_chunks_and_skips_settled(self):
+        today = datetime.date.today()
+        past = [make_event(self.client_row, date=today - datetime.timedelta(days=i)) for i in range(2, 7)]
+        upcoming = make_event(self.client_row, date=today + datetime.timedelta(days=3))
+        run = PayoutRun.objects.create(organization=self.organization, period_start=today, period_end=today)
+        settled = make_event(self.client_row, date=today - datetime.timedelta(days=3), payout_run=run)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(complete_past_events(self.organization, chunk_size=2), 5)
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 3)
+        # The UPDATE repeats the filter, so rows settled since the read are left alone
+        self.assertTrue(all('payout_run_id" IS NULL' in sql for sql in updates))
+
+        statuses = dict(Event.objects.values_list('pk', 'status'))
+        self.assertEqual({statuses[event.pk] for event in past}, {'completed'})
+        self.assertEqual(statuses[upcoming.pk], 'upcoming')
+        self.assertEqual(statuses[settled.pk], 'upcoming')
+
+
+class UntracedEventSerializer(EventListSerializer):
+    """A field the list serializer can't trace, so it keeps the view's joins."""
+    client_label = serializers.SerializerMethodField()
+
+    class Meta(EventListSerializer.Meta):
+        fields = EventListSerializer.Meta.fields + ['client_label']
+
+    def get_client_label(self, obj):
+        return obj.client.name.upper()
+
+
+class EventListQueryTests(TestCase):
+    """Lists cost the same number of queries however many rows they have."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, cls.admin = make_organization()
+        cls.client_row = make_client(cls.organization)
+        cls.chef = make_chef(cls.organization)
+
+    def add_events(self, count):
+        start = Event.objects.count()
+        for i in range(start, start + count):
+            client = make_client(self.organization, f'Client {i}')
+            make_event(client, make_chef(self.organization, f'Chef{i}'), name=f'Dinner {i}')
+
+    def count_queries(self, path):
+        api = api_client(self.admin)
+        api.get(path)  # Warms the user and shard caches
+        with CaptureQueriesContext(connection) as queries:
+            response = api.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response.json()
+
+    def test_event_list_batches_relations(self):
+        self.add_events(2)
+        few, _ = self.count_queries('/api/events/')
+        self.add_events(5)
+        many, events = self.count_queries('/api/events/')
+        self.assertEqual(few, many)
+        self.assertEqual(len(events), 7)
+        self.assertTrue(all(event['chef_name'] and event['client_name'] for event in events))
+
+    def test_untraceable_fields_keep_the_joins(self):
+        self.add_events(3)
+        queryset = Event.objects.select_related('client', 'chef__membership__user')
+        with identity.request_scope(), CaptureQueriesContext(connection) as queries:
+            rows = UntracedEventSerializer(queryset, many=True).data
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual([row['client_label'] for row in rows], ['CLIENT 0', 'CLIENT 1', 'CLIENT 2'])
+
+    def test_outside_a_request_scope_the_joins_stay(self):
+        self.add_events(3)
+        queryset = Event.objects.select_related('client', 'chef__membership__user')
+        with CaptureQueriesContext(connection) as queries:
+            rows = EventListSerializer(queryset, many=True).data
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(len(rows), 3)
+
+    def test_client_list_counts_events_in_the_list_query(self):
+        make_event(self.client_row)
+        make_event(self.client_row).soft_delete()
+        few, _ = self.count_queries('/api/clients/')
+        self.add_events(4)
+        many, clients = self.count_queries('/api/clients/')
+        self.assertEqual(few, many)
+        counts = {client['name']: client['event_count'] for client in clients}
+        self.assertEqual(counts['Grace Client'], 1)
+        self.assertEqual(counts['Client 3'], 1)
+
+
+async def open_all(streams):
+    await asyncio.wait_for(asyncio.gather(*(stream.open() for stream in streams)), timeout=10)
+
+
+async def close_all(streams):
+    for stream in streams:
+        stream.closing.set()
+    await asyncio.wait_for(asyncio.gather(*(stream.task for stream in streams)), timeout=10)
+
+
+async def publish(events, chefs):
+    # From a thread, like the commit hook of a sync view
+    await asyncio.to_thread(live.publish, ORGANIZATION, events, ['2026-10-22'], chefs)
+
+
+@contextmanager
+def in_memory_hub(revoked=()):
+    """No Redis, and every membership allowed except `revoked`."""
+    def allowed_memberships(streams):
+        return set(streams) - set(revoked)
+
+    with (
+        mock.patch.object(live, 'get_redis', return_value=None),
+        mock.patch.object(live, 'allowed_memberships', allowed_memberships),
+        override_settings(LIVE_MEMBERSHIP_CHECK_SECONDS=0.05, LIVE_HEARTBEAT_SECONDS=0.05),
+    ):
+        yield
+
+
+def test_fan_out_to_many_streams_and_cleanup():
+    async def scenario():
+        admins = [Stream(live.make_ticket(ORGANIZATION, i)) for i in range(STREAMS)]
+        chefs = [Stream(live.make_ticket(ORGANIZATION, STREAMS + i, chef_id=7)) for i in range(10)]
+        elsewhere = Stream(live.make_ticket(ORGANIZATION + 1, 2 * STREAMS))
+        everyone = [*admins, *chefs, elsewhere]
+        await open_all(everyone)
+        assert {stream.status for stream in everyone} == {200}
+        hub = live.get_hub()
+        assert len(hub.streams[ORGANIZATION]) == STREAMS + len(chefs)
+
+        await publish([12], [3])
+        await asyncio.wait_for(asyncio.gather(*(stream.received.wait() for stream in admins)), timeout=10)
+        await publish([13], [7])
+        await asyncio.wait_for(asyncio.gather(*(stream.received.wait() for stream in chefs)), timeout=10)
+        await asyncio.sleep(0.1)
+
+        first = {'events': [12], 'dates': ['2026-10-22'], 'chefs': [3], 'removed': False}
+        second = {'events': [13], 'dates': ['2026-10-22'], 'chefs': [7], 'removed': False}
+        assert all(stream.messages == [first, second] for stream in admins)
+        # Chefs only hear about their own events, other organizations about nothing
+        assert all(stream.messages == [second] for stream in chefs)
+        assert elsewhere.messages == []
+
+        await close_all(everyone)
+        assert hub.streams == {}
+        await asyncio.wait_for(hub.checker, timeout=1)
+
+    with in_memory_hub():
+        asyncio.run(scenario())
+
+
+def test_streams_of_revoked_memberships_close():
+    revoked = set()
+
+    async def scenario():
+        kept = Stream(live.make_ticket(ORGANIZATION, 1))
+        dropped = [Stream(live.make_ticket(ORGANIZATION, 2, chef_id=7)) for _ in range(2)]
+        await open_all([kept, *dropped])
+        hub = live.get_hub()
+
+        revoked.add(2)
+        await asyncio.wait_for(asyncio.gather(*(stream.task for stream in dropped)), timeout=1)
+        assert not kept.task.done()
+        assert list(hub.streams[ORGANIZATION].values()) == [(1, None)]
+
+        await publish([12], [7])
+        await asyncio.wait_for(kept.received.wait(), timeout=1)
+        assert all(stream.messages == [] for stream in dropped)
+
+        # A ticket issued before the revocation no longer connects
+        late = Stream(dropped[0].ticket)
+        await open_all([late])
+        assert late.status == 403
+
+        await close_all([kept])
+        assert hub.streams == {}
+
+    with in_memory_hub(revoked):
+        asyncio.run(scenario())
+
+
+def test_invalid_ticket_is_refused():
+    async def scenario():
+        stream = Stream('not-a-ticket')
+        await open_all([stream])
+        await stream.task
+        assert stream.status == 403
+
+    with in_memory_hub():
+        asyncio.run(scenario())
@@ -0,0 +1,81 @@
+"""
+Bulk event status transitions.
+
+Transitions run in chunks, so a backlog of thousands of events never holds
+long row locks. Each chunk takes two statements: a SELECT of up to n ids
+and chefs, which the sync log and live updates need, then one `UPDATE ...
+WHERE id IN (...)` that repeats the transition's filter, so an event settled
+or changed in between is left alone. Both bypass Event.save().
+Because save() signals don't fire, the calendar months and reports touched
+are invalidated, and `events_changed` and a live update are sent, here once
+the updates commit.
+"""
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils import timezone
+
+from . import calendar, live, reports, signals
+from .models import Event
+
+
+def organization_today(organization):
+    try:
+        zone = ZoneInfo(organization.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = ZoneInfo('UTC')
+    return timezone.now().astimezone(zone).date()
+
+
+def transition(organization, queryset, status, chunk_size=None):
+    """Set `status` on every event in `queryset`. Returns the number updated."""
+    chunk_size = chunk_size or settings.EVENT_TRANSITION_CHUNK_SIZE
+    # Settled events keep the status their chef payout was computed from
+    queryset = queryset.filter(
+        organization=organization, payout_run__isnull=True,
+    ).exclude(status=status)
+    months = list(queryset.dates('date', 'month'))
+    if not months:
+        return 0
+
+    updated = 0
+    changed = []
+    while True:
+        chunk = list(queryset.order_by('pk').values_list('pk', 'chef_id')[:chunk_size])
+        if not chunk:
+            break
+        updated += queryset.filter(pk__in=[pk for pk, _ in chunk]).update(
+            status=status,
+            updated_at=timezone.now(),
+        )
+        changed.extend(chunk)
+        if len(chunk) < chunk_size:
+            break
+
+    if updated:
+        organization_id = organization.id
+
+        def invalidate():
+            calendar.invalidate_months(organization_id, months)
+            reports.invalidate(organization_id)
+            signals.events_changed.send(Event, organization_id=organization_id, events=changed)
+            live.publish(
+                organization_id,
+                [pk for pk, _ in changed],
+                months,
+                [chef_id for _, chef_id in changed],
+            )
+
+        transaction.on_commit(invalidate, using=router.db_for_write(Event))
+    return updated
+
+
+def complete_past_events(organization, chunk_size=None):
+    """Complete upcoming events dated before today in the organization's timezone."""
+    past = Event.objects.filter(
+        status=Event.Status.UPCOMING,
+        is_deleted=False,
+        date__lt=organization_today(organization),
+    )
+    return transition(organization, past, Event.Status.COMPLETED, chunk_size)
@@ -4,12 +4,20 @@ from .views import (
     EventDetailView,
     EventCompleteView,
     EventCancelView,
-    EventCalendarView
+    EventBulkStatusView,
+    EventCalendarView,
+    EventCalendarMonthView,
+    EventCalendarSummaryView,
+    EventStreamTicketView,
 )
 
 urlpatterns = [
     path('', EventListCreateView.as_view(), name='event_list_create'),
+    path('bulk-status/', EventBulkStatusView.as_view(), name='event_bulk_status'),
     path('calendar/', EventCalendarView.as_view(), name='event_calendar'),
+    path('calendar/summary/', EventCalendarSummaryView.as_view(), name='event_calendar_summary'),
+    path('calendar/<int:year>/<int:month>/', EventCalendarMonthView.as_view(), name='event_calendar_month'),
+    path('stream/ticket/', EventStreamTicketView.as_view(), name='event_stream_ticket'),
     path('<int:pk>/', EventDetailView.as_view(), name='event_detail'),
     path('<int:pk>/complete/', EventCompleteView.as_view(), name='event_complete'),
     path('<int:pk>/cancel/', EventCancelView.as_view(), name='event_cancel'),
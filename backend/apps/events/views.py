@@ -1,23 +1,37 @@
-from django.db.models import Sum, Count
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+from django.conf import settings
+from django.db.models import Case, Count, DecimalField, F, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.http import parse_etags
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from core.fieldsets import SparseQuerysetMixin
 from core.mixins import TenantQuerysetMixin, TenantMixin
-from core.permissions import IsAdmin
+from core.permissions import IsAdmin, IsChefOrAdmin
 from core.email import send_event_assignment_email, send_event_update_email
-from .models import Event
+from core.identity import remember, resolve
+from . import archive, calendar, live
+from .payouts import settle
+from .reports import Report, ReportError
+from .transitions import complete_past_events, transition
+from .models import ChefPayout, Event, PayoutRun, SettledEventError
 from .serializers import (
     EventListSerializer,
     EventDetailSerializer,
     EventCreateUpdateSerializer,
     EventChefViewSerializer,
-    EventCalendarSerializer
+    ChefPayoutSerializer,
+    PayoutRunSerializer
 )
 
 
-class EventListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
+class EventListCreateView(SparseQuerysetMixin, TenantQuerysetMixin, generics.ListCreateAPIView):
     queryset = Event.objects.filter(is_deleted=False)
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -46,6 +60,7 @@ class EventListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
         if chef_filter and self.request.membership and self.request.membership.role == 'admin':
             qs = qs.filter(chef__membership__id=chef_filter)
         
+        # Replaced by batched loading where the list serializer can (see core/fields.py)
         return qs.select_related('client', 'chef__membership__user')
     
     def get_serializer_class(self):
@@ -77,7 +92,7 @@ class EventListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
         return super().create(request, *args, **kwargs)
 
 
-class EventDetailView(TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+class EventDetailView(SparseQuerysetMixin, TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Event.objects.filter(is_deleted=False)
     permission_classes = [IsAuthenticated]
     
@@ -114,27 +129,30 @@ class EventDetailView(TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView
 
         # Admin updating - check for chef changes
         instance = self.get_object()
-        old_chef = instance.chef
+        remember(instance)
+        old_chef_id = instance.chef_id
 
         response = super().update(request, *args, **kwargs)
 
-        # Refresh instance to get updated values
+        # Refresh instance to get updated values; relations come back from
+        # the identity map instead of being queried again
         instance.refresh_from_db()
+        chef = resolve(instance, 'chef')
 
         # Send notifications
         try:
-            if instance.chef:
-                if old_chef != instance.chef:
+            if chef:
+                if old_chef_id != chef.id:
                     # New chef assigned - send assignment email
                     send_event_assignment_email(
-                        instance.chef.user,
+                        chef.user,
                         instance,
                         request.organization
                     )
                 else:
                     # Same chef - send update email
                     send_event_update_email(
-                        instance.chef.user,
+                        chef.user,
                         instance,
                         request.organization
                     )
@@ -150,7 +168,10 @@ class EventDetailView(TenantQuerysetMixin, generics.RetrieveUpdateDestroyAPIView
                 status=status.HTTP_403_FORBIDDEN
             )
         instance = self.get_object()
-        instance.soft_delete()
+        try:
+            instance.soft_delete()
+        except SettledEventError as exc:
+            return Response({'detail': exc.message}, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -167,6 +188,8 @@ class EventCompleteView(TenantMixin, APIView):
             event.status = 'completed'
             event.save()
             return Response({'detail': 'Event marked as completed.'})
+        except SettledEventError as exc:
+            return Response({'detail': exc.message}, status=status.HTTP_400_BAD_REQUEST)
         except Event.DoesNotExist:
             return Response(
                 {'detail': 'Event not found.'},
@@ -187,6 +210,8 @@ class EventCancelView(TenantMixin, APIView):
             event.status = 'cancelled'
             event.save()
             return Response({'detail': 'Event cancelled.'})
+        except SettledEventError as exc:
+            return Response({'detail': exc.message}, status=status.HTTP_400_BAD_REQUEST)
         except Event.DoesNotExist:
             return Response(
                 {'detail': 'Event not found.'},
@@ -194,39 +219,209 @@ class EventCancelView(TenantMixin, APIView):
             )
 
 
-class EventCalendarView(TenantQuerysetMixin, generics.ListAPIView):
-    queryset = Event.objects.filter(is_deleted=False).exclude(status='cancelled')
-    serializer_class = EventCalendarSerializer
+class EventBulkStatusView(TenantMixin, APIView):
+    """
+    Change the status of many events at once. Admin only.
+
+    Body:
+    - status: completed or cancelled
+    - ids: event ids to change. Optional for completed, where it defaults to
+      every upcoming event dated before today in the organization's timezone.
+
+    Only upcoming events change.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        target = request.data.get('status')
+        if target not in (Event.Status.COMPLETED, Event.Status.CANCELLED):
+            return Response({'detail': 'status must be completed or cancelled.'}, status=400)
+
+        ids = request.data.get('ids')
+        if ids is None and target == Event.Status.COMPLETED:
+            updated = complete_past_events(request.organization)
+            return Response({'status': target, 'updated': updated})
+
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+            return Response({'detail': 'ids must be a non-empty list of event ids.'}, status=400)
+        if len(ids) > settings.EVENT_BULK_STATUS_MAX_IDS:
+            return Response(
+                {'detail': f'At most {settings.EVENT_BULK_STATUS_MAX_IDS} ids per request.'},
+                status=400
+            )
+
+        events = Event.objects.filter(
+            pk__in=ids,
+            status=Event.Status.UPCOMING,
+            is_deleted=False,
+        )
+        updated = transition(request.organization, events, target)
+        return Response({'status': target, 'updated': updated})
+
+
+class EventCalendarView(TenantMixin, APIView):
+    """
+    Calendar events for a date range, assembled from cached month shards.
+
+    Query params:
+    - start: YYYY-MM-DD (defaults to first day of current month)
+    - end: YYYY-MM-DD (defaults to last day of start's month)
+    - chef_id: membership id or 'unassigned' (admin only)
+
+    The range may span at most CALENDAR_MAX_WINDOW_DAYS days.
+    """
     permission_classes = [IsAuthenticated]
-    
-    def get_queryset(self):
-        qs = super().get_queryset()
-        
-        if self.request.membership and self.request.membership.role == 'chef':
-            chef_profile = getattr(self.request.membership, 'chef_profile', None)
-            if chef_profile:
-                qs = qs.filter(chef=chef_profile)
-            else:
-                return qs.none()
-        
-        # Date range filtering
-        start = self.request.query_params.get('start')
-        end = self.request.query_params.get('end')
-        
-        if start:
-            qs = qs.filter(date__gte=start)
-        if end:
-            qs = qs.filter(date__lte=end)
-        
-        # Chef filter (admin only)
-        chef_id = self.request.query_params.get('chef_id')
-        if chef_id and self.request.membership and self.request.membership.role == 'admin':
-            if chef_id == 'unassigned':
-                qs = qs.filter(chef__isnull=True)
-            else:
-                qs = qs.filter(chef__membership__id=chef_id)
 
-        return qs.select_related('client', 'chef__membership__user')
+    def get(self, request):
+        if not request.organization:
+            return Response([])
+
+        try:
+            start = request.query_params.get('start')
+            start = date.fromisoformat(start[:10]) if start else timezone.now().date().replace(day=1)
+        except ValueError:
+            return Response({'detail': 'Invalid start format. Use YYYY-MM-DD.'}, status=400)
+        try:
+            end = request.query_params.get('end')
+            end = date.fromisoformat(end[:10]) if end else calendar.month_bounds(start.year, start.month)[1]
+        except ValueError:
+            return Response({'detail': 'Invalid end format. Use YYYY-MM-DD.'}, status=400)
+
+        if end < start:
+            return Response({'detail': 'end must not be before start.'}, status=400)
+        if (end - start).days > settings.CALENDAR_MAX_WINDOW_DAYS:
+            return Response(
+                {'detail': f'Date range may span at most {settings.CALENDAR_MAX_WINDOW_DAYS} days.'},
+                status=400
+            )
+
+        scope = calendar.get_scope(request)
+        if scope is None:
+            return Response([])
+
+        shards = calendar.get_shards(request, scope, calendar.months_between(start, end))
+        start_str, end_str = str(start), str(end)
+        return Response([
+            event
+            for _, events in shards.values()
+            for event in events
+            if start_str <= event['start'][:10] <= end_str
+        ])
+
+
+class EventCalendarSummaryView(TenantMixin, APIView):
+    """
+    Per-day event counts, guest totals and chef colors for month/year views.
+
+    Admins also get per-day revenue.
+
+    Query params:
+    - start: YYYY-MM-DD (defaults to January 1st of the current year)
+    - end: YYYY-MM-DD (defaults to December 31st of start's year)
+    - chef_id: membership id or 'unassigned' (admin only)
+
+    The range may span at most CALENDAR_SUMMARY_MAX_DAYS days.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+
+        try:
+            start = request.query_params.get('start')
+            start = date.fromisoformat(start[:10]) if start else timezone.now().date().replace(month=1, day=1)
+        except ValueError:
+            return Response({'detail': 'Invalid start format. Use YYYY-MM-DD.'}, status=400)
+        try:
+            end = request.query_params.get('end')
+            end = date.fromisoformat(end[:10]) if end else start.replace(month=12, day=31)
+        except ValueError:
+            return Response({'detail': 'Invalid end format. Use YYYY-MM-DD.'}, status=400)
+
+        if end < start:
+            return Response({'detail': 'end must not be before start.'}, status=400)
+        if (end - start).days > settings.CALENDAR_SUMMARY_MAX_DAYS:
+            return Response(
+                {'detail': f'Date range may span at most {settings.CALENDAR_SUMMARY_MAX_DAYS} days.'},
+                status=400
+            )
+
+        scope = calendar.get_scope(request)
+        days = []
+        if scope is not None:
+            queryset = calendar.scope_queryset(request, scope).filter(date__gte=start, date__lte=end)
+            days = calendar.day_summaries(
+                queryset,
+                include_revenue=request.membership.role == 'admin'
+            )
+
+        return Response({
+            'period': {
+                'start_date': str(start),
+                'end_date': str(end),
+            },
+            'days': days,
+        })
+
+
+class EventCalendarMonthView(TenantMixin, APIView):
+    """
+    One month of calendar events, served from a cached shard.
+
+    Clients fetch several months in parallel instead of one large range.
+    Responses carry an ETag that changes only when an event in that month
+    (or a chef/client shown in it) changes.
+
+    Query params:
+    - chef_id: membership id or 'unassigned' (admin only)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, year, month):
+        if not 1 <= month <= 12:
+            return Response({'detail': 'Invalid month.'}, status=400)
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+
+        scope = calendar.get_scope(request)
+        if scope is None:
+            return Response({'month': f'{year}-{month:02d}', 'events': []})
+
+        version, events = calendar.get_shards(request, scope, [(year, month)])[(year, month)]
+        etag = f'"{scope}:{version}"'
+        # Weak comparison: compressed copies carry W/ (see CompressionMiddleware)
+        if etag in [tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        response = Response({'month': f'{year}-{month:02d}', 'events': events})
+        response['ETag'] = etag
+        return response
+
+
+class EventStreamTicketView(TenantMixin, APIView):
+    """
+    A short-lived ticket for the live updates stream (see live.py), since
+    EventSource can't send an Authorization header. Chefs' streams only
+    carry their own events.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+        chef_id = None
+        if request.membership.role == 'chef':
+            chef = getattr(request.membership, 'chef_profile', None)
+            if chef is None:
+                return Response({'detail': 'Chef profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+            chef_id = chef.pk
+        ticket = live.make_ticket(request.organization.id, request.membership.id, chef_id)
+        return Response({
+            'ticket': ticket,
+            'url': f"{live.STREAM_PATH}?{urlencode({'ticket': ticket})}",
+            'expires_in': settings.LIVE_TICKET_MAX_AGE,
+        })
 
 
 class DashboardView(TenantMixin, APIView):
@@ -377,6 +572,35 @@ class DashboardView(TenantMixin, APIView):
         })
 
 
+def parse_period(request):
+    """
+    Read start_date/end_date query params (YYYY-MM-DD).
+
+    Defaults to the first day of the current month through today.
+    """
+    today = timezone.now().date()
+    start_date = request.query_params.get('start_date')
+    end_date = request.query_params.get('end_date')
+
+    if start_date:
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        except ValueError:
+            raise ParseError('Invalid start_date format. Use YYYY-MM-DD.')
+    else:
+        start_date = today.replace(day=1)
+
+    if end_date:
+        try:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            raise ParseError('Invalid end_date format. Use YYYY-MM-DD.')
+    else:
+        end_date = today
+
+    return start_date, end_date
+
+
 class FinancesView(TenantMixin, APIView):
     """
     Finances API - returns financial summary with date filtering.
@@ -392,29 +616,7 @@ class FinancesView(TenantMixin, APIView):
         if not request.organization:
             return Response({'detail': 'No organization found.'}, status=400)
 
-        today = timezone.now().date()
-
-        # Parse date filters
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-
-        if start_date:
-            try:
-                from datetime import datetime
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'detail': 'Invalid start_date format. Use YYYY-MM-DD.'}, status=400)
-        else:
-            start_date = today.replace(day=1)
-
-        if end_date:
-            try:
-                from datetime import datetime
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'detail': 'Invalid end_date format. Use YYYY-MM-DD.'}, status=400)
-        else:
-            end_date = today
+        start_date, end_date = parse_period(request)
 
         # Get completed events in date range
         completed_events = Event.objects.filter(
@@ -424,13 +626,19 @@ class FinancesView(TenantMixin, APIView):
             date__gte=start_date,
             date__lte=end_date
         )
-
-        # Aggregate totals
-        totals = completed_events.aggregate(
-            revenue=Sum('client_pay'),
-            paid_out=Sum('chef_pay'),
-            event_count=Count('id')
-        )
+        archived_events = archive.archived_events(
+            request.organization, start_date, end_date
+        ).filter(status='completed')
+
+        # Aggregate totals, live and archived
+        aggregates = {
+            'revenue': Sum('client_pay'),
+            'paid_out': Sum('chef_pay'),
+            'event_count': Count('id'),
+        }
+        totals = completed_events.aggregate(**aggregates)
+        for key, value in archived_events.aggregate(**aggregates).items():
+            totals[key] = (totals[key] or 0) + (value or 0)
 
         revenue = totals['revenue'] or 0
         paid_out = totals['paid_out'] or 0
@@ -466,57 +674,45 @@ class FinancesByChefView(TenantMixin, APIView):
         if not request.organization:
             return Response({'detail': 'No organization found.'}, status=400)
 
-        today = timezone.now().date()
-
-        # Parse date filters
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-
-        if start_date:
-            try:
-                from datetime import datetime
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'detail': 'Invalid start_date format. Use YYYY-MM-DD.'}, status=400)
-        else:
-            start_date = today.replace(day=1)
-
-        if end_date:
-            try:
-                from datetime import datetime
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'detail': 'Invalid end_date format. Use YYYY-MM-DD.'}, status=400)
-        else:
-            end_date = today
+        start_date, end_date = parse_period(request)
 
-        # Get completed events grouped by chef
-        chef_breakdown = Event.objects.filter(
-            organization=request.organization,
-            is_deleted=False,
-            status='completed',
-            date__gte=start_date,
-            date__lte=end_date,
-            chef__isnull=False
-        ).values(
-            'chef__id',
-            'chef__membership__user__first_name',
-            'chef__membership__user__last_name',
-            'chef__calendar_color'
-        ).annotate(
-            total_paid=Sum('chef_pay'),
-            event_count=Count('id')
-        ).order_by('-total_paid')
+        # Get completed events grouped by chef, live and archived
+        chef_breakdown = {}
+        for events in (
+            Event.objects.filter(
+                organization=request.organization,
+                is_deleted=False,
+                date__gte=start_date,
+                date__lte=end_date,
+            ),
+            archive.archived_events(request.organization, start_date, end_date),
+        ):
+            rows = events.filter(
+                status='completed',
+                chef__isnull=False
+            ).values(
+                'chef__id',
+                'chef__membership__user__first_name',
+                'chef__membership__user__last_name',
+                'chef__calendar_color'
+            ).annotate(
+                total_paid=Sum('chef_pay'),
+                event_count=Count('id')
+            ).order_by()
+            for item in rows:
+                total = chef_breakdown.setdefault(item['chef__id'], dict(item, total_paid=0, event_count=0))
+                total['total_paid'] += item['total_paid'] or 0
+                total['event_count'] += item['event_count']
 
         breakdown_data = [
             {
                 'chef_id': item['chef__id'],
                 'chef_name': f"{item['chef__membership__user__first_name']} {item['chef__membership__user__last_name']}",
                 'chef_color': item['chef__calendar_color'],
-                'total_paid': str(item['total_paid'] or 0),
+                'total_paid': str(item['total_paid']),
                 'event_count': item['event_count'],
             }
-            for item in chef_breakdown
+            for item in sorted(chef_breakdown.values(), key=lambda item: -item['total_paid'])
         ]
 
         return Response({
@@ -525,4 +721,262 @@ class FinancesByChefView(TenantMixin, APIView):
                 'end_date': str(end_date),
             },
             'by_chef': breakdown_data,
-        })
\ No newline at end of file
+        })
+
+
+AGING_BUCKETS = ('current', 'days_30', 'days_60', 'days_90_plus')
+
+
+class FinancesReceivablesView(TenantMixin, APIView):
+    """
+    Accounts-receivable aging of unpaid events, grouped by client.
+    Admin only.
+
+    Outstanding is client pay less any deposit already received, bucketed by
+    days past the event date: current (under 30, including upcoming events),
+    30-59, 60-89 and 90+.
+
+    Query params:
+    - as_of: YYYY-MM-DD (defaults to today)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+
+        as_of = request.query_params.get('as_of')
+        if as_of:
+            try:
+                as_of = datetime.strptime(as_of, '%Y-%m-%d').date()
+            except ValueError:
+                return Response({'detail': 'Invalid as_of format. Use YYYY-MM-DD.'}, status=400)
+        else:
+            as_of = timezone.now().date()
+
+        money = DecimalField(max_digits=12, decimal_places=2)
+        zero = Value(Decimal('0'), output_field=money)
+        outstanding = Case(
+            When(deposit_received=True, then=F('client_pay') - Coalesce('deposit_amount', zero)),
+            default=F('client_pay'),
+            output_field=money,
+        )
+        cutoffs = [as_of - timedelta(days=days) for days in (30, 60, 90)]
+        bucket_filters = {
+            'current': Q(date__gt=cutoffs[0]),
+            'days_30': Q(date__lte=cutoffs[0], date__gt=cutoffs[1]),
+            'days_60': Q(date__lte=cutoffs[1], date__gt=cutoffs[2]),
+            'days_90_plus': Q(date__lte=cutoffs[2]),
+        }
+
+        # Matches the events_unpaid_idx predicate so only unpaid rows are read
+        unpaid = Event.objects.filter(
+            organization=request.organization,
+            is_deleted=False,
+            payment_received=False,
+        ).exclude(status='cancelled')
+
+        aggregates = {
+            bucket: Coalesce(Sum(outstanding, filter=condition), zero)
+            for bucket, condition in bucket_filters.items()
+        }
+        aggregates.update(
+            total=Coalesce(Sum(outstanding), zero),
+            deposits_outstanding=Coalesce(
+                Sum('deposit_amount', filter=Q(deposit_received=False)), zero
+            ),
+            event_count=Count('id'),
+            oldest_date=Min('date'),
+        )
+
+        by_client = unpaid.values('client_id', 'client__name').annotate(
+            **aggregates
+        ).order_by('-total', 'client__name')
+
+        totals = {bucket: Decimal('0') for bucket in AGING_BUCKETS}
+        totals.update(total=Decimal('0'), deposits_outstanding=Decimal('0'), event_count=0)
+        clients = []
+        for row in by_client:
+            for key in totals:
+                totals[key] += row[key]
+            clients.append({
+                'client_id': row['client_id'],
+                'client_name': row['client__name'],
+                **{bucket: str(row[bucket]) for bucket in AGING_BUCKETS},
+                'total': str(row['total']),
+                'deposits_outstanding': str(row['deposits_outstanding']),
+                'event_count': row['event_count'],
+                'oldest_date': str(row['oldest_date']),
+            })
+
+        return Response({
+            'as_of': str(as_of),
+            'totals': {
+                key: value if key == 'event_count' else str(value)
+                for key, value in totals.items()
+            },
+            'by_client': clients,
+        })
+
+
+class ReportView(TenantMixin, APIView):
+    """
+    Ad-hoc report over events, grouped by any dimensions. Admin only.
+
+    Query params:
+    - dimensions: comma-separated, from chef, client, month, week, status, weekday
+    - metrics: comma-separated, from revenue, chef_pay, profit, guest_count,
+      event_count, deposit_outstanding (defaults to revenue)
+    - start_date: YYYY-MM-DD (defaults to first day of current month)
+    - end_date: YYYY-MM-DD (defaults to today)
+    - status: comma-separated statuses to include (defaults to all)
+    - compare: previous (the preceding period) or year (same period last year)
+
+    Month and week buckets with no events are returned as zeros.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+
+        start_date, end_date = parse_period(request)
+        if end_date < start_date:
+            return Response({'detail': 'end_date must not be before start_date.'}, status=400)
+        if (end_date - start_date).days > settings.REPORT_MAX_DAYS:
+            return Response(
+                {'detail': f'Date range may span at most {settings.REPORT_MAX_DAYS} days.'},
+                status=400
+            )
+
+        def split(name, default=''):
+            value = request.query_params.get(name, default)
+            return [part.strip() for part in value.split(',') if part.strip()]
+
+        try:
+            report = Report(
+                request.organization,
+                start_date,
+                end_date,
+                dimensions=split('dimensions'),
+                metrics=split('metrics', 'revenue'),
+                compare=request.query_params.get('compare') or None,
+                statuses=split('status'),
+            )
+        except ReportError as e:
+            return Response({'detail': str(e)}, status=400)
+
+        return Response(report.cached())
+
+
+class PayoutRunListCreateView(TenantQuerysetMixin, generics.ListCreateAPIView):
+    """
+    List payout runs, or settle a period. Admin only.
+
+    POST {period_start, period_end} claims every completed, unsettled event
+    with a chef in the period and records what each chef is owed.
+    """
+    queryset = PayoutRun.objects.all()
+    serializer_class = PayoutRunSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related('payouts__chef__membership__user')
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        run = settle(
+            request.organization,
+            serializer.validated_data['period_start'],
+            serializer.validated_data['period_end'],
+            user=request.user,
+        )
+        if run is None:
+            return Response({'detail': 'No unsettled completed events in this period.'}, status=400)
+        run = self.get_queryset().get(pk=run.pk)
+        return Response(self.get_serializer(run).data, status=status.HTTP_201_CREATED)
+
+
+class ChefPayoutListView(TenantQuerysetMixin, generics.ListAPIView):
+    """
+    List chef payouts. Chefs only see their own.
+
+    Query params:
+    - paid: true or false
+    - chef_id: chef profile id (admin only)
+    """
+    queryset = ChefPayout.objects.all()
+    serializer_class = ChefPayoutSerializer
+    permission_classes = [IsAuthenticated, IsChefOrAdmin]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+
+        if self.request.membership.role == 'chef':
+            chef_profile = getattr(self.request.membership, 'chef_profile', None)
+            if not chef_profile:
+                return qs.none()
+            qs = qs.filter(chef=chef_profile)
+        else:
+            chef_id = self.request.query_params.get('chef_id')
+            if chef_id:
+                qs = qs.filter(chef_id=chef_id)
+
+        paid = self.request.query_params.get('paid')
+        if paid in ('true', 'false'):
+            qs = qs.filter(paid_at__isnull=paid == 'false')
+
+        return qs.select_related('run', 'chef__membership__user')
+
+
+class ChefPayoutOwedView(TenantMixin, APIView):
+    """
+    What the organization currently owes each chef, from unpaid payouts.
+    Admin only.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+
+        owed = ChefPayout.objects.filter(
+            organization=request.organization,
+            paid_at__isnull=True,
+        ).values(
+            'chef_id',
+            'chef__membership__user__first_name',
+            'chef__membership__user__last_name',
+        ).annotate(
+            amount=Sum('amount'),
+            event_count=Sum('event_count'),
+            payout_count=Count('id'),
+        ).order_by('-amount')
+
+        return Response({
+            'by_chef': [
+                {
+                    'chef_id': row['chef_id'],
+                    'chef_name': f"{row['chef__membership__user__first_name']} {row['chef__membership__user__last_name']}",
+                    'amount': str(row['amount']),
+                    'event_count': row['event_count'],
+                    'payout_count': row['payout_count'],
+                }
+                for row in owed
+            ],
+        })
+
+
+class ChefPayoutMarkPaidView(TenantQuerysetMixin, generics.GenericAPIView):
+    queryset = ChefPayout.objects.all()
+    serializer_class = ChefPayoutSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request, pk):
+        payout = self.get_object()
+        if payout.paid_at:
+            return Response({'detail': 'Payout is already marked as paid.'}, status=400)
+        payout.paid_at = timezone.now()
+        payout.save(update_fields=['paid_at'])
+        return Response(self.get_serializer(payout).data)
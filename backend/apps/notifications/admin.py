@@ -0,0 +1,10 @@
+from django.contrib import admin
+from core.admin import ShardedModelAdmin
+from .models import NotificationLog
+
+
+@admin.register(NotificationLog)
+class NotificationLogAdmin(ShardedModelAdmin):
+    list_display = ['event', 'chef', 'notification_type', 'event_date', 'sent_at']
+    list_filter = ['notification_type', 'sent_at']
+    raw_id_fields = ['event', 'chef']
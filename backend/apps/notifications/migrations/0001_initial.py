@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('chefs', '0001_initial'),
+        ('events', '0006_event_reminder_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(choices=[('assignment', 'Chef Assigned'), ('update', 'Event Updated'), ('cancellation', 'Event Cancelled'), ('reminder_3day', '3-Day Reminder'), ('reminder_1day', '1-Day Reminder')], max_length=20)),
+                ('event_date', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('chef', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='chefs.chefprofile')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='events.event')),
+            ],
+            options={
+                'ordering': ['-sent_at'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('notification_type__startswith', 'reminder_')), fields=('event', 'chef', 'notification_type', 'event_date'), name='unique_event_reminder')],
+            },
+        ),
+    ]
@@ -1 +1,37 @@
 from django.db import models
+from apps.events.models import Event
+from apps.chefs.models import ChefProfile
+
+
+class NotificationLog(models.Model):
+    class NotificationType(models.TextChoices):
+        ASSIGNMENT = 'assignment', 'Chef Assigned'
+        UPDATE = 'update', 'Event Updated'
+        CANCELLATION = 'cancellation', 'Event Cancelled'
+        REMINDER_3DAY = 'reminder_3day', '3-Day Reminder'
+        REMINDER_1DAY = 'reminder_1day', '1-Day Reminder'
+
+    # No database-level constraint: events_event is partitioned on Postgres
+    # and its (id, date) primary key can't be referenced by event_id alone
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name='notifications', db_constraint=False
+    )
+    chef = models.ForeignKey(ChefProfile, on_delete=models.CASCADE, related_name='notifications')
+    notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
+    # The event date the notification was about, so a rescheduled event is
+    # reminded again for its new date
+    event_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'chef', 'notification_type', 'event_date'],
+                condition=models.Q(notification_type__startswith='reminder_'),
+                name='unique_event_reminder',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.get_notification_type_display()} - {self.event_id} - {self.chef_id}'
@@ -0,0 +1,132 @@
+"""
+Event reminders for chefs, driven by a periodic scan instead of ETA tasks.
+
+Every run looks at the indexed window of upcoming events with a chef,
+works out in each organization's timezone which reminder (if any) is due,
+skips the ones the NotificationLog says were already sent and emails each
+chef once with all of their due reminders. Edits need no bookkeeping: a
+cancelled or unassigned event drops out of the scan, a reassigned event is
+reminded to its new chef and a rescheduled one is reminded again for its
+new date, since the log is keyed on (event, chef, type, event date).
+
+Each shard is scanned in turn. Pass `now` to run against a fixed clock.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
+
+from apps.events.models import Event
+from core import sharding
+from core.email import send_event_reminder_email
+from .models import NotificationLog
+
+Type = NotificationLog.NotificationType
+
+# (type, lead time), most urgent first: when both are due only the nearer
+# one is sent
+REMINDERS = [
+    (Type.REMINDER_1DAY, timedelta(days=1)),
+    (Type.REMINDER_3DAY, timedelta(days=3)),
+]
+
+
+@lru_cache(maxsize=None)
+def _zone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+def _label(days):
+    if days == 0:
+        return 'Today'
+    if days == 1:
+        return 'Tomorrow'
+    return f'In {days} days'
+
+
+def due_reminders(now):
+    """Yield (event, notification_type, label) for every reminder due at `now`."""
+    longest = max(lead for _, lead in REMINDERS)
+    # Wide enough for any UTC offset
+    today = now.astimezone(ZoneInfo('UTC')).date()
+    events = list(Event.objects.filter(
+        status=Event.Status.UPCOMING,
+        is_deleted=False,
+        chef__isnull=False,
+        date__gte=today - timedelta(days=1),
+        date__lte=today + longest + timedelta(days=1),
+    ).select_related('organization', 'client', 'chef__membership__user'))
+
+    sent = set(NotificationLog.objects.filter(
+        event__in=[event.id for event in events],
+        notification_type__startswith='reminder_',
+    ).values_list('event_id', 'chef_id', 'notification_type', 'event_date'))
+
+    for event in events:
+        if not event.chef.is_active:
+            continue
+        if sharding.lookup(event.organization_id) != (sharding.current(), False):
+            continue  # Being moved, or a copy left behind by a move
+        zone = _zone(event.organization.timezone)
+        starts_at = datetime.combine(event.date, event.start_time, tzinfo=zone)
+        if starts_at <= now:
+            continue
+        for notification_type, lead in REMINDERS:
+            if now >= starts_at - lead:
+                break
+        else:
+            continue
+        if (event.id, event.chef_id, notification_type, event.date) in sent:
+            continue
+        days = (event.date - now.astimezone(zone).date()).days
+        yield event, notification_type, _label(days)
+
+
+def send_due_reminders(now=None):
+    """Send due reminders, one email per chef. Returns counts for logging."""
+    now = now or timezone.now()
+    counts = {'emails': 0, 'reminders': 0}
+    for alias in sharding.shards():
+        with sharding.use_shard(alias):
+            for key, count in _send_due_reminders(now).items():
+                counts[key] += count
+    return counts
+
+
+def _send_due_reminders(now):
+    by_chef = defaultdict(list)
+    for event, notification_type, label in due_reminders(now):
+        by_chef[event.chef_id].append((event, notification_type, label))
+
+    emails = reminders = 0
+    for due in by_chef.values():
+        due.sort(key=lambda item: (item[0].date, item[0].start_time))
+        chef = due[0][0].chef
+        sent = send_event_reminder_email(
+            chef.user,
+            [(event, label) for event, _, label in due],
+            due[0][0].organization,
+        )
+        if not sent:
+            continue  # Not logged, so the next scan retries
+        NotificationLog.objects.bulk_create(
+            [
+                NotificationLog(
+                    event=event,
+                    chef=chef,
+                    notification_type=notification_type,
+                    event_date=event.date,
+                )
+                for event, notification_type, _ in due
+            ],
+            ignore_conflicts=True,
+        )
+        emails += 1
+        reminders += len(due)
+
+    return {'emails': emails, 'reminders': reminders}
@@ -0,0 +1,13 @@
+import logging
+
+from celery import shared_task
+from .reminders import send_due_reminders
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def send_due_reminders_task():
+    counts = send_due_reminders()
+    logger.info('Sent %(reminders)d event reminders in %(emails)d emails', counts)
+    return counts
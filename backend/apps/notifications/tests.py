@@ -0,0 +1,130 @@
+"""
+The reminder scan (see reminders.py), run against a fixed clock passed as
+`now`.
+"""
+import datetime
+
+from django.core import mail
+from django.test import TestCase
+
+from apps.events.models import Event
+from core.testing import make_chef, make_client, make_event, make_organization
+from .models import NotificationLog
+from .reminders import due_reminders, send_due_reminders
+
+UTC = datetime.timezone.utc
+NOW = datetime.datetime(2030, 5, 1, 12, 0, tzinfo=UTC)
+TOMORROW = datetime.date(2030, 5, 2)
+
+Type = NotificationLog.NotificationType
+
+
+class ReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tokyo, _ = make_organization('Tokyo Kitchen', timezone='Asia/Tokyo')
+        cls.la, _ = make_organization('LA Kitchen', timezone='America/Los_Angeles')
+        cls.tokyo_client = make_client(cls.tokyo)
+        cls.la_client = make_client(cls.la)
+        cls.kenji = make_chef(cls.tokyo, 'Kenji')
+        cls.yumi = make_chef(cls.tokyo, 'Yumi')
+        cls.lucia = make_chef(cls.la, 'Lucia')
+
+    def event(self, client, chef, date=TOMORROW, hour=9, **fields):
+        return make_event(client, chef, date=date, start_time=datetime.time(hour), **fields)
+
+    def due(self, now=NOW):
+        return {(event.pk, notification_type) for event, notification_type, _ in due_reminders(now)}
+
+    def send(self, now=NOW):
+        mail.outbox = []
+        return send_due_reminders(now=now)
+
+    def test_window_follows_each_organizations_timezone(self):
+        # 09:00 tomorrow is 12 hours away in Tokyo, 28 in Los Angeles
+        tokyo = self.event(self.tokyo_client, self.kenji)
+        la = self.event(self.la_client, self.lucia)
+        # Already started in Tokyo, though not yet in UTC terms of the date
+        started = self.event(self.tokyo_client, self.kenji, date=NOW.date(), hour=20)
+        later = self.event(self.tokyo_client, self.kenji, date=NOW.date() + datetime.timedelta(days=5))
+        unassigned = self.event(self.tokyo_client, None)
+
+        due = self.due()
+        self.assertEqual(due, {(tokyo.pk, Type.REMINDER_1DAY), (la.pk, Type.REMINDER_3DAY)})
+        for event in (started, later, unassigned):
+            self.assertNotIn(event.pk, {pk for pk, _ in due})
+
+        labels = {event.pk: label for event, _, label in due_reminders(NOW)}
+        self.assertEqual(labels[tokyo.pk], 'Tomorrow')
+
+    def test_one_email_per_chef(self):
+        first = self.event(self.tokyo_client, self.kenji, name='Lunch')
+        second = self.event(self.tokyo_client, self.kenji, hour=11, name='Brunch')
+        self.event(self.la_client, self.lucia)
+
+        self.assertEqual(self.send(), {'emails': 2, 'reminders': 3})
+        by_recipient = {message.to[0]: message for message in mail.outbox}
+        kenji = by_recipient[self.kenji.user.email]
+        self.assertEqual(kenji.subject, 'Reminder: 2 upcoming events')
+        self.assertIn('Lunch', kenji.body)
+        self.assertIn('Brunch', kenji.body)
+        self.assertIn(self.lucia.user.email, by_recipient)
+        self.assertEqual(
+            set(NotificationLog.objects.values_list('event_id', 'notification_type')),
+            {(first.pk, Type.REMINDER_1DAY), (second.pk, Type.REMINDER_1DAY), (Event.objects.get(chef=self.lucia).pk, Type.REMINDER_3DAY)},
+        )
+
+    def test_reminders_are_not_sent_twice(self):
+        event = self.event(self.la_client, self.lucia)
+        self.assertEqual(self.send()['reminders'], 1)
+        self.assertEqual(self.send(), {'emails': 0, 'reminders': 0})
+        self.assertEqual(self.send(NOW + datetime.timedelta(hours=2)), {'emails': 0, 'reminders': 0})
+        self.assertEqual(mail.outbox, [])
+
+        # Within a day of the start, the 1-day reminder follows, once
+        a_day_before = NOW + datetime.timedelta(hours=10)
+        self.assertEqual(self.send(a_day_before), {'emails': 1, 'reminders': 1})
+        self.assertEqual(self.send(a_day_before), {'emails': 0, 'reminders': 0})
+        self.assertEqual(
+            sorted(NotificationLog.objects.filter(event=event).values_list('notification_type', flat=True)),
+            [Type.REMINDER_1DAY, Type.REMINDER_3DAY],
+        )
+
+    def test_rescheduled_event_gets_no_stale_reminder(self):
+        event = self.event(self.tokyo_client, self.kenji)
+        event.date = NOW.date() + datetime.timedelta(days=10)
+        event.save()
+        self.assertEqual(self.send(), {'emails': 0, 'reminders': 0})
+
+        # Once reminded, a move to another date in the window is reminded again
+        event.date = TOMORROW
+        event.save()
+        self.assertEqual(self.send()['reminders'], 1)
+        event.date = TOMORROW + datetime.timedelta(days=1)
+        event.save()
+        self.assertEqual(self.due(), {(event.pk, Type.REMINDER_3DAY)})
+
+    def test_reassigned_event_reminds_only_the_new_chef(self):
+        event = self.event(self.tokyo_client, self.kenji)
+        event.chef = self.yumi
+        event.save()
+        self.send()
+        self.assertEqual([message.to for message in mail.outbox], [[self.yumi.user.email]])
+
+        # Already reminded for Yumi, but not yet for Kenji, when he takes it back
+        event.chef = self.kenji
+        event.save()
+        self.send()
+        self.assertEqual([message.to for message in mail.outbox], [[self.kenji.user.email]])
+
+    def test_cancelled_deleted_and_inactive_get_no_reminder(self):
+        cancelled = self.event(self.tokyo_client, self.kenji)
+        cancelled.status = Event.Status.CANCELLED
+        cancelled.save()
+        self.event(self.tokyo_client, self.kenji).soft_delete()
+        self.event(self.tokyo_client, self.yumi)
+        self.yumi.membership.is_active = False
+        self.yumi.membership.save()
+
+        self.assertEqual(self.send(), {'emails': 0, 'reminders': 0})
+        self.assertEqual(mail.outbox, [])
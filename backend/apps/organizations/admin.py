@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Organization, OrganizationMembership
+from .models import Organization, OrganizationMembership, OrganizationShard
 
 
 @admin.register(Organization)
@@ -14,3 +14,11 @@ class OrganizationMembershipAdmin(admin.ModelAdmin):
     list_display = ['user', 'organization', 'role', 'is_active', 'joined_at']
     list_filter = ['role', 'is_active', 'organization']
     search_fields = ['user__email', 'organization__name']
+
+
+@admin.register(OrganizationShard)
+class OrganizationShardAdmin(admin.ModelAdmin):
+    list_display = ['organization', 'database', 'is_moving', 'updated_at']
+    list_filter = ['database', 'is_moving']
+    # Moves go through manage.py move_organization, which copies the data first
+    readonly_fields = ['organization', 'database', 'is_moving']
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class OrganizationsConfig(AppConfig):
+    name = 'apps.organizations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.organizations.shards import MoveError, reserve_ids
+
+
+class Command(BaseCommand):
+    help = 'Start a shard\'s tenant id sequences in its own SHARD_ID_BLOCK. Run once, after migrate.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('database', help='Alias from DATABASE_SHARDS.')
+
+    def handle(self, *args, **options):
+        try:
+            start = reserve_ids(options['database'])
+        except (MoveError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"{options['database']}: ids start at {start}")
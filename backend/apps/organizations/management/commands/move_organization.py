@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.organizations.models import Organization
+from apps.organizations.shards import MoveError, move
+
+
+class Command(BaseCommand):
+    help = "Copy an organization's tenant data to another shard and switch it over."
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization_id', type=int)
+        parser.add_argument('database', help='Target alias from DATABASE_SHARDS.')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--grace', type=float, default=None, help='Seconds to wait after pausing writes.')
+        parser.add_argument('--delete-source', action='store_true', help='Delete the source copy after switching.')
+
+    def handle(self, *args, **options):
+        try:
+            organization = Organization.objects.using('default').get(pk=options['organization_id'])
+        except Organization.DoesNotExist:
+            raise CommandError('Organization not found.')
+        try:
+            move(
+                organization,
+                options['database'],
+                chunk_size=options['chunk_size'],
+                grace=options['grace'],
+                delete_source=options['delete_source'],
+                log=self.stdout.write,
+            )
+        except MoveError as e:
+            raise CommandError(str(e))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationShard',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='shard', serialize=False, to='organizations.organization')),
+                ('database', models.CharField(max_length=50)),
+                ('is_moving', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
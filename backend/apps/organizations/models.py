@@ -49,3 +49,22 @@ class OrganizationMembership(models.Model):
     
     def __str__(self):
         return f'{self.user.email} - {self.organization.name} ({self.role})'
+
+
+class OrganizationShard(models.Model):
+    """
+    Directory entry: the database holding an organization's tenant data.
+    Organizations without an entry live on the default database.
+    """
+    organization = models.OneToOneField(
+        Organization,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='shard'
+    )
+    database = models.CharField(max_length=50)
+    is_moving = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.organization} -> {self.database}'
@@ -0,0 +1,184 @@
+"""
+Moving an organization between shards (see core/sharding.py).
+
+A move marks the organization as moving, which makes its API writes fail
+with 503 while reads keep being served from the source, waits out requests
+already in flight, copies the organization's central rows and then its
+tenant rows to the target in one transaction, checks the row counts and
+switches the directory entry over. Rows keep their primary keys, so shards
+must hand out ids from separate blocks (`reserve_ids`).
+
+The source copy is left in place unless `delete_source` is set; nothing
+reads it once the directory points elsewhere.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, models, transaction
+
+from apps.chefs.models import ChefProfile
+from apps.clients.models import ArchivedClient, Client
+from apps.events.models import ArchivedEvent, ChefPayout, Event, PayoutRun
+from apps.notifications.models import NotificationLog
+from apps.sync.models import ChangeLog, SyncCursor
+from core import sharding
+from core.rows import delete_in, insert_raw
+from .models import OrganizationMembership, OrganizationShard
+
+# (model, lookup to the organization id), parents before children
+TENANT_TABLES = [
+    (Client, 'organization_id'),
+    (ChefProfile, 'membership__organization_id'),
+    (PayoutRun, 'organization_id'),
+    (Event, 'organization_id'),
+    (ChefPayout, 'organization_id'),
+    (NotificationLog, 'event__organization_id'),
+    (ArchivedClient, 'organization_id'),
+    (ArchivedEvent, 'organization_id'),
+    (SyncCursor, 'organization_id'),
+    (ChangeLog, 'organization_id'),
+]
+
+
+class MoveError(Exception):
+    pass
+
+
+def tenant_rows(model, lookup, organization_id, using):
+    return model.objects.using(using).filter(**{lookup: organization_id})
+
+
+def _set_directory(organization, database, is_moving):
+    OrganizationShard.objects.using(sharding.CENTRAL).update_or_create(
+        organization=organization,
+        defaults={'database': database, 'is_moving': is_moving},
+    )
+    sharding.invalidate(organization.pk)
+
+
+def copy_rows(queryset, using, chunk_size):
+    """Insert every row of `queryset` into `using`. Returns the number copied."""
+    copied = 0
+    batch = []
+    for obj in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) == chunk_size:
+            insert_raw(queryset.model, batch, using)
+            copied += len(batch)
+            batch = []
+    if batch:
+        insert_raw(queryset.model, batch, using)
+        copied += len(batch)
+    return copied
+
+
+def delete_rows(organization_id, using, chunk_size):
+    """Delete an organization's tenant rows from a shard, children first."""
+    deleted = {}
+    for model, lookup in reversed(TENANT_TABLES):
+        queryset = tenant_rows(model, lookup, organization_id, using)
+        deleted[model._meta.db_table] = 0
+        while True:
+            pks = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            deleted[model._meta.db_table] += delete_in(model, pks, using)
+    return deleted
+
+
+def mirror_central_rows(organization, source, target):
+    """Copy the organization, its members and their users onto `target`."""
+    memberships = list(
+        OrganizationMembership.objects.using(sharding.CENTRAL)
+        .filter(organization=organization)
+        .select_related('user')
+    )
+    # Payout runs can name an admin who has since left
+    creators = PayoutRun.objects.using(source).filter(
+        organization=organization, created_by__isnull=False,
+    ).values_list('created_by_id', flat=True)
+    users = {membership.user.pk: membership.user for membership in memberships}
+    users.update(
+        (user.pk, user) for user in
+        get_user_model().objects.using(sharding.CENTRAL).filter(pk__in=set(creators) - set(users))
+    )
+
+    sharding.mirror(organization, target)
+    for user in users.values():
+        sharding.mirror(user, target)
+    for membership in memberships:
+        sharding.mirror(membership, target)
+
+
+def move(organization, target, chunk_size=1000, grace=None, delete_source=False, log=print):
+    """Move the organization's tenant data to `target`. Returns {table: rows copied}."""
+    if target not in sharding.shards():
+        raise MoveError(f'{target} is not in DATABASE_SHARDS.')
+    # From the table: a cached entry may be older than the last move
+    source, is_moving = sharding.read_directory(organization.pk)
+    if is_moving:
+        raise MoveError(f'{organization} is already being moved.')
+    if source == target:
+        raise MoveError(f'{organization} is already on {target}.')
+
+    _set_directory(organization, source, is_moving=True)
+    try:
+        grace = settings.SHARD_MOVE_GRACE_SECONDS if grace is None else grace
+        log(f'Writes paused; waiting {grace}s for in-flight requests')
+        time.sleep(grace)
+
+        if target != sharding.CENTRAL:
+            mirror_central_rows(organization, source, target)
+
+        copied = {}
+        with transaction.atomic(using=target):
+            # Leftovers from an earlier move away from the target
+            stale = delete_rows(organization.pk, target, chunk_size)
+            if any(stale.values()):
+                log(f'Replaced stale rows on {target}: {stale}')
+            for model, lookup in TENANT_TABLES:
+                table = model._meta.db_table
+                copied[table] = copy_rows(
+                    tenant_rows(model, lookup, organization.pk, source), target, chunk_size,
+                )
+                expected = tenant_rows(model, lookup, organization.pk, source).count()
+                if tenant_rows(model, lookup, organization.pk, target).count() != expected:
+                    raise MoveError(f'Row count mismatch in {table}; nothing was switched.')
+                log(f'{table}: {copied[table]} rows copied')
+    except Exception:
+        _set_directory(organization, source, is_moving=False)
+        raise
+
+    _set_directory(organization, target, is_moving=False)
+    log(f'{organization} now lives on {target}')
+
+    if delete_source:
+        with transaction.atomic(using=source):
+            deleted = delete_rows(organization.pk, source, chunk_size)
+        log(f'Deleted from {source}: {deleted}')
+    return copied
+
+
+def reserve_ids(using):
+    """
+    Start the shard's id sequences at its own SHARD_ID_BLOCK so rows copied
+    between shards never collide. Only Postgres sequences can be moved.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise MoveError('Id blocks can only be reserved on PostgreSQL.')
+    start = sharding.shards().index(using) * settings.SHARD_ID_BLOCK + 1
+    with connection.cursor() as cursor:
+        for model, _ in TENANT_TABLES:
+            if not isinstance(model._meta.pk, models.AutoField):
+                continue  # Archive rows keep their original ids; cursors are per organization
+            table = model._meta.db_table
+            pk = model._meta.pk.column
+            cursor.execute(
+                'SELECT setval(pg_get_serial_sequence(%s, %s), '
+                f'GREATEST(%s, (SELECT COALESCE(MAX({connection.ops.quote_name(pk)}), 0) + 1 '
+                f'FROM {connection.ops.quote_name(table)})), false)',
+                [table, pk, start],
+            )
+    return start
@@ -0,0 +1,76 @@
+"""
+Keep the central rows tenant data points at (users, organizations and
+memberships) mirrored onto the shard of each organization involved. Mirrors
+are written once the central transaction commits, so a rolled-back change
+never reaches a shard.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core import sharding
+from .models import Organization, OrganizationMembership
+
+User = get_user_model()
+
+
+def _sharded(using, raw=False):
+    # Only react to writes on the central database, and not to mirroring itself
+    return len(sharding.shards()) > 1 and using == sharding.CENTRAL and not raw
+
+
+def _shards(organization_ids):
+    return {
+        alias for alias in map(sharding.shard_for, organization_ids)
+        if alias != sharding.CENTRAL
+    }
+
+
+@receiver(post_save, sender=Organization)
+def mirror_organization(sender, instance, raw=False, using=None, **kwargs):
+    if not _sharded(using, raw):
+        return
+    for alias in _shards([instance.pk]):
+        transaction.on_commit(lambda alias=alias: sharding.mirror(instance, alias), using=using)
+
+
+@receiver(post_save, sender=OrganizationMembership)
+def mirror_membership(sender, instance, raw=False, using=None, **kwargs):
+    if not _sharded(using, raw):
+        return
+    for alias in _shards([instance.organization_id]):
+        def mirror(alias=alias):
+            # A user joining from another organization isn't on this shard yet
+            sharding.mirror(User.objects.using(using).get(pk=instance.user_id), alias)
+            sharding.mirror(instance, alias)
+
+        transaction.on_commit(mirror, using=using)
+
+
+@receiver(post_save, sender=User)
+def mirror_user(sender, instance, raw=False, using=None, **kwargs):
+    if not _sharded(using, raw):
+        return
+    organization_ids = instance.memberships.using(using).values_list('organization_id', flat=True)
+    for alias in _shards(organization_ids):
+        transaction.on_commit(lambda alias=alias: sharding.mirror(instance, alias), using=using)
+
+
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=OrganizationMembership)
+@receiver(post_delete, sender=User)
+def delete_mirrors(sender, instance, using=None, **kwargs):
+    if not _sharded(using):
+        return
+    if sender is OrganizationMembership:
+        aliases = _shards([instance.organization_id])
+    else:
+        # Memberships and the directory entry are already gone by now, so
+        # look on every shard
+        aliases = [alias for alias in sharding.shards() if alias != sharding.CENTRAL]
+    pk = instance.pk
+    for alias in aliases:
+        transaction.on_commit(
+            lambda alias=alias: sender.objects.using(alias).filter(pk=pk).delete(),
+            using=using,
+        )
@@ -0,0 +1,62 @@
+"""
+Recording changes for the delta sync API.
+
+Every organization has a change counter (SyncCursor). Recording a batch of
+changes bumps it and upserts one ChangeLog row per (chef, object) carrying
+the new version, in one transaction. The counter row stays locked until the
+batch commits, so versions become visible in order: a client that has seen
+version n has seen every change up to n.
+"""
+from django.db import router, transaction
+from django.db.models import F
+from .models import ChangeLog, SyncCursor
+
+Kind = ChangeLog.Kind
+
+
+def current_version(organization_id):
+    return SyncCursor.objects.filter(
+        organization_id=organization_id,
+    ).values_list('version', flat=True).first() or 0
+
+
+def record(organization_id, changes):
+    """
+    Record (chef id, kind, object id, removed) changes; entries without a
+    chef are skipped. Returns the version, or None if nothing was recorded.
+    """
+    changes = {
+        (chef_id, kind, object_id): removed
+        for chef_id, kind, object_id, removed in changes
+        if chef_id
+    }
+    if not changes:
+        return None
+
+    using = router.db_for_write(ChangeLog)
+    with transaction.atomic(using=using):
+        cursor = SyncCursor.objects.using(using).filter(organization_id=organization_id)
+        if not cursor.update(version=F('version') + 1):
+            SyncCursor.objects.using(using).bulk_create(
+                [SyncCursor(organization_id=organization_id)], ignore_conflicts=True,
+            )
+            cursor.update(version=F('version') + 1)
+        version = cursor.values_list('version', flat=True).get()
+
+        ChangeLog.objects.using(using).bulk_create(
+            [
+                ChangeLog(
+                    organization_id=organization_id,
+                    chef_id=chef_id,
+                    kind=kind,
+                    object_id=object_id,
+                    version=version,
+                    removed=removed,
+                )
+                for (chef_id, kind, object_id), removed in changes.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['chef', 'kind', 'object_id'],
+            update_fields=['version', 'removed'],
+        )
+    return version
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('chefs', '0001_initial'),
+        ('organizations', '0003_organization_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCursor',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sync_cursor', serialize=False, to='organizations.organization')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('client', 'Client'), ('profile', 'Profile')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('version', models.BigIntegerField()),
+                ('removed', models.BooleanField(default=False)),
+                ('chef', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='chefs.chefprofile')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['chef', 'version'], name='sync_changes_chef_version_idx')],
+                'constraints': [models.UniqueConstraint(fields=('chef', 'kind', 'object_id'), name='unique_chef_change')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+from apps.organizations.models import Organization
+from apps.chefs.models import ChefProfile
+
+
+class SyncCursor(models.Model):
+    """An organization's change counter; every recorded change takes the next value."""
+    organization = models.OneToOneField(
+        Organization,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='sync_cursor'
+    )
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.organization} @ {self.version}'
+
+
+class ChangeLog(models.Model):
+    """
+    The latest change to one object as seen by one chef. Rows are updated in
+    place, so a sync returns each changed object once however often it
+    changed.
+    """
+    class Kind(models.TextChoices):
+        EVENT = 'event', 'Event'
+        CLIENT = 'client', 'Client'
+        PROFILE = 'profile', 'Profile'
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='+')
+    chef = models.ForeignKey(ChefProfile, on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    version = models.BigIntegerField()
+    # Deleted, or no longer visible to this chef
+    removed = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['chef', 'kind', 'object_id'], name='unique_chef_change'),
+        ]
+        indexes = [
+            models.Index(fields=['chef', 'version'], name='sync_changes_chef_version_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id} @ {self.version}'
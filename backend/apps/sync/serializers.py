@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from apps.clients.models import Client
+from apps.events.models import Event
+
+
+class SyncEventSerializer(serializers.ModelSerializer):
+    display_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Event
+        fields = [
+            'id', 'display_name', 'name', 'date', 'start_time', 'end_time',
+            'client', 'location', 'guest_count', 'allergies', 'menu_notes',
+            'chef_pay', 'chef_notes', 'status'
+        ]
+        read_only_fields = fields
+
+
+class SyncClientSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Client
+        fields = ['id', 'name', 'email', 'phone', 'address', 'allergies']
+        read_only_fields = fields
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.chefs.models import ChefProfile
+from apps.clients.models import Client
+from apps.events.models import Event
+from apps.events.signals import events_changed
+from core.identity import resolve
+from core.sharding import CENTRAL, shard_for, use_shard
+from .changes import Kind, record
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_loaded_chef_id', None)
+    previous_client = getattr(instance, '_loaded_client_id', None)
+    instance._loaded_chef_id = instance.chef_id
+    instance._loaded_client_id = instance.client_id
+    changes = []
+    if instance.chef_id:
+        changes.append((instance.chef_id, Kind.EVENT, instance.pk, instance.is_deleted))
+        if previous != instance.chef_id or previous_client != instance.client_id:
+            # Newly assigned or moved to another client, so the chef needs the client as well
+            changes.append((instance.chef_id, Kind.CLIENT, instance.client_id, False))
+    if previous and previous != instance.chef_id:
+        changes.append((previous, Kind.EVENT, instance.pk, True))
+    record(instance.organization_id, changes)
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    record(instance.organization_id, [(instance.chef_id, Kind.EVENT, instance.pk, True)])
+
+
+@receiver(events_changed, sender=Event)
+def events_bulk_changed(sender, organization_id, events, removed=False, clients=(), **kwargs):
+    record(organization_id, [
+        *[(chef_id, Kind.EVENT, pk, removed) for pk, chef_id in events],
+        *[(chef_id, Kind.CLIENT, client_id, False) for chef_id, client_id in clients],
+    ])
+
+
+@receiver(post_save, sender=Client)
+def client_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    chef_ids = Event.objects.filter(
+        client_id=instance.pk, is_deleted=False, chef__isnull=False,
+    ).values_list('chef_id', flat=True).distinct()
+    record(instance.organization_id, [
+        (chef_id, Kind.CLIENT, instance.pk, instance.is_deleted) for chef_id in chef_ids
+    ])
+
+
+@receiver(post_save, sender=ChefProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    organization_id = resolve(instance, 'membership').organization_id
+    record(organization_id, [(instance.pk, Kind.PROFILE, instance.pk, False)])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no chef app shows
+    if raw or using != CENTRAL or update_fields == frozenset(['last_login']):
+        return
+    for membership in instance.memberships.filter(role='chef'):
+        with use_shard(shard_for(membership.organization_id)):
+            profile_id = ChefProfile.objects.filter(
+                membership_id=membership.pk,
+            ).values_list('pk', flat=True).first()
+            record(membership.organization_id, [(profile_id, Kind.PROFILE, profile_id, False)])
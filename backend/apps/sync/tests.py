@@ -0,0 +1,58 @@
+"""
+Change recording for the delta sync API (see signals.py).
+"""
+from django.test import TestCase
+
+from apps.events.archive import archive_clients, archive_events, restore_events
+from apps.events.models import ArchivedEvent, Event
+from apps.clients.models import Client
+from core.testing import make_chef, make_client, make_event, make_organization
+from .models import ChangeLog
+
+Kind = ChangeLog.Kind
+
+
+class ClientChangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, _ = make_organization()
+        cls.chef = make_chef(cls.organization)
+        cls.client_a = make_client(cls.organization, 'Ann Client')
+        cls.client_b = make_client(cls.organization, 'Bob Client')
+
+    def client_changes(self):
+        return set(ChangeLog.objects.filter(kind=Kind.CLIENT).values_list('chef_id', 'object_id', 'removed'))
+
+    def test_assignment_sends_the_client(self):
+        event = make_event(self.client_a)
+        self.assertEqual(self.client_changes(), set())
+        event = Event.objects.get(pk=event.pk)
+        event.chef = self.chef
+        event.save()
+        self.assertEqual(self.client_changes(), {(self.chef.pk, self.client_a.pk, False)})
+
+    def test_moving_to_another_client_sends_it(self):
+        event = make_event(self.client_a, self.chef)
+        ChangeLog.objects.all().delete()
+
+        event = Event.objects.get(pk=event.pk)
+        event.guest_count += 1
+        event.save()
+        self.assertEqual(self.client_changes(), set())
+
+        event.client = self.client_b
+        event.save()
+        self.assertEqual(self.client_changes(), {(self.chef.pk, self.client_b.pk, False)})
+
+    def test_restored_events_send_their_clients(self):
+        event = make_event(self.client_a, self.chef)
+        archive_events(Event.objects.filter(pk=event.pk))
+        Client.objects.filter(pk=self.client_a.pk).update(is_deleted=True)
+        archive_clients(Client.objects.filter(pk=self.client_a.pk))
+        ChangeLog.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restore_events(ArchivedEvent.objects.filter(pk=event.pk))
+        self.assertTrue(Client.objects.filter(pk=self.client_a.pk).exists())
+        self.assertEqual(self.client_changes(), {(self.chef.pk, self.client_a.pk, False)})
+        self.assertTrue(ChangeLog.objects.filter(kind=Kind.EVENT, object_id=event.pk, removed=False).exists())
@@ -0,0 +1,103 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.chefs.serializers import ChefSelfSerializer
+from apps.clients.models import Client
+from apps.events.models import Event
+from core.mixins import TenantMixin
+from core.permissions import IsChef
+from core.routers import use_primary
+from .changes import Kind, current_version
+from .models import ChangeLog
+from .serializers import SyncClientSerializer, SyncEventSerializer
+
+
+class SyncView(TenantMixin, APIView):
+    """
+    What changed for the requesting chef since a cursor.
+
+    Without `since`, returns everything the chef can see (their live events,
+    those events' clients and their profile) with a cursor to sync from.
+    With `since`, returns only the events, clients and profile changed after
+    it, and under `removed` the ids of events and clients the chef should
+    drop: deleted, archived or no longer assigned to them. Pages hold about
+    SYNC_PAGE_SIZE changes; keep syncing with the returned cursor while
+    `has_more` is true.
+    """
+    permission_classes = [IsAuthenticated, IsChef]
+
+    def get(self, request):
+        if not request.organization:
+            return Response({'detail': 'No organization found.'}, status=400)
+        chef = getattr(request.membership, 'chef_profile', None)
+        if chef is None:
+            return Response({'detail': 'Chef profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        since = request.query_params.get('since')
+        # A replica lagging behind the cursor would skip changes for good
+        with use_primary():
+            if since is None:
+                return Response(self.snapshot(chef))
+            try:
+                since = int(since)
+                if since < 0:
+                    raise ValueError
+            except ValueError:
+                raise ParseError('since must be a cursor returned by an earlier sync.')
+            if since > current_version(request.organization.id):
+                raise ParseError('Unknown cursor; sync again without since.')
+            return Response(self.changes(chef, since))
+
+    def snapshot(self, chef):
+        # Read first: anything changed meanwhile comes again in the next sync
+        cursor = current_version(self.request.organization.id)
+        events = list(Event.objects.filter(chef=chef, is_deleted=False).select_related('client'))
+        clients = {event.client_id: event.client for event in events if not event.client.is_deleted}
+        return {
+            'cursor': cursor,
+            'has_more': False,
+            'events': SyncEventSerializer(events, many=True).data,
+            'clients': SyncClientSerializer(list(clients.values()), many=True).data,
+            'profile': ChefSelfSerializer(chef).data,
+            'removed': {'events': [], 'clients': []},
+        }
+
+    def changes(self, chef, since):
+        limit = settings.SYNC_PAGE_SIZE
+        changes = ChangeLog.objects.filter(chef=chef).values_list('kind', 'object_id', 'version', 'removed')
+        rows = list(changes.filter(version__gt=since).order_by('version', 'pk')[:limit + 1])
+        has_more = len(rows) > limit
+        if has_more:
+            cut = rows.pop()[2]
+            # A version is returned whole, or the cursor would skip the rest of it
+            if rows[0][2] == cut:
+                rows = list(changes.filter(version=cut).order_by('pk'))
+            else:
+                rows = [row for row in rows if row[2] != cut]
+        cursor = rows[-1][2] if rows else since
+
+        changed = {kind: set() for kind in Kind.values}
+        removed = {kind: set() for kind in Kind.values}
+        for kind, object_id, _, is_removed in rows:
+            (removed if is_removed else changed)[kind].add(object_id)
+
+        events = list(Event.objects.filter(pk__in=changed[Kind.EVENT], chef=chef, is_deleted=False))
+        clients = list(Client.objects.filter(pk__in=changed[Kind.CLIENT], is_deleted=False))
+        # Changed but gone by now, e.g. deleted again or reassigned
+        removed[Kind.EVENT] |= changed[Kind.EVENT] - {event.pk for event in events}
+        removed[Kind.CLIENT] |= changed[Kind.CLIENT] - {client.pk for client in clients}
+
+        return {
+            'cursor': cursor,
+            'has_more': has_more,
+            'events': SyncEventSerializer(events, many=True).data,
+            'clients': SyncClientSerializer(clients, many=True).data,
+            'profile': ChefSelfSerializer(chef).data if changed[Kind.PROFILE] else None,
+            'removed': {
+                'events': sorted(removed[Kind.EVENT]),
+                'clients': sorted(removed[Kind.CLIENT]),
+            },
+        }
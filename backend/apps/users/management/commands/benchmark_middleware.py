@@ -0,0 +1,54 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+
+def full_stack():
+    """MIDDLEWARE with the admin stack inline, as every request ran it before."""
+    middleware = []
+    for path in settings.MIDDLEWARE:
+        if path == 'core.middleware.AdminStackMiddleware':
+            middleware.extend(settings.ADMIN_MIDDLEWARE)
+        else:
+            middleware.append(path)
+    return middleware
+
+
+class Command(BaseCommand):
+    help = 'Time API and admin requests through the full middleware stack and the split one.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        # Unthrottled views, so thousands of requests don't trip the throttle;
+        # what middleware costs doesn't depend on the view. That both stacks
+        # answer API and admin requests the same is covered by apps/users/tests.py
+        handlers = {}
+        for name, middleware in {'full': full_stack(), 'split': settings.MIDDLEWARE}.items():
+            with override_settings(MIDDLEWARE=middleware):
+                handlers[name] = BaseHandler()
+                handlers[name].load_middleware()
+        for path in ('/api/health/', '/admin/login/'):
+            timings = self.time(handlers, path, options['requests'])
+            saved = (timings['full'] - timings['split']) * 1000
+            self.stdout.write(
+                f'{path:<16} full: {timings["full"]:.3f} ms   split: {timings["split"]:.3f} ms   '
+                f'saved: {saved:.0f} us per request'
+            )
+
+    def time(self, handlers, path, count):
+        """Median ms per request for each handler, alternating between them."""
+        factory = RequestFactory()
+        timings = {name: [] for name in handlers}
+        for _ in range(count):
+            for name, handler in handlers.items():
+                request = factory.get(path)
+                start = time.perf_counter()
+                handler.get_response(request)
+                timings[name].append((time.perf_counter() - start) * 1000)
+        return {name: statistics.median(values) for name, values in timings.items()}
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from core.throttling import SlidingWindowUserRateThrottle, get_backend
+
+
+class Command(BaseCommand):
+    help = 'Measure per-request overhead of the sliding-window throttle (target: < 0.2 ms).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=100)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        throttle = SlidingWindowUserRateThrottle()
+        # High enough that the benchmark measures bookkeeping, not rejections
+        throttle.num_requests, throttle.duration = 10 ** 9, 3600
+
+        class FakeUser:
+            is_authenticated = True
+
+            def __init__(self, pk):
+                self.pk = pk
+
+        requests = []
+        for i in range(options['users']):
+            django_request = factory.get('/api/events/')
+            requests.append(Request(django_request))
+            requests[-1]._user = FakeUser(i)
+
+        timings = []
+        for i in range(options['requests']):
+            request = requests[i % len(requests)]
+            start = time.perf_counter()
+            throttle.allow_request(request, None)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        self.stdout.write(f'backend: {type(get_backend()).__name__}')
+        self.stdout.write(f'mean: {statistics.mean(timings):.4f} ms')
+        self.stdout.write(f'p50:  {timings[len(timings) // 2]:.4f} ms')
+        self.stdout.write(f'p99:  {p99:.4f} ms')
+        if statistics.mean(timings) < 0.2:
+            self.stdout.write(self.style.SUCCESS('Within the 0.2 ms budget.'))
+        else:
+            self.stdout.write(self.style.WARNING('Above the 0.2 ms budget.'))
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.profiling import make_profile_token
+
+
+class Command(BaseCommand):
+    help = 'Mint a signed X-Profile-Token header value for on-demand request profiling.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--label', default='', help='Free-form note, e.g. the org being investigated')
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_profile_token(options['label']))
+        self.stderr.write(
+            f'Valid for {settings.PROFILING_TOKEN_MAX_AGE // 60} minutes. '
+            'Send it as the X-Profile-Token header.'
+        )
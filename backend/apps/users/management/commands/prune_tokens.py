@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.users.pruning import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired JWT outstanding/blacklisted, invitation and password reset tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--pause', type=float, default=None, help='Seconds to sleep between chunks.')
+
+    def handle(self, *args, **options):
+        counts = prune_expired_tokens(chunk_size=options['chunk_size'], pause=options['pause'])
+        for table, deleted in counts.items():
+            self.stdout.write(f'{table}: {deleted} deleted')
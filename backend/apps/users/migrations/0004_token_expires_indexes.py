@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_password_reset_token'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitationtoken',
+            index=models.Index(fields=['expires_at'], name='invitation_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['expires_at'], name='password_reset_expires_idx'),
+        ),
+    ]
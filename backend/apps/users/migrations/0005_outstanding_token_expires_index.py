@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:26
+
+from django.db import migrations
+
+INDEX_NAME = 'token_blacklist_outstanding_expires_idx'
+TABLE = 'token_blacklist_outstandingtoken'
+
+
+def create_index(apps, schema_editor):
+    # SimpleJWT's table has no index on expires_at, which the pruning job
+    # filters on. Built concurrently on Postgres since the table can be large.
+    if schema_editor.connection.vendor == 'postgresql':
+        sql = f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON {TABLE} (expires_at)'
+    else:
+        sql = f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {TABLE} (expires_at)'
+    schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        sql = f'DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}'
+    else:
+        sql = f'DROP INDEX IF EXISTS {INDEX_NAME}'
+    schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('users', '0004_token_expires_indexes'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -52,6 +52,9 @@ class InvitationToken(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['expires_at'], name='invitation_expires_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
@@ -82,6 +85,9 @@ class PasswordResetToken(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['expires_at'], name='password_reset_expires_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
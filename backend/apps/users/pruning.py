@@ -0,0 +1,74 @@
+"""
+Batched pruning of expired tokens.
+
+Each table is emptied of expired rows in chunks of primary keys, so every
+DELETE touches a bounded number of rows and holds its locks only briefly,
+with a short pause between chunks to let other writers (token refresh,
+logout) through.
+"""
+import time
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.metrics import TOKENS_PRUNED
+from core.rows import delete_in
+from .models import InvitationToken, PasswordResetToken
+
+
+def prune(queryset, label, children=(), chunk_size=None, pause=None):
+    """
+    Delete every row of `queryset` in chunks. Returns the number of rows deleted.
+
+    `children` are (model, fk name) pairs referencing the pruned model; their
+    rows are deleted first. Deleting those explicitly lets the parent rows go
+    in one raw DELETE, where Model.delete() would load every row of the chunk
+    to cascade.
+    """
+    chunk_size = chunk_size or settings.TOKEN_PRUNE_CHUNK_SIZE
+    pause = settings.TOKEN_PRUNE_PAUSE if pause is None else pause
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        with transaction.atomic():
+            for child, fk_name in children:
+                child.objects.filter(**{f'{fk_name}__in': pks}).delete()
+            count = delete_in(model, pks, router.db_for_write(model))
+        TOKENS_PRUNED.labels(table=label).inc(count)
+        deleted += count
+        if len(pks) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
+
+
+def prune_expired_tokens(now=None, chunk_size=None, pause=None):
+    """Prune every expired token table. Returns {table label: rows deleted}."""
+    now = now or timezone.now()
+    return {
+        'outstanding_token': prune(
+            OutstandingToken.objects.filter(expires_at__lt=now),
+            'outstanding_token',
+            children=[(BlacklistedToken, 'token')],
+            chunk_size=chunk_size,
+            pause=pause,
+        ),
+        'invitation_token': prune(
+            InvitationToken.objects.filter(expires_at__lt=now),
+            'invitation_token',
+            chunk_size=chunk_size,
+            pause=pause,
+        ),
+        'password_reset_token': prune(
+            PasswordResetToken.objects.filter(expires_at__lt=now),
+            'password_reset_token',
+            chunk_size=chunk_size,
+            pause=pause,
+        ),
+    }
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.authentication import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Password changes and resets, deactivation and profile edits all save
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
@@ -0,0 +1,21 @@
+import logging
+
+from celery import shared_task
+from core.profiling import sweep_profiles
+from .pruning import prune_expired_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def prune_expired_tokens_task():
+    counts = prune_expired_tokens()
+    logger.info('Pruned expired tokens: %s', counts)
+    return counts
+
+
+@shared_task(ignore_result=True)
+def sweep_profiles_task():
+    deleted = sweep_profiles()
+    logger.info('Deleted %s expired profile files', deleted)
+    return deleted
@@ -0,0 +1,129 @@
+"""
+Refresh-token rotation against both blacklist backends (see core/blacklist.py),
+and API and admin responses through the split middleware stack.
+"""
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import blacklist
+from core.testing import make_organization
+from .management.commands.benchmark_middleware import full_stack
+from .tokens import RefreshToken
+
+
+class SetNXRedis:
+    """The two commands RedisBlacklist uses, on a dict; enough to replay an interleaving."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.keys)
+
+
+class RotationTests(TestCase):
+    backend = blacklist.DatabaseBlacklist
+
+    def setUp(self):
+        patcher = mock.patch.object(blacklist, '_backend', self.backend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        _, self.user = make_organization()
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def rotate(self, refresh):
+        return APIClient().post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+
+    def test_rotated_token_is_rejected(self):
+        response = self.rotate(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.rotate(response.data['refresh']).status_code, 200)
+        self.assertEqual(self.rotate(self.refresh).status_code, 401)
+
+    def test_concurrent_rotations_claim_once(self):
+        # Both requests pass the blacklist check before either revokes the token
+        first, second = RefreshToken(self.refresh), RefreshToken(self.refresh)
+        first.blacklist()
+        with self.assertRaises(TokenError):
+            second.blacklist()
+
+    def test_logout_revokes(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/auth/logout/', {'refresh': self.refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.rotate(self.refresh).status_code, 401)
+
+
+class RedisRotationTests(RotationTests):
+    @staticmethod
+    def backend():
+        return blacklist.RedisBlacklist(SetNXRedis())
+
+    def test_expired_token_has_nothing_to_claim(self):
+        backend = blacklist.RedisBlacklist(SetNXRedis())
+        self.assertTrue(backend.add('gone', time.time() - 10))
+        self.assertFalse(backend.contains('gone', time.time() - 10))
+
+
+class MiddlewareStackTests(TestCase):
+    """Running the admin stack only outside /api/ (AdminStackMiddleware) changes no response."""
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.admin = make_organization()
+        cls.token = f'Bearer {AccessToken.for_user(cls.admin)}'
+
+    def summary(self, response, body=True):
+        """Status, header names, cookie names and body; the dated headers always differ."""
+        headers = sorted(name.lower() for name in response.headers if name.lower() not in {'date', 'expires'})
+        return response.status_code, headers, sorted(response.cookies), response.content if body else None
+
+    def observe(self, middleware):
+        with override_settings(MIDDLEWARE=middleware):
+            api = Client()
+            admin = Client(enforce_csrf_checks=True)
+            results = {
+                'GET /api/health/': self.summary(api.get('/api/health/')),
+                'GET /api/auth/me/': self.summary(api.get('/api/auth/me/', HTTP_AUTHORIZATION=self.token)),
+                'GET /api/auth/me/ anonymous': self.summary(api.get('/api/auth/me/')),
+                'GET /api/events/': self.summary(api.get('/api/events/', HTTP_AUTHORIZATION=self.token)),
+                'POST /api/clients/ invalid': self.summary(api.post(
+                    '/api/clients/', {}, content_type='application/json', HTTP_AUTHORIZATION=self.token,
+                )),
+                # The login page embeds a fresh CSRF token
+                'GET /admin/login/': self.summary(admin.get('/admin/login/'), body=False),
+                'POST /admin/login/ no CSRF': self.summary(admin.post('/admin/login/', {'username': self.admin.email})),
+                'GET /admin/ anonymous': self.summary(admin.get('/admin/')),
+            }
+            admin.force_login(self.admin)
+            results['GET /admin/ logged in'] = self.summary(admin.get('/admin/'), body=False)
+        return results
+
+    def test_split_stack_answers_like_the_full_one(self):
+        full, split = self.observe(full_stack()), self.observe(settings.MIDDLEWARE)
+        for label in full:
+            with self.subTest(label):
+                self.assertEqual(split[label], full[label])
+
+    def test_api_and_admin_behaviour(self):
+        observed = self.observe(settings.MIDDLEWARE)
+        status, _, cookies, _ = observed['GET /api/auth/me/']
+        self.assertEqual((status, cookies), (200, []))
+        self.assertEqual(observed['GET /api/auth/me/ anonymous'][0], 401)
+        self.assertEqual(observed['POST /admin/login/ no CSRF'][0], 403)
+        self.assertEqual(observed['GET /admin/login/'][2], ['csrftoken'])
+        self.assertEqual(observed['GET /admin/ anonymous'][0], 302)
+        self.assertEqual(observed['GET /admin/ logged in'][0], 200)
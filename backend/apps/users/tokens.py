@@ -0,0 +1,35 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from core.blacklist import DatabaseBlacklist, get_backend
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token whose blacklist lives in core.blacklist's backend."""
+
+    def check_blacklist(self):
+        if get_backend().contains(self.payload[api_settings.JTI_CLAIM], self.payload['exp']):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        # Losing the claim means another request revoked this token after our check
+        if not get_backend().add(self.payload[api_settings.JTI_CLAIM], self.payload['exp'], token=self):
+            raise TokenError(_('Token is blacklisted'))
+
+    @classmethod
+    def for_user(cls, user):
+        if isinstance(get_backend(), DatabaseBlacklist):
+            return super().for_user(user)
+        # The outstanding-token table only serves the database blacklist
+        return super(BlacklistMixin, cls).for_user(user)
+
+
+class TokenObtainSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
@@ -2,11 +2,11 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
 from core.mixins import TenantMixin
 from core.throttling import AuthRateThrottle
+from .tokens import RefreshToken
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -0,0 +1,16 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from apps.events import live  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Live update streams bypass Django (see apps/events/live.py)
+    if scope['type'] == 'http' and scope['path'] == live.STREAM_PATH:
+        await live.application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
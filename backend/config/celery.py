@@ -1,11 +1,13 @@
 import os
 from celery import Celery
+from core.metrics import connect_celery_signals
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 
 app = Celery('config')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+connect_celery_signals()
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,20 +27,45 @@ INSTALLED_APPS = [
     'apps.chefs',
     'apps.events',
     'apps.notifications',
+    'apps.sync',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'core.middleware.AdminStackMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.TenantMiddleware',
+]
+
+# Run by AdminStackMiddleware for everything but /api/, which uses JWTs
+ADMIN_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'core.middleware.TenantMiddleware',
 ]
+# The admin's checks only look in MIDDLEWARE for these
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
+# Organization shards (see core/sharding.py) and read replicas (see
+# core/routers.py); aliases are added to DATABASES by the environment-specific
+# settings
+DATABASE_ROUTERS = ['core.sharding.ShardRouter', 'core.routers.ReplicaRouter']
+DATABASE_SHARDS = ['default']
+SHARDED_APPS = ['clients', 'chefs', 'events', 'notifications', 'sync']
+SHARD_DIRECTORY_TTL = 60 * 5
+SHARD_ID_BLOCK = 10 ** 12  # ids per shard, see `manage.py init_shard`
+SHARD_MOVE_GRACE_SECONDS = 10  # longer than any request that may still write to the source
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 10  # reads stay on the primary this long after a user's write
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_LAG_CHECK_INTERVAL = 2
 
 ROOT_URLCONF = 'config.urls'
 
@@ -82,15 +108,25 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    # orjson in place of json, same output (see core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core.throttling.SlidingWindowAnonRateThrottle',
+        'core.throttling.SlidingWindowUserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -107,13 +143,125 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.tokens.TokenObtainSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.tokens.RefreshSerializer',
 }
 
+# Seconds an authenticated user row is served from the cache (see core/authentication.py)
+AUTH_USER_CACHE_TTL = 5 * 60
+
+# Shared Redis for app features (throttling, cache); in-process fallbacks when unset
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'complete-past-events': {
+        'task': 'apps.events.tasks.complete_past_events_task',
+        'schedule': crontab(minute=5),
+    },
+    'prune-expired-tokens': {
+        'task': 'apps.users.tasks.prune_expired_tokens_task',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'sweep-profiles': {
+        'task': 'apps.users.tasks.sweep_profiles_task',
+        'schedule': crontab(hour=3, minute=45),
+    },
+    'create-event-partitions': {
+        'task': 'apps.events.tasks.create_event_partitions_task',
+        'schedule': crontab(day_of_month=1, hour=2, minute=0),
+    },
+    'archive-events': {
+        'task': 'apps.events.tasks.archive_events_task',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'send-due-reminders': {
+        'task': 'apps.notifications.tasks.send_due_reminders_task',
+        'schedule': crontab(minute='*/15'),
+    },
+}
 
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+
+# Prometheus scrape token for /api/metrics/ (required unless DEBUG)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+# Port each Celery worker serves its own metrics on (see core/metrics.py)
+METRICS_WORKER_PORT = int(os.getenv('METRICS_WORKER_PORT', '9808'))
+METRICS_CELERY_QUEUES = ['celery']
+# Tables whose row counts are exported as db_table_rows
+METRICS_TABLE_SIZES = [
+    'token_blacklist_outstandingtoken',
+    'token_blacklist_blacklistedtoken',
+    'users_invitationtoken',
+    'users_passwordresettoken',
+]
+
+# On-demand request profiling (see core/profiling.py)
+PROFILING_ROOT = os.getenv('PROFILING_ROOT', str(BASE_DIR / 'profiles'))
+# Any Django storage backend; OPTIONS are passed to it
+PROFILING_STORAGE = {
+    'BACKEND': os.getenv('PROFILING_STORAGE_BACKEND', 'django.core.files.storage.FileSystemStorage'),
+    'OPTIONS': {'location': PROFILING_ROOT},
+}
+PROFILING_MAX_AGE = 60 * 60 * 24 * 7  # seconds stored profiles are kept
+PROFILING_TOKEN_MAX_AGE = 60 * 60  # seconds a signed X-Profile-Token stays valid
+PROFILING_INTERVAL = 0.001  # sampling interval in seconds
+
+# Calendar API (see apps/events/calendar.py)
+CALENDAR_MAX_WINDOW_DAYS = 92
+CALENDAR_SUMMARY_MAX_DAYS = 366
+CALENDAR_SHARD_TTL = 60 * 60 * 24 * 7
+
+# Report builder (see apps/events/reports.py)
+REPORT_MAX_DAYS = 366 * 3
+REPORT_MAX_DIMENSIONS = 3
+REPORT_CACHE_TTL = 60 * 60
+
+# Rows per UPDATE for bulk status transitions (see apps/events/transitions.py)
+EVENT_TRANSITION_CHUNK_SIZE = 1000
+EVENT_BULK_STATUS_MAX_IDS = 1000
+
+# Yearly events_event partitions kept ready beyond the current year, on
+# Postgres (see apps/events/partitions.py)
+EVENT_PARTITION_YEARS_AHEAD = 2
+
+# Archival of old events and clients (see apps/events/archive.py)
+ARCHIVE_DELETED_AFTER_DAYS = 90
+ARCHIVE_COMPLETED_AFTER_YEARS = 3
+ARCHIVE_CHUNK_SIZE = 500
+
+# Delta sync (see apps/sync/changes.py)
+SYNC_PAGE_SIZE = 500
+
+# API response compression (see core/middleware.py). Auth responses carry
+# tokens, so they're never compressed (BREACH).
+COMPRESS_MIN_SIZE = 1024  # bytes
+COMPRESS_EXCLUDE_PATHS = ['/api/auth/']
+COMPRESS_BROTLI_QUALITY = 4
+
+# Batched GET requests (see core/batch.py)
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Live event updates over server-sent events (see apps/events/live.py)
+LIVE_TICKET_MAX_AGE = 60  # seconds
+LIVE_HEARTBEAT_SECONDS = 20
+LIVE_MEMBERSHIP_CHECK_SECONDS = 60  # open streams of deactivated members close within this
+LIVE_QUEUE_SIZE = 100
+
+# Expired token pruning (see apps/users/pruning.py)
+TOKEN_PRUNE_CHUNK_SIZE = 5000
+TOKEN_PRUNE_PAUSE = 0.05  # seconds between chunks
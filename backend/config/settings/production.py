@@ -32,6 +32,37 @@ else:
         }
     }
 
+# Read replicas, as a comma-separated list of database URLs
+for index, replica_url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS', '').split(',')), 1):
+    url = urlparse(replica_url.strip())
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': url.path[1:],
+        'USER': url.username,
+        'PASSWORD': url.password,
+        'HOST': url.hostname,
+        'PORT': url.port or 5432,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+# Organization shards besides `default`, as a comma-separated list of database
+# URLs; run `manage.py migrate --database=shardN` and `manage.py init_shard
+# shardN` before moving organizations onto one
+for index, shard_url in enumerate(filter(None, os.getenv('DATABASE_SHARD_URLS', '').split(',')), 1):
+    url = urlparse(shard_url.strip())
+    alias = f'shard{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': url.path[1:],
+        'USER': url.username,
+        'PASSWORD': url.password,
+        'HOST': url.hostname,
+        'PORT': url.port or 5432,
+    }
+    DATABASE_SHARDS.append(alias)
+
 # CORS - temporarily allow all origins for debugging
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -1,22 +1,59 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
-from apps.events.views import DashboardView, FinancesView, FinancesByChefView
+from django.conf import settings
+from django.http import JsonResponse, HttpResponse
+from django.utils.crypto import constant_time_compare
+from core.batch import BatchView
+from core.metrics import render_metrics
+from core.profiling import ProfileDownloadView
+from apps.events.views import (
+    DashboardView,
+    FinancesView,
+    FinancesByChefView,
+    FinancesReceivablesView,
+    ReportView,
+    PayoutRunListCreateView,
+    ChefPayoutListView,
+    ChefPayoutOwedView,
+    ChefPayoutMarkPaidView,
+)
 
 
 def health_check(request):
     return JsonResponse({'status': 'ok'})
 
 
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=403)
+    elif not settings.DEBUG:
+        # Never open outside development
+        return HttpResponse(status=403)
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
 urlpatterns = [
     path('api/health/', health_check, name='health_check'),
+    path('api/metrics/', metrics, name='metrics'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/profiles/<uuid:profile_id>/', ProfileDownloadView.as_view(), name='profile_download'),
     path('admin/', admin.site.urls),
     path('api/auth/', include('apps.users.urls')),
     path('api/organizations/', include('apps.organizations.urls')),
     path('api/clients/', include('apps.clients.urls')),
     path('api/chefs/', include('apps.chefs.urls')),
     path('api/events/', include('apps.events.urls')),
+    path('api/sync/', include('apps.sync.urls')),
     path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
     path('api/finances/', FinancesView.as_view(), name='finances'),
     path('api/finances/by-chef/', FinancesByChefView.as_view(), name='finances_by_chef'),
+    path('api/finances/receivables/', FinancesReceivablesView.as_view(), name='finances_receivables'),
+    path('api/reports/', ReportView.as_view(), name='reports'),
+    path('api/payouts/', ChefPayoutListView.as_view(), name='payout_list'),
+    path('api/payouts/owed/', ChefPayoutOwedView.as_view(), name='payout_owed'),
+    path('api/payouts/runs/', PayoutRunListCreateView.as_view(), name='payout_runs'),
+    path('api/payouts/<int:pk>/mark-paid/', ChefPayoutMarkPaidView.as_view(), name='payout_mark_paid'),
 ]
@@ -0,0 +1,31 @@
+import os
+
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def django_test_databases():
+    """Test databases and settings for the session, as `manage.py test` sets them up."""
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    yield
+    runner.teardown_databases(old_config)
+    teardown_test_environment()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Rows are rolled back after each test, so nothing cached about them may outlive it."""
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,63 @@
+"""
+Admin for tenant models on a sharded deployment (see core/sharding.py).
+
+The admin doesn't activate shards, so it only sees `default`. Rows of
+organizations the directory places on another shard are hidden there (any
+copies on `default` are leftovers of a move), and rows of an organization
+being moved are read only, since writes would be lost when the move switches
+over. Neither kind of organization can be picked for new rows. Edit them
+through the API, or in a shell with `use_shard`.
+"""
+from django.contrib import admin
+from django.db.models import Q
+
+from core import sharding
+
+
+def _organization_lookup(model):
+    from apps.organizations.shards import TENANT_TABLES
+
+    return dict(TENANT_TABLES).get(model)
+
+
+def _organizations(moving):
+    """Ids of organizations living on another shard, and optionally those being moved."""
+    from apps.organizations.models import OrganizationShard
+
+    condition = ~Q(database=sharding.CENTRAL)
+    if moving:
+        condition |= Q(is_moving=True)
+    return OrganizationShard.objects.using(sharding.CENTRAL).filter(condition).values('organization_id')
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    def get_queryset(self, request):
+        lookup = _organization_lookup(self.model)
+        return super().get_queryset(request).exclude(**{f'{lookup}__in': _organizations(moving=False)})
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        related = db_field.related_model
+        if related._meta.label == 'organizations.Organization':
+            lookup = 'pk'
+        elif related._meta.label == 'organizations.OrganizationMembership':
+            lookup = 'organization_id'
+        else:
+            lookup = _organization_lookup(related)
+        if field is not None and lookup:
+            field.queryset = field.queryset.exclude(**{f'{lookup}__in': _organizations(moving=True)})
+        return field
+
+    def is_writable(self, obj):
+        if obj is None:
+            return True
+        organization_id = obj
+        for part in _organization_lookup(self.model).split('__'):
+            organization_id = getattr(organization_id, part)
+        return sharding.lookup(organization_id) == (sharding.CENTRAL, False)
+
+    def has_change_permission(self, request, obj=None):
+        return self.is_writable(obj) and super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return self.is_writable(obj) and super().has_delete_permission(request, obj)
@@ -0,0 +1,56 @@
+"""
+JWT authentication with the user row served from the cache.
+
+Cached users are keyed by user id plus a per-user version stamp. Saving or
+deleting a User (password change or reset, deactivation, profile edits)
+bumps the stamp, so the next request reloads the row; AUTH_USER_CACHE_TTL
+bounds how long anything changed behind the ORM's back (e.g. a queryset
+update()) can be served.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from core import routers
+from core.metrics import record_cache
+
+
+def _version_key(user_id):
+    return f'auth:user:version:{user_id}'
+
+
+def _user_key(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_version_key(user_id), version, timeout=None):
+            version = cache.get(_version_key(user_id), version)
+    return f'auth:user:{user_id}:{version}'
+
+
+def invalidate_user(user_id):
+    cache.set(_version_key(user_id), time.time_ns(), timeout=None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        routers.bind_user(user_id)
+
+        key = _user_key(user_id)
+        user = cache.get(key)
+        record_cache('auth_user', user is not None)
+        if user is None or api_settings.CHECK_REVOKE_TOKEN:
+            # Runs the lookup along with the active/revocation checks. From
+            # the primary, since a lagging replica's row would be cached
+            # under the new version stamp
+            with routers.use_primary():
+                user = super().get_user(validated_token)
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TTL)
+        return user
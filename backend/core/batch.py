@@ -0,0 +1,151 @@
+"""
+Several GET requests in one round trip.
+
+POST /api/batch/ with
+`{"requests": [{"path": "/api/auth/me/"}, {"path": "/api/chefs/"}], "concurrent": true}`
+answers `{"responses": [{"status": 200, "body": {...}}, ...]}`, in request
+order. Each item has its own status; a failing item doesn't fail the batch.
+
+The batch is authenticated and its membership looked up once. Each item
+then calls its view directly, without middleware, with that user and
+membership preset (see TenantMixin), so it skips the JWT validation and the
+membership query but still runs its own permission checks and throttles.
+Items read from replicas like any GET, and bodies are rendered once, as part
+of the batch response. With `concurrent`, items run on up to
+BATCH_MAX_WORKERS threads, each with its own database connections.
+"""
+import contextvars
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import routers
+from core.mixins import active_membership
+
+logger = logging.getLogger(__name__)
+
+
+def _error(status, detail):
+    return {'status': status, 'body': {'detail': detail}}
+
+
+def _subrequest(request, path, query, membership):
+    """A GET for `path` carrying the batch request's headers and identity."""
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub.organization = None
+    sub.membership = None
+    sub.batch_membership = membership
+    return sub
+
+
+def _run_concurrently(calls, workers):
+    """Run `calls` on `workers` threads, returning their results in order."""
+    results = [None] * len(calls)
+    pending = iter(enumerate(calls))
+    lock = threading.Lock()
+
+    def work():
+        try:
+            while True:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                index, call = item
+                results[index] = call()
+        finally:
+            # Connections are per thread; don't leave them open
+            connections.close_all()
+
+    # Each thread gets a copy of the request's context (shard, routing, identity map)
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(work,))
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class BatchView(APIView):
+    """
+    Run several GET requests at once.
+
+    Body:
+    - requests: list of {"path": "/api/...?query", "method": "GET"}
+    - concurrent: run the requests in parallel (default false)
+    """
+    # Each item is throttled as a request of its own
+    throttle_classes = []
+
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'requests must be a non-empty list.'}, status=400)
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'detail': f'At most {settings.BATCH_MAX_REQUESTS} requests per batch.'},
+                status=400,
+            )
+        if not all(
+            isinstance(item, dict) and isinstance(item.get('path'), str) and item['path'].startswith('/')
+            for item in items
+        ):
+            return Response({'detail': 'Each request needs a path starting with /.'}, status=400)
+
+        with routers.request_scope(read_only=True):
+            routers.bind_user(request.user.pk)
+            membership = active_membership(request.user)
+            calls = [
+                lambda item=item: self.run(request, item, membership)
+                for item in items
+            ]
+            workers = min(len(calls), settings.BATCH_MAX_WORKERS)
+            if request.data.get('concurrent') and workers > 1:
+                responses = _run_concurrently(calls, workers)
+            else:
+                responses = [call() for call in calls]
+        return Response({'responses': responses})
+
+    def run(self, request, item, membership):
+        if str(item.get('method', 'GET')).upper() != 'GET':
+            return _error(405, 'Only GET requests can be batched.')
+        path, _, query = item['path'].partition('?')
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return _error(404, 'Not found.')
+        view_class = getattr(match.func, 'cls', None)
+        if view_class is None or not issubclass(view_class, APIView) or issubclass(view_class, BatchView):
+            return _error(400, 'Not available in a batch.')
+
+        sub = _subrequest(request._request, path, query, membership)
+        sub.resolver_match = match
+        # Picked up by DRF's Request in place of the authentication classes
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception('Batched request to %s failed', item['path'])
+            return _error(500, 'Server error.')
+        if not isinstance(response, Response):
+            return _error(400, 'Not available in a batch.')
+        return {'status': response.status_code, 'body': response.data}
@@ -0,0 +1,73 @@
+"""
+Refresh-token blacklist backends.
+
+With REDIS_URL set, revoked JTIs are stored in Redis with a TTL matching the
+token's expiry, so they clean themselves up and checking a token is a single
+EXISTS. Every check reads Redis: a revocation made by any process (logout,
+rotation) is seen by all the others at once, so a rotated or logged-out
+refresh token can't be replayed against another worker.
+
+`add` claims the JTI atomically (SET NX) and returns False when it was already
+revoked, so of two concurrent refreshes of the same token only one rotates it.
+
+Without Redis (tests, local development) the SimpleJWT database tables are
+used, as before.
+"""
+import time
+
+from core.redis_client import get_redis
+
+
+class RedisBlacklist:
+    def __init__(self, client, timer=time.time):
+        self.client = client
+        self.timer = timer
+
+    def _key(self, jti):
+        return f'jwt:blacklist:{jti}'
+
+    def add(self, jti, exp, token=None):
+        ttl = int(exp - self.timer()) + 1
+        if ttl <= 0:
+            return True  # Already expired, nothing to revoke
+        return bool(self.client.set(self._key(jti), 1, nx=True, ex=ttl))
+
+    def contains(self, jti, exp):
+        return bool(self.client.exists(self._key(jti)))
+
+
+class DatabaseBlacklist:
+    """SimpleJWT's OutstandingToken/BlacklistedToken tables."""
+
+    def add(self, jti, exp, token=None):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from rest_framework_simplejwt.settings import api_settings
+        from rest_framework_simplejwt.utils import datetime_from_epoch
+
+        outstanding, _ = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                'user_id': token.payload.get(api_settings.USER_ID_CLAIM) if token else None,
+                'created_at': token.current_time if token else None,
+                'token': str(token) if token else '',
+                'expires_at': datetime_from_epoch(exp),
+            },
+        )
+        _, created = BlacklistedToken.objects.get_or_create(token=outstanding)
+        return created
+
+    def contains(self, jti, exp):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        client = get_redis()
+        _backend = RedisBlacklist(client) if client else DatabaseBlacklist()
+    return _backend
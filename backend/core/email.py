@@ -1,5 +1,23 @@
+import time
+
 from django.core.mail import send_mail
 from django.conf import settings
+from core.identity import resolve
+from core.metrics import EMAIL_SEND_LATENCY, EMAIL_SEND_FAILURES
+
+
+def _send(kind, fail_silently=False, **kwargs):
+    """send_mail wrapper that records latency and failures per email kind."""
+    start = time.perf_counter()
+    try:
+        return send_mail(fail_silently=False, **kwargs)
+    except Exception:
+        EMAIL_SEND_FAILURES.labels(kind=kind).inc()
+        if not fail_silently:
+            raise
+        return 0
+    finally:
+        EMAIL_SEND_LATENCY.labels(kind=kind).observe(time.perf_counter() - start)
 
 
 def send_chef_invitation_email(user, organization, token):
@@ -54,7 +72,8 @@ The Chef Bawss Team
 </html>
 """
 
-    send_mail(
+    _send(
+        'chef_invitation',
         subject=subject,
         message=message,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@chefbawss.com'),
@@ -67,6 +86,7 @@ The Chef Bawss Team
 def send_event_assignment_email(chef_user, event, organization):
     """Send email to chef when they're assigned to a new event."""
     event_url = f"{settings.FRONTEND_URL}/events/{event.id}/chef-view"
+    client = resolve(event, 'client')
 
     subject = f"New Event Assignment: {event.display_name}"
 
@@ -76,7 +96,7 @@ Hi {chef_user.first_name},
 You've been assigned to a new event with {organization.name}!
 
 Event: {event.display_name}
-Client: {event.client.name}
+Client: {client.name}
 Date: {event.date.strftime('%A, %B %d, %Y')}
 Time: {event.start_time.strftime('%I:%M %p')}
 Location: {event.location or 'TBD'}
@@ -108,7 +128,7 @@ Best,
         <p>You've been assigned to a new event with <strong>{organization.name}</strong>!</p>
         <div class="details">
             <p><strong>Event:</strong> {event.display_name}</p>
-            <p><strong>Client:</strong> {event.client.name}</p>
+            <p><strong>Client:</strong> {client.name}</p>
             <p><strong>Date:</strong> {event.date.strftime('%A, %B %d, %Y')}</p>
             <p><strong>Time:</strong> {event.start_time.strftime('%I:%M %p')}</p>
             <p><strong>Location:</strong> {event.location or 'TBD'}</p>
@@ -124,7 +144,8 @@ Best,
 </html>
 """
 
-    send_mail(
+    _send(
+        'event_assignment',
         subject=subject,
         message=message,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@chefbawss.com'),
@@ -137,6 +158,7 @@ Best,
 def send_event_update_email(chef_user, event, organization, changes=None):
     """Send email to chef when their assigned event is updated."""
     event_url = f"{settings.FRONTEND_URL}/events/{event.id}/chef-view"
+    client = resolve(event, 'client')
 
     subject = f"Event Updated: {event.display_name}"
 
@@ -150,7 +172,7 @@ Hi {chef_user.first_name},
 An event you're assigned to has been updated.{changes_text}
 
 Event: {event.display_name}
-Client: {event.client.name}
+Client: {client.name}
 Date: {event.date.strftime('%A, %B %d, %Y')}
 Time: {event.start_time.strftime('%I:%M %p')}
 Location: {event.location or 'TBD'}
@@ -183,7 +205,7 @@ Best,
         {'<div class="changes"><strong>Changes:</strong><ul>' + "".join(f"<li>{c}</li>" for c in (changes or [])) + '</ul></div>' if changes else ''}
         <div class="details">
             <p><strong>Event:</strong> {event.display_name}</p>
-            <p><strong>Client:</strong> {event.client.name}</p>
+            <p><strong>Client:</strong> {client.name}</p>
             <p><strong>Date:</strong> {event.date.strftime('%A, %B %d, %Y')}</p>
             <p><strong>Time:</strong> {event.start_time.strftime('%I:%M %p')}</p>
             <p><strong>Location:</strong> {event.location or 'TBD'}</p>
@@ -198,7 +220,8 @@ Best,
 </html>
 """
 
-    send_mail(
+    _send(
+        'event_update',
         subject=subject,
         message=message,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@chefbawss.com'),
@@ -258,7 +281,8 @@ The Chef Bawss Team
 </html>
 """
 
-    send_mail(
+    _send(
+        'password_reset',
         subject=subject,
         message=message,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@chefbawss.com'),
@@ -266,3 +290,87 @@ The Chef Bawss Team
         html_message=html_message,
         fail_silently=False,
     )
+
+
+def send_event_reminder_email(chef_user, reminders, organization):
+    """
+    Send one email reminding a chef of their upcoming events.
+
+    `reminders` is a list of (event, label) pairs, e.g. (event, 'Tomorrow').
+    Returns the number of emails sent (0 if sending failed).
+    """
+    events_url = f"{settings.FRONTEND_URL}/events"
+
+    if len(reminders) == 1:
+        subject = f"Reminder: {reminders[0][0].display_name} {reminders[0][1].lower()}"
+    else:
+        subject = f"Reminder: {len(reminders)} upcoming events"
+
+    lines = []
+    items = []
+    for event, label in reminders:
+        client = resolve(event, 'client')
+        when = f"{event.date.strftime('%A, %B %d, %Y')} at {event.start_time.strftime('%I:%M %p')}"
+        lines.append(f"""
+{label}: {event.display_name}
+Client: {client.name}
+When: {when}
+Location: {event.location or 'TBD'}
+Guests: {event.guest_count}
+""")
+        items.append(f"""
+            <div class="details">
+                <p><strong>{label}:</strong> {event.display_name}</p>
+                <p><strong>Client:</strong> {client.name}</p>
+                <p><strong>When:</strong> {when}</p>
+                <p><strong>Location:</strong> {event.location or 'TBD'}</p>
+                <p><strong>Guests:</strong> {event.guest_count}</p>
+            </div>""")
+
+    message = f"""
+Hi {chef_user.first_name},
+
+A reminder of your upcoming events with {organization.name}:
+{''.join(lines)}
+View your events: {events_url}
+
+Best,
+{organization.name}
+"""
+
+    html_message = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .button {{ display: inline-block; background-color: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0; }}
+        .details {{ background-color: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0; }}
+        .footer {{ margin-top: 30px; font-size: 12px; color: #666; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h2>Upcoming Events</h2>
+        <p>Hi {chef_user.first_name},</p>
+        <p>A reminder of your upcoming events with <strong>{organization.name}</strong>:</p>
+        {''.join(items)}
+        <a href="{events_url}" class="button">View Your Events</a>
+        <div class="footer">
+            <p>Sent from {organization.name} via Chef Bawss</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+    return _send(
+        'event_reminder',
+        subject=subject,
+        message=message,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@chefbawss.com'),
+        recipient_list=[chef_user.email],
+        html_message=html_message,
+        fail_silently=True,
+    )
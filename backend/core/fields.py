@@ -0,0 +1,79 @@
+from django.db import models
+from rest_framework import serializers
+from core.fieldsets import read_paths
+from core.identity import current, remember, resolve_paths
+from apps.clients.models import Client
+from apps.chefs.models import ChefProfile
+
+
+class TenantPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField whose queryset is scoped to request.organization.
+
+    An id from another organization fails the same single indexed lookup as
+    an id that doesn't exist, so validators don't need to load the related
+    organization again to compare it.
+    """
+    tenant_field = 'organization'
+
+    def __init__(self, **kwargs):
+        self.tenant_field = kwargs.pop('tenant_field', self.tenant_field)
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        organization = getattr(request, 'organization', None)
+        if organization is None:
+            return queryset.none()
+        return queryset.filter(**{self.tenant_field: organization})
+
+    def to_internal_value(self, data):
+        instance = super().to_internal_value(data)
+        remember(instance)
+        return instance
+
+
+class TenantClientField(TenantPrimaryKeyRelatedField):
+    default_error_messages = {
+        'does_not_exist': 'Invalid client.',
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Client.objects.all())
+        super().__init__(**kwargs)
+
+
+class TenantChefField(TenantPrimaryKeyRelatedField):
+    """Chef profiles come with membership and user so is_active/user are free."""
+    tenant_field = 'membership__organization'
+    default_error_messages = {
+        'does_not_exist': 'Invalid chef.',
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', ChefProfile.objects.select_related('membership__user'))
+        super().__init__(**kwargs)
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """
+    Loads the relations the child's fields read (traced as for sparse
+    fieldsets) for all rows up front, one deduplicated query per relation,
+    in place of the queryset's select_related joins. Use as
+    `Meta.list_serializer_class`, and keep the view's select_related: it is
+    what loads the relations when a field can't be traced, outside a request
+    scope, or for a queryset narrowed to sparse fields.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        traced = read_paths(self.child.Meta.model, self.child)
+        batched = traced is not None and current() is not None
+        if batched and isinstance(data, models.QuerySet) and not data.query.deferred_loading[0]:
+            data = data.select_related(None)
+        instances = list(data)
+        if batched:
+            resolve_paths(instances, traced[1])
+        return super().to_representation(instances)
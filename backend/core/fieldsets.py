@@ -0,0 +1,125 @@
+"""
+Sparse fieldsets: `?fields=id,date,client_name` or `?omit=internal_notes`.
+
+Serializers with SparseFieldsMixin drop the fields a GET didn't ask for, and
+views with SparseQuerysetMixin then load only what the remaining fields
+read: `only()` the columns behind each field's source, and `select_related`
+only the relations those sources cross, in place of the view's own. Method
+fields and model properties can't be traced, so serializers list what they
+read in `Meta.sparse_sources`, e.g. {'chef_name': ['chef__membership__user__first_name', ...]};
+an empty list means the field reads no columns of the row (it runs its own
+query). A field that can't be traced leaves the queryset as it was.
+
+Requests without either parameter are untouched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _names(request, param):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def is_sparse(request):
+    return request.method in SAFE_METHODS and (
+        'fields' in request.query_params or 'omit' in request.query_params
+    )
+
+
+def selected_fields(request, available):
+    """The names in `available` the request's fields/omit parameters keep."""
+    fields, omit = _names(request, 'fields'), _names(request, 'omit')
+    unknown = sorted(((fields or set()) | (omit or set())) - set(available))
+    if unknown:
+        raise ParseError(f'Unknown fields: {", ".join(unknown)}.')
+    selected = set(available) if fields is None else fields
+    return selected - (omit or set())
+
+
+class SparseFieldsMixin:
+    """Serializer mixin keeping only the fields a GET asks for."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and is_sparse(request):
+            selected = selected_fields(request, self.fields)
+            for name in list(self.fields):
+                if name not in selected:
+                    self.fields.pop(name)
+
+
+def _trace(model, path):
+    """(columns, relation to select) that reading `path` needs, or None."""
+    parts = path.split('__')
+    columns = []
+    relation = None
+    for i, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        prefix = '__'.join(parts[:i + 1])
+        # Each foreign key crossed is needed to follow it
+        columns.append(prefix)
+        if i < len(parts) - 1:
+            if not (field.many_to_one or field.one_to_one):
+                return None
+            relation = prefix
+            model = field.related_model
+    return columns, relation
+
+
+def read_paths(model, serializer):
+    """(columns, relations) that `serializer`'s fields read, or None if that can't be told."""
+    sources = getattr(getattr(serializer, 'Meta', None), 'sparse_sources', {})
+    columns, relations = {'pk'}, set()
+    for name, field in serializer.fields.items():
+        if name in sources:
+            paths = sources[name]
+        elif field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            return None
+        else:
+            paths = [field.source.replace('.', '__')]
+        for path in paths:
+            traced = _trace(model, path)
+            if traced is None:
+                return None
+            columns.update(traced[0])
+            if traced[1]:
+                relations.add(traced[1])
+    return columns, relations
+
+
+def narrow(queryset, serializer):
+    """`queryset` loading only what `serializer`'s fields read, or unchanged if that can't be told."""
+    traced = read_paths(queryset.model, serializer)
+    if traced is None:
+        return queryset
+    columns, relations = traced
+
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns)
+
+
+class SparseQuerysetMixin:
+    """View mixin narrowing the queryset to the fields the response keeps."""
+
+    def filter_queryset(self, queryset):
+        # After get_queryset(), so the view's own select_related is replaced
+        queryset = super().filter_queryset(queryset)
+        if not is_sparse(self.request):
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsMixin):
+            return queryset
+        return narrow(queryset, serializer)
@@ -0,0 +1,129 @@
+"""
+Request-scoped identity map for model instances.
+
+TenantMiddleware opens a scope per request. Anything that has already loaded
+a row (TenantMixin, tenant relation fields, views) registers it, and
+`resolve(instance, 'fk_name')` then satisfies foreign key traversals from the
+map instead of issuing a query. Misses are loaded once and remembered, and
+`resolve_many`/`resolve_paths` batch misses for a list of instances into one
+query per relation; list serializers use them through BatchedListSerializer
+(see core/fields.py).
+
+Outside a scope (Celery tasks, shell) `resolve` is plain attribute access.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    def __init__(self):
+        self._objects = {}
+
+    def _key(self, model, pk):
+        return (model._meta.concrete_model, pk)
+
+    def add(self, *instances):
+        """Register instances along with any related objects already cached on them."""
+        for instance in instances:
+            if instance is None or instance.pk is None:
+                continue
+            key = self._key(type(instance), instance.pk)
+            if self._objects.get(key) is instance:
+                continue
+            self._objects[key] = instance
+            for field in instance._meta.concrete_fields:
+                if field.is_relation and field.is_cached(instance):
+                    self.add(field.get_cached_value(instance))
+
+    def get(self, model, pk):
+        return self._objects.get(self._key(model, pk))
+
+    def load_many(self, model, pks):
+        """Return {pk: instance}, fetching only the pks not already in the map."""
+        pks = {pk for pk in pks if pk is not None}
+        missing = [pk for pk in pks if self.get(model, pk) is None]
+        if missing:
+            self.add(*model._base_manager.in_bulk(missing).values())
+        return {pk: self.get(model, pk) for pk in pks}
+
+    def resolve(self, instance, field_name):
+        field = instance._meta.get_field(field_name)
+        if field.is_cached(instance):
+            return field.get_cached_value(instance)
+        pk = getattr(instance, field.attname)
+        if pk is None:
+            return None
+        related = self.get(field.related_model, pk)
+        if related is None:
+            related = getattr(instance, field_name)
+            self.add(related)
+        else:
+            field.set_cached_value(instance, related)
+        return related
+
+    def resolve_many(self, instances, field_name):
+        """Resolve `field_name` on every instance with one query for the misses. Returns the related objects."""
+        if not instances:
+            return []
+        field = instances[0]._meta.get_field(field_name)
+        pending = []
+        for instance in instances:
+            if field.is_cached(instance):
+                self.add(field.get_cached_value(instance))
+            elif field.attname not in instance.get_deferred_fields():
+                # Loading a deferred key would cost a query per instance
+                pending.append(instance)
+        self.load_many(field.related_model, [getattr(i, field.attname) for i in pending])
+        for instance in pending:
+            self.resolve(instance, field_name)
+        return [
+            field.get_cached_value(instance) for instance in instances
+            if field.is_cached(instance) and field.get_cached_value(instance) is not None
+        ]
+
+    def resolve_paths(self, instances, paths):
+        """Resolve each `a__b__c` path across `instances`, one query per relation at most."""
+        for path in paths:
+            level = instances
+            for name in path.split('__'):
+                level = self.resolve_many(level, name)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def request_scope():
+    token = _current.set(IdentityMap())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def remember(*instances):
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map.add(*instances)
+
+
+def resolve(instance, field_name):
+    identity_map = _current.get()
+    if identity_map is None:
+        return getattr(instance, field_name)
+    return identity_map.resolve(instance, field_name)
+
+
+def resolve_many(instances, field_name):
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map.resolve_many(list(instances), field_name)
+
+
+def resolve_paths(instances, paths):
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map.resolve_paths(list(instances), paths)
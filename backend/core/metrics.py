@@ -0,0 +1,230 @@
+"""
+Prometheus metrics for the API, database, cache, Celery and email.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py), every gunicorn
+worker writes its samples to that directory and the /api/metrics/ view
+aggregates them, so a scrape sees all workers at once.
+
+Celery workers run in their own process or container, so they can't share
+that directory. Each worker serves its own metrics (task latency, pruned
+tokens, emails sent from tasks) on METRICS_WORKER_PORT, aggregated across
+its pool processes through its own PROMETHEUS_MULTIPROC_DIR (see Procfile).
+Scrape it next to the web service, e.g. `worker:9808/metrics`.
+"""
+import logging
+import os
+import shutil
+import time
+
+from django.conf import settings
+from prometheus_client import (
+    CollectorRegistry,
+    start_http_server,
+    Counter,
+    Histogram,
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client import multiprocess
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by view and response status.',
+    ['view', 'method', 'status'],
+)
+
+DB_QUERY_COUNT = Histogram(
+    'db_queries_per_request',
+    'Number of SQL queries executed per request.',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+DB_QUERY_TIME = Histogram(
+    'db_query_duration_seconds_per_request',
+    'Total time spent in SQL per request.',
+    ['view'],
+)
+
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Application cache lookups by cache name and result.',
+    ['cache', 'result'],
+)
+
+CELERY_TASK_LATENCY = Histogram(
+    'celery_task_duration_seconds',
+    'Celery task run time by task name and final state.',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+EMAIL_SEND_LATENCY = Histogram(
+    'email_send_duration_seconds',
+    'Time spent handing an email to the mail backend.',
+    ['kind'],
+)
+
+EMAIL_SEND_FAILURES = Counter(
+    'email_send_failures_total',
+    'Emails the mail backend failed to send.',
+    ['kind'],
+)
+
+TOKENS_PRUNED = Counter(
+    'tokens_pruned_total',
+    'Expired token rows deleted by the pruning job.',
+    ['table'],
+)
+
+
+def record_cache(cache_name, hit):
+    """Count an application-level cache lookup towards the hit ratio."""
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+class QueryTimer:
+    """Database execute wrapper that counts queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class CeleryQueueCollector:
+    """Reports broker queue depth at scrape time instead of from each worker."""
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            'celery_queue_length',
+            'Messages waiting in each Celery broker queue.',
+            labels=['queue'],
+        )
+        broker_url = getattr(settings, 'CELERY_BROKER_URL', '')
+        if broker_url.startswith(('redis://', 'rediss://')):
+            try:
+                import redis
+
+                client = redis.Redis.from_url(broker_url, socket_timeout=1)
+                for queue in getattr(settings, 'METRICS_CELERY_QUEUES', ['celery']):
+                    gauge.add_metric([queue], client.llen(queue))
+            except Exception:
+                pass  # Broker down shouldn't break the whole scrape
+        yield gauge
+
+
+class TableSizeCollector:
+    """
+    Reports row counts of the tables in METRICS_TABLE_SIZES at scrape time.
+
+    Uses the planner's estimate on Postgres, which is constant time however
+    large the table gets; other databases fall back to COUNT(*).
+    """
+
+    def _gauge(self):
+        return GaugeMetricFamily(
+            'db_table_rows',
+            'Approximate number of rows per database table.',
+            labels=['table'],
+        )
+
+    def describe(self):
+        # Registration would otherwise call collect(), which can run while
+        # settings are still loading (config imports this via Celery)
+        return [self._gauge()]
+
+    def collect(self):
+        from django.db import connection
+
+        gauge = self._gauge()
+        tables = getattr(settings, 'METRICS_TABLE_SIZES', [])
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(
+                        'SELECT relname, reltuples::bigint FROM pg_class '
+                        'WHERE relname = ANY(%s) AND relkind = %s',
+                        [tables, 'r'],
+                    )
+                    rows = cursor.fetchall()
+                else:
+                    rows = []
+                    for table in tables:
+                        cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                        rows.append((table, cursor.fetchone()[0]))
+            for table, count in rows:
+                gauge.add_metric([table], max(count, 0))
+        except Exception:
+            pass  # Database down shouldn't break the whole scrape
+        yield gauge
+
+
+def _on_task_prerun(task_id=None, task=None, **kwargs):
+    task.request._metrics_started = time.perf_counter()
+
+
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = getattr(task.request, '_metrics_started', None)
+    if started is not None:
+        CELERY_TASK_LATENCY.labels(task=task.name, state=state or 'UNKNOWN').observe(
+            time.perf_counter() - started
+        )
+
+
+def _on_worker_init(**kwargs):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not directory or not settings.METRICS_WORKER_PORT:
+        logger.warning('PROMETHEUS_MULTIPROC_DIR or METRICS_WORKER_PORT unset; task metrics are not exported')
+        return
+    # Before the pool forks. Stale files from a previous run would be summed
+    # into the new counters
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.METRICS_WORKER_PORT, registry=registry)
+
+
+def _on_worker_process_shutdown(pid=None, **kwargs):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def connect_celery_signals():
+    from celery.signals import task_prerun, task_postrun, worker_init, worker_process_shutdown
+
+    task_prerun.connect(_on_task_prerun, weak=False)
+    task_postrun.connect(_on_task_postrun, weak=False)
+    worker_init.connect(_on_worker_init, weak=False)
+    worker_process_shutdown.connect(_on_worker_process_shutdown, weak=False)
+
+
+def build_registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(CeleryQueueCollector())
+        registry.register(TableSizeCollector())
+        return registry
+    return REGISTRY
+
+
+if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    REGISTRY.register(CeleryQueueCollector())
+    REGISTRY.register(TableSizeCollector())
+
+
+def render_metrics():
+    return generate_latest(build_registry()), CONTENT_TYPE_LATEST
@@ -1,3 +1,156 @@
+import gzip
+import time
+from contextlib import ExitStack
+
+import brotli
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+
+from core import routers, sharding
+from core.identity import request_scope
+from core.metrics import REQUEST_LATENCY, DB_QUERY_COUNT, DB_QUERY_TIME, QueryTimer
+
+
+class MetricsMiddleware:
+    """Records request latency and SQL usage per resolved view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timer))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        # Label by route name, never the raw path, to keep cardinality bounded
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match._func_path) if match else 'unmatched'
+
+        REQUEST_LATENCY.labels(
+            view=view, method=request.method, status=response.status_code
+        ).observe(duration)
+        DB_QUERY_COUNT.labels(view=view).observe(timer.count)
+        DB_QUERY_TIME.labels(view=view).observe(timer.duration)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compresses API responses of COMPRESS_MIN_SIZE bytes or more with brotli
+    or gzip, whichever the client accepts (brotli when both are). Streaming
+    responses and COMPRESS_EXCLUDE_PATHS are sent as they are.
+    """
+    COMPRESSORS = {
+        'br': lambda content: brotli.compress(content, quality=settings.COMPRESS_BROTLI_QUALITY),
+        'gzip': lambda content: gzip.compress(content, compresslevel=6, mtime=0),
+    }
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not request.path.startswith('/api/')
+            or request.path.startswith(tuple(settings.COMPRESS_EXCLUDE_PATHS))
+            or len(response.content) < settings.COMPRESS_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.negotiate(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+        compressed = self.COMPRESSORS[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        # The bytes differ, so a strong ETag no longer matches them
+        etag = response.headers.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def negotiate(self, accept_encoding):
+        """The encoding to use for an Accept-Encoding header, or None."""
+        accepted = {}
+        for item in accept_encoding.split(','):
+            coding, _, params = item.partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip().lower()] = quality
+        for coding in self.COMPRESSORS:
+            if accepted.get(coding, 0) > 0:
+                return coding
+        return None
+
+
+class AdminStackMiddleware:
+    """
+    Runs ADMIN_MIDDLEWARE (sessions, CSRF, auth, messages) for everything but
+    /api/. The API authenticates with JWTs in DRF and uses none of them, so
+    API requests skip straight past.
+    """
+    API_PREFIX = '/api/'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.middleware = []
+        handler = get_response
+        for path in reversed(settings.ADMIN_MIDDLEWARE):
+            try:
+                middleware = import_string(path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            self.middleware.insert(0, middleware)
+            handler = middleware
+        self.admin_handler = handler
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.API_PREFIX):
+            return self.get_response(request)
+        return self.admin_handler(request)
+
+    # Django only calls view/exception hooks on middleware listed in
+    # MIDDLEWARE, so forward them (CsrfViewMiddleware checks in process_view)
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.path_info.startswith(self.API_PREFIX):
+            return None
+        for middleware in self.middleware:
+            if hasattr(middleware, 'process_view'):
+                response = middleware.process_view(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response
+        return None
+
+    def process_exception(self, request, exception):
+        if request.path_info.startswith(self.API_PREFIX):
+            return None
+        for middleware in reversed(self.middleware):
+            if hasattr(middleware, 'process_exception'):
+                response = middleware.process_exception(request, exception)
+                if response is not None:
+                    return response
+        return None
+
+
 class TenantMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -6,4 +159,17 @@ class TenantMiddleware:
         # Initialize - will be populated after DRF auth
         request.organization = None
         request.membership = None
-        return self.get_response(request)
\ No newline at end of file
+        with request_scope(), sharding.request_scope():
+            return self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Lets safe-method requests read from replicas (see core/routers.py)."""
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routers.request_scope(read_only=request.method in self.SAFE_METHODS):
+            return self.get_response(request)
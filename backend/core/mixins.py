@@ -1,8 +1,25 @@
+from rest_framework.permissions import SAFE_METHODS
+from core import sharding
+from core.identity import remember
+from core.profiling import profiling_requested, profile_dispatch
+
+
+def active_membership(user):
+    return user.memberships.filter(
+        is_active=True
+    ).select_related('organization').first()
+
+
 class TenantMixin:
     """
     Mixin that sets organization/membership after DRF authentication
     but before permission checks.
     """
+    def dispatch(self, request, *args, **kwargs):
+        if profiling_requested(request):
+            return profile_dispatch(self, super().dispatch, request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
     def initial(self, request, *args, **kwargs):
         # Standard DRF setup
         self.format_kwarg = self.get_format_suffix(**kwargs)
@@ -20,10 +37,20 @@ class TenantMixin:
 
         # Set tenant AFTER auth, BEFORE permissions
         if request.user.is_authenticated:
-            membership = request.user.memberships.filter(is_active=True).first()
+            # Batched requests arrive with the batch's membership (see core/batch.py)
+            if hasattr(request._request, 'batch_membership'):
+                membership = request._request.batch_membership
+            else:
+                membership = active_membership(request.user)
             if membership:
                 request.organization = membership.organization
                 request.membership = membership
+                # Tenant queries from here on go to the organization's shard
+                sharding.activate(
+                    membership.organization_id,
+                    writing=request.method not in SAFE_METHODS,
+                )
+            remember(request.user, membership)
 
         # Now check permissions with tenant available
         self.check_permissions(request)
@@ -0,0 +1,34 @@
+import io
+import re
+
+from django.conf import settings
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from core.renderers import ORJSONRenderer
+
+# orjson reads integers wider than 64 bits as floats; json keeps them exact
+LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser on orjson, which only reads UTF-8; other charsets, and bodies
+    with numbers orjson could round, fall back.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        data = stream.read()
+        if LONG_NUMBER.search(data):
+            return super().parse(io.BytesIO(data), media_type, parser_context)
+        try:
+            # Like the strict JSONParser, rejects NaN and Infinity
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
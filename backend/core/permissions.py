@@ -22,3 +22,10 @@ class IsChefOrAdmin(permissions.BasePermission):
         if not request.membership:
             return False
         return request.membership.role in ['admin', 'chef']
+
+
+class IsChef(permissions.BasePermission):
+    def has_permission(self, request, view):
+        if not request.membership:
+            return False
+        return request.membership.role == 'chef'
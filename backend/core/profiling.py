@@ -0,0 +1,175 @@
+"""
+On-demand request profiling for TenantMixin views.
+
+A request is profiled when it carries a valid signed X-Profile-Token header
+(minted with `manage.py profile_token`) or, for staff users, a `_profile`
+query param. For the param the request is authenticated first, so nobody
+else gets the profiler started. The sampling profile (speedscope format) and
+a timeline of the SQL the request ran are written to PROFILING_STORAGE and
+can be downloaded from /api/profiles/<id>/ until `sweep_profiles` removes
+them after PROFILING_MAX_AGE. Requests without either marker skip all of this.
+"""
+import json
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_PARAM = '_profile'
+TOKEN_SALT = 'core.profiling'
+
+storage = import_string(settings.PROFILING_STORAGE['BACKEND'])(
+    **settings.PROFILING_STORAGE.get('OPTIONS', {})
+)
+
+
+def make_profile_token(label=''):
+    return signing.dumps({'label': label}, salt=TOKEN_SALT)
+
+
+def _valid_token(value):
+    try:
+        signing.loads(value, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def profiling_requested(request):
+    return PROFILE_HEADER in request.headers or PROFILE_PARAM in request.GET
+
+
+def _staff_user(view, request):
+    """
+    The staff user `request` authenticates as, or None. Marks the request as
+    authenticated so the view doesn't authenticate it again.
+    """
+    drf_request = view.initialize_request(request)
+    try:
+        user = drf_request.user
+    except APIException:
+        return None  # The view answers this itself
+    if not user.is_staff:
+        return None
+    request._force_auth_user = user
+    request._force_auth_token = drf_request.auth
+    return user
+
+
+def sweep_profiles():
+    """Delete stored profiles older than PROFILING_MAX_AGE. Returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=settings.PROFILING_MAX_AGE)
+    try:
+        _, names = storage.listdir('')
+    except FileNotFoundError:
+        return 0  # Nothing profiled yet
+    deleted = 0
+    for name in names:
+        if name.endswith('.json') and storage.get_modified_time(name) < cutoff:
+            storage.delete(name)
+            deleted += 1
+    return deleted
+
+
+class SQLTimeline:
+    """Execute wrapper recording when each query started and how long it took."""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'db': context['connection'].alias,
+                'start_ms': round((start - self.started) * 1000, 3),
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'sql': sql,
+            })
+
+
+def profile_dispatch(view, dispatch, request, *args, **kwargs):
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    authorized = _valid_token(request.headers.get(PROFILE_HEADER, ''))
+    if not authorized and not (PROFILE_PARAM in request.GET and _staff_user(view, request)):
+        return dispatch(request, *args, **kwargs)
+
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL)
+    started = time.perf_counter()
+    timeline = SQLTimeline(started)
+
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(timeline))
+        profiler.start()
+        try:
+            response = dispatch(request, *args, **kwargs)
+            # Include serialization in the profile, not just the handler
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        finally:
+            profiler.stop()
+    duration = time.perf_counter() - started
+
+    try:
+        user = view.request.user
+    except Exception:
+        user = None  # Authentication itself failed
+
+    profile_id = str(uuid.uuid4())
+    membership = getattr(view.request, 'membership', None)
+    meta = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': view.__class__.__name__,
+        'status': response.status_code,
+        'user_id': user.pk if user and user.is_authenticated else None,
+        'organization_id': membership.organization_id if membership else None,
+        'duration_ms': round(duration * 1000, 3),
+        'query_count': len(timeline.queries),
+        'queries': timeline.queries,
+    }
+    storage.save(f'{profile_id}.json', ContentFile(json.dumps(meta)))
+    storage.save(
+        f'{profile_id}.speedscope.json',
+        ContentFile(profiler.output(renderer=SpeedscopeRenderer())),
+    )
+    response['X-Profile-Id'] = profile_id
+    return response
+
+
+class ProfileDownloadView(APIView):
+    """
+    Download a stored profile. Staff only.
+
+    Query params:
+    - artifact: speedscope (default) or sql
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        if request.query_params.get('artifact') == 'sql':
+            name = f'{profile_id}.json'
+        else:
+            name = f'{profile_id}.speedscope.json'
+        if not storage.exists(name):
+            raise Http404
+        return FileResponse(storage.open(name), as_attachment=True, filename=name)
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_redis():
+    """
+    Shared Redis connection pool for app features (throttling, etc).
+
+    Returns None when REDIS_URL isn't configured so callers can fall back to
+    an in-process implementation, e.g. in tests and local development.
+    """
+    if not settings.REDIS_URL:
+        return None
+    import redis
+
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1)
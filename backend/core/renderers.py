@@ -0,0 +1,78 @@
+"""
+orjson-backed JSON rendering, a drop-in for DRF's JSONRenderer.
+
+Output is byte-for-byte what JSONRenderer writes with the default compact,
+unicode settings: anything orjson would format differently from DRF
+(datetimes, dates and times, Decimals, lazy strings, querysets) is handed to
+DRF's own JSONEncoder, and U+2028/U+2029 are escaped the same way. Indented
+output (the browsable API, `Accept: application/json; indent=4`),
+non-default JSON settings and data orjson can't encode (integers wider than
+64 bits, keys that aren't strings) fall back to JSONRenderer.
+
+orjson writes floats itself and can't be told otherwise. It agrees with DRF
+on zero and on magnitudes from 1e-4 up to 1e16, but writes larger and smaller
+ones without the exponent's sign and padding (1e16, 1e-7 for 1e+16, 1e-07),
+and NaN and infinity as null where DRF raises ValueError. So the data is
+checked for such floats first, level by level with C iterators, and any
+found falls back to JSONRenderer too.
+"""
+from itertools import chain, compress
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+SCALARS = frozenset({str, int, bool, type(None)})
+
+
+def _formats_alike(value):
+    return value == 0 or 1e-4 <= abs(value) < 1e16
+
+
+def _floats_format_alike(data):
+    """Whether every float in `data` is one orjson writes exactly as DRF does."""
+    level = [data]
+    while level:
+        odd = set(map(type, level)) - SCALARS
+        if not odd:
+            return True
+        floats = {t for t in odd if issubclass(t, float)}
+        if floats and not all(map(_formats_alike, compress(level, map(floats.__contains__, map(type, level))))):
+            return False
+        dicts = {t for t in odd if issubclass(t, dict)}
+        lists = {t for t in odd if issubclass(t, (list, tuple))}
+        level = [
+            *chain.from_iterable(map(dict.values, compress(level, map(dicts.__contains__, map(type, level))))),
+            *chain.from_iterable(compress(level, map(lists.__contains__, map(type, level)))),
+        ]
+    return True
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context) is not None
+            or self.ensure_ascii
+            or not self.compact
+            or not _floats_format_alike(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encode = self.encoder_class().default
+
+        def default(obj):
+            # DRF's encoder turns Decimals into floats
+            value = encode(obj)
+            if not _floats_format_alike(value):
+                raise ValueError('Float orjson would format differently.')
+            return value
+
+        try:
+            ret = orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
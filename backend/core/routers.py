@@ -0,0 +1,154 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+Reads go to a replica only inside a safe-method (GET/HEAD/OPTIONS) request,
+outside any transaction on the primary, when the requesting user hasn't
+written anything within REPLICA_PIN_SECONDS and the chosen replica's lag is
+under REPLICA_MAX_LAG_SECONDS. Everything else, including Celery tasks and
+management commands, uses the primary.
+
+Replicas are the aliases in DATABASE_REPLICAS. To try this locally, add a
+second SQLite alias pointing at a copy of the database (or at the same file)
+and list it there; with `'TEST': {'MIRROR': 'default'}` test runs read
+through it transparently.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+PRIMARY = 'default'
+
+_state = ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, read_only):
+        self.read_only = read_only
+        self.user_id = None
+        self.pinned = False
+        self.wrote = False
+
+    @property
+    def use_primary(self):
+        return not self.read_only or self.pinned or self.wrote
+
+
+def _pin_key(user_id):
+    return f'db:pin:user:{user_id}'
+
+
+@contextmanager
+def request_scope(read_only):
+    state = RoutingState(read_only)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+        if state.wrote and state.user_id is not None:
+            cache.set(_pin_key(state.user_id), 1, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+@contextmanager
+def use_primary():
+    """Route reads in this block to the primary."""
+    state = RoutingState(read_only=False)
+    token = _state.set(state)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+        outer = _state.get()
+        if outer is not None and state.wrote:
+            outer.wrote = True
+
+
+def bind_user(user_id):
+    """Attach the authenticated user to this request, honouring any write pin."""
+    state = _state.get()
+    if state is None or not getattr(settings, 'DATABASE_REPLICAS', None):
+        return
+    state.user_id = user_id
+    if state.read_only and cache.get(_pin_key(user_id)):
+        state.pinned = True
+
+
+class LagMonitor:
+    """Per-process cache of replica lag, re-measured at most every interval."""
+
+    QUERY = (
+        'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+    )
+
+    def __init__(self, timer=time.monotonic):
+        self.timer = timer
+        self._lag = {}  # alias -> (checked_at, seconds or None if unreachable)
+        self._lock = threading.Lock()
+
+    def measure(self, alias):
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(self.QUERY)
+            lag = cursor.fetchone()[0]
+        return float(lag or 0)
+
+    def lag(self, alias):
+        now = self.timer()
+        with self._lock:
+            cached = self._lag.get(alias)
+        if cached and now - cached[0] < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return cached[1]
+        try:
+            lag = self.measure(alias)
+        except Exception:
+            lag = None  # Unreachable replicas are skipped until the next check
+        with self._lock:
+            self._lag[alias] = (now, lag)
+        return lag
+
+    def healthy(self, alias):
+        lag = self.lag(alias)
+        return lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+lag_monitor = LagMonitor()
+
+
+class ReplicaRouter:
+    def _replicas(self):
+        return getattr(settings, 'DATABASE_REPLICAS', [])
+
+    def db_for_read(self, model, **hints):
+        replicas = self._replicas()
+        state = _state.get()
+        if not replicas or state is None or state.use_primary:
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        healthy = [alias for alias in replicas if lag_monitor.healthy(alias)]
+        return random.choice(healthy) if healthy else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *self._replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        return db not in self._replicas()
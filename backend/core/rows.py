@@ -0,0 +1,64 @@
+"""
+Copying model rows verbatim: between databases (shard moves) and in and out
+of compressed archive payloads (event archival), and deleting them in bulk
+once copied.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import sql
+
+
+def insert_raw(model, objs, using):
+    """
+    Insert `objs` the way Model.save(raw=True) would, in batches: values go
+    in exactly as they are, including primary keys and auto_now timestamps.
+    """
+    fields = model._meta.concrete_fields
+    batch_size = max(connections[using].ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        query = sql.InsertQuery(model)
+        query.insert_values(fields, objs[start:start + batch_size], raw=True)
+        query.get_compiler(using=using).execute_sql()
+
+
+def delete_in(model, values, using, field_name='pk'):
+    """
+    Delete the rows of `model` whose `field_name` is in `values`, in one
+    DELETE, without loading them, cascading or sending signals. Returns the
+    number of rows deleted. Callers delete referencing rows first.
+    """
+    if not values:
+        return 0
+    connection = connections[using]
+    field = model._meta.pk if field_name == 'pk' else model._meta.get_field(field_name)
+    params = [field.get_db_prep_value(value, connection) for value in values]
+    sql_query = 'DELETE FROM {} WHERE {} IN ({})'.format(
+        connection.ops.quote_name(model._meta.db_table),
+        connection.ops.quote_name(field.column),
+        ', '.join(['%s'] * len(params)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql_query, params)
+        return cursor.rowcount
+
+
+def pack(instance):
+    """Every column of `instance`, as compressed JSON."""
+    values = {
+        field.attname: field.value_from_object(instance)
+        for field in instance._meta.concrete_fields
+    }
+    return zlib.compress(json.dumps(values, cls=DjangoJSONEncoder).encode())
+
+
+def unpack(model, payload):
+    """An unsaved `model` instance from a `pack` payload."""
+    values = json.loads(zlib.decompress(payload))
+    return model(**{
+        field.attname: field.to_python(values[field.attname])
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    })
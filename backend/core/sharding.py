@@ -0,0 +1,161 @@
+"""
+Organization-based sharding.
+
+Tenant data (the apps in SHARDED_APPS) lives on the database the
+OrganizationShard directory names for its organization, or on `default` when
+there is no entry. Everything else, notably users, organizations and
+memberships, lives on `default`, the central database, and is mirrored onto
+each shard that needs it so that foreign keys and joins from tenant tables
+keep working there.
+
+TenantMixin activates the organization's shard once the membership is
+known, so every tenant query in a request goes to the right database.
+Outside requests, use `use_shard(shard_for(organization_id))`. The Django
+admin doesn't activate shards: it reads and writes tenant rows on `default`
+only, and hides organizations that live elsewhere (see core/admin.py).
+
+Every shard carries the full schema (`manage.py migrate --database=<alias>`)
+and, after `manage.py init_shard <alias>`, hands out ids from its own block
+so rows keep their primary keys when `manage.py move_organization` copies an
+organization across.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.exceptions import APIException
+
+CENTRAL = 'default'
+
+_current = ContextVar('shard', default=None)
+
+
+class OrganizationMoving(APIException):
+    status_code = 503
+    default_detail = 'This organization is being moved. Try again in a moment.'
+    default_code = 'organization_moving'
+
+
+def shards():
+    return getattr(settings, 'DATABASE_SHARDS', [CENTRAL])
+
+
+def is_tenant_model(model):
+    return model._meta.app_label in settings.SHARDED_APPS
+
+
+def _version_key(organization_id):
+    return f'shard:org:version:{organization_id}'
+
+
+def _directory_key(organization_id):
+    # Versioned, so a lookup that read the directory just before a move
+    # changed it can only put its stale entry under a key nobody reads any more
+    version = cache.get(_version_key(organization_id))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_version_key(organization_id), version, timeout=None):
+            version = cache.get(_version_key(organization_id), version)
+    return f'shard:org:{organization_id}:{version}'
+
+
+def read_directory(organization_id):
+    """Return (database alias, is_moving) from the directory table, bypassing the cache."""
+    from apps.organizations.models import OrganizationShard
+
+    entry = OrganizationShard.objects.using(CENTRAL).filter(
+        organization_id=organization_id
+    ).values_list('database', 'is_moving').first()
+    return tuple(entry) if entry else (CENTRAL, False)
+
+
+def lookup(organization_id):
+    """Return (database alias, is_moving) for the organization."""
+    key = _directory_key(organization_id)
+    entry = cache.get(key)
+    if entry is None:
+        entry = read_directory(organization_id)
+        cache.set(key, entry, timeout=settings.SHARD_DIRECTORY_TTL)
+    return tuple(entry)
+
+
+def shard_for(organization_id):
+    return lookup(organization_id)[0]
+
+
+def invalidate(organization_id):
+    cache.set(_version_key(organization_id), time.time_ns(), timeout=None)
+
+
+def current():
+    return _current.get() or CENTRAL
+
+
+@contextmanager
+def use_shard(alias):
+    token = _current.set(alias)
+    try:
+        yield alias
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def request_scope():
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def activate(organization_id, writing):
+    """Route the rest of this request's tenant queries to the organization's shard."""
+    alias, is_moving = lookup(organization_id)
+    if is_moving and writing:
+        raise OrganizationMoving()
+    _current.set(alias)
+    return alias
+
+
+def mirror(instance, alias):
+    """Copy a central row onto a shard as-is, without firing save() side effects."""
+    if alias == CENTRAL or alias not in connections:
+        return
+    instance.save_base(raw=True, using=alias)
+
+
+class ShardRouter:
+    """
+    Sends tenant models to the active shard. Returns None for everything
+    else, and for the default shard, so later routers (replicas) still apply.
+    """
+
+    def _db(self, model, hints):
+        if not is_tenant_model(model):
+            return None
+        alias = _current.get()
+        if alias is None:
+            instance = hints.get('instance')
+            alias = instance._state.db if instance is not None else None
+        return alias if alias != CENTRAL and alias in shards() else None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Central rows are mirrored onto every shard that references them
+        databases = {*shards(), *getattr(settings, 'DATABASE_REPLICAS', [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards carry the full schema; central tables hold mirrored rows
+        return None
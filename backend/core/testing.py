@@ -0,0 +1,52 @@
+"""
+Builders for tests: organizations with their admin, chefs, clients and
+events, and API clients authenticated as a user.
+"""
+import datetime
+from decimal import Decimal
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.chefs.models import ChefProfile
+from apps.clients.models import Client
+from apps.events.models import Event
+from apps.organizations.models import Organization, OrganizationMembership
+from apps.users.models import User
+
+
+def make_organization(name='Test Kitchen', timezone='America/New_York'):
+    """An organization and its admin user."""
+    organization = Organization.objects.create(name=name, timezone=timezone)
+    admin = User.objects.create_user(
+        f'admin@{organization.slug}.test', 'password', first_name='Ada', last_name='Admin', is_staff=True,
+    )
+    OrganizationMembership.objects.create(user=admin, organization=organization, role='admin')
+    return organization, admin
+
+
+def make_chef(organization, first_name='Carla', **fields):
+    user = User.objects.create_user(
+        f'{first_name.lower()}@{organization.slug}.test', 'password', first_name=first_name, last_name='Chef',
+    )
+    membership = OrganizationMembership.objects.create(user=user, organization=organization, role='chef')
+    return ChefProfile.objects.create(membership=membership, **fields)
+
+
+def make_client(organization, name='Grace Client', **fields):
+    return Client.objects.create(organization=organization, name=name, **fields)
+
+
+def make_event(client, chef=None, **fields):
+    fields.setdefault('date', datetime.date.today() + datetime.timedelta(days=7))
+    fields.setdefault('start_time', datetime.time(18))
+    fields.setdefault('guest_count', 8)
+    fields.setdefault('client_pay', Decimal('500'))
+    fields.setdefault('chef_pay', Decimal('200'))
+    return Event.objects.create(organization=client.organization, client=client, chef=chef, **fields)
+
+
+def api_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
@@ -0,0 +1,92 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+import redis
+from django.test import TestCase, SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from core import throttling
+from core.renderers import ORJSONRenderer
+from core.testing import api_client, make_organization
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class LocalSlidingWindowTests(SimpleTestCase):
+    def test_limits_and_slides(self):
+        clock = Clock(3600 * 1000)
+        window = throttling.LocalSlidingWindow(timer=clock)
+        self.assertEqual([window.hit('k', 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        # Half a window on, half of the previous window's hits still count
+        clock.now += 90
+        self.assertEqual([window.hit('k', 3, 60)[0] for _ in range(3)], [True, True, False])
+        clock.now += 120
+        self.assertTrue(window.hit('k', 3, 60)[0])
+
+    def test_idle_keys_are_dropped(self):
+        clock = Clock()
+        window = throttling.LocalSlidingWindow(timer=clock)
+        for i in range(1000):
+            window.hit(f'ip:{i}', 100, 60)
+        window.hit('user:1', 1000, 3600)
+        self.assertEqual(len(window.counters), 1001)
+
+        clock.now += 150
+        window.hit('ip:new', 100, 60)
+        # Two minute windows have passed, but not the hour one
+        self.assertEqual(set(window.counters), {'user:1', 'ip:new'})
+
+
+class RedisUnavailableTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization, cls.admin = make_organization()
+
+    def unreachable(self):
+        return throttling.RedisSlidingWindow(redis.Redis(port=1, socket_connect_timeout=0.05))
+
+    def test_falls_back_to_the_process_window(self):
+        backend = self.unreachable()
+        with self.assertLogs('core.throttling', 'WARNING'):
+            results = [backend.hit('k', 2, 60)[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+    def test_requests_are_served_without_redis(self):
+        backend = self.unreachable()
+        with mock.patch.object(throttling, '_backend', backend), self.assertLogs('core.throttling', 'WARNING'):
+            response = api_client(self.admin).get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeDRF(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_floats(self):
+        for value in (0.0, -0.0, 0.5, 1e-4, 123456789012345.6, 1e16, 1e-5, 1e-7, -2.5e20, 5e-324):
+            with self.subTest(value=value):
+                self.assertRendersLikeDRF({'rows': [{'value': value, 'tags': ('a', [value])}]})
+
+    def test_decimals_become_floats_like_drf(self):
+        self.assertRendersLikeDRF([Decimal('0.25'), Decimal('1E+16')])
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (float('nan'), float('inf'), Decimal('-Infinity')):
+            with self.subTest(value=value):
+                with self.assertRaisesMessage(ValueError, 'Out of range float values are not JSON compliant'):
+                    ORJSONRenderer().render({'rows': [{'value': value}]})
+
+    def test_keys_and_other_types(self):
+        self.assertRendersLikeDRF({1: 'a', 1e16: 'b', None: 'c', True: 'd'})
+        self.assertRendersLikeDRF({
+            'when': datetime.datetime(2030, 5, 1, 12, 30, 15, 250000, tzinfo=datetime.timezone.utc),
+            'big': 2 ** 70,
+            'text': 'line\u2028break',
+        })
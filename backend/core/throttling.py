@@ -1,7 +1,145 @@
-from rest_framework.throttling import AnonRateThrottle
+import logging
+import threading
+import time
 
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
-class AuthRateThrottle(AnonRateThrottle):
+from core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Sliding window counter: two fixed-window counters per key, with the
+# previous window weighted by how much of it still overlaps the sliding
+# window. Constant memory per key, and atomic because it runs as one script.
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_s = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local current = math.floor(now_s / window)
+local current_key = KEYS[1] .. ':' .. current
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (current - 1)) or '0')
+local count = tonumber(redis.call('GET', current_key) or '0')
+local elapsed = now_s - current * window
+local estimate = previous * (window - elapsed) / window + count
+if estimate >= limit then
+    local wait = window - elapsed
+    if count < limit and previous > 0 then
+        wait = wait - (limit - count) * window / previous
+    end
+    return {0, tostring(math.max(wait, 0))}
+end
+redis.call('INCR', current_key)
+redis.call('EXPIRE', current_key, window * 2)
+return {1, '0'}
+"""
+
+
+class RedisSlidingWindow:
+    """
+    The shared window. While Redis can't be reached, every request is still
+    throttled, by a window of this process's own.
+    """
+
+    def __init__(self, client, fallback=None):
+        from redis import RedisError
+
+        self.errors = RedisError
+        self.script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        self.fallback = fallback or LocalSlidingWindow()
+
+    def hit(self, key, limit, window):
+        try:
+            allowed, wait = self.script(keys=[f'throttle:{key}'], args=[limit, window])
+        except self.errors:
+            logger.warning('Throttling in process, Redis is unavailable', exc_info=True)
+            return self.fallback.hit(key, limit, window)
+        return bool(allowed), float(wait)
+
+
+class LocalSlidingWindow:
+    """
+    Same algorithm kept in process memory, for tests and local development.
+    Keys idle for two windows no longer count and are dropped, at most every
+    PRUNE_INTERVAL seconds.
+    """
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, timer=time.time):
+        self.timer = timer
+        self.counters = {}  # key -> (window id, count, previous count, window)
+        self.lock = threading.Lock()
+        self.pruned_at = timer()
+
+    def prune(self, now):
+        self.counters = {
+            key: counter for key, counter in self.counters.items()
+            if int(now // counter[3]) <= counter[0] + 1
+        }
+        self.pruned_at = now
+
+    def hit(self, key, limit, window):
+        now = self.timer()
+        current = int(now // window)
+        with self.lock:
+            if now - self.pruned_at >= self.PRUNE_INTERVAL:
+                self.prune(now)
+            window_id, count, previous, _ = self.counters.get(key, (current, 0, 0, window))
+            if window_id != current:
+                previous = count if window_id == current - 1 else 0
+                count = 0
+            elapsed = now - current * window
+            estimate = previous * (window - elapsed) / window + count
+            if estimate >= limit:
+                self.counters[key] = (current, count, previous, window)
+                wait = window - elapsed
+                if count < limit and previous:
+                    wait -= (limit - count) * window / previous
+                return False, max(wait, 0)
+            self.counters[key] = (current, count + 1, previous, window)
+            return True, 0
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        client = get_redis()
+        _backend = RedisSlidingWindow(client) if client else LocalSlidingWindow()
+    return _backend
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces DRF's cache-backed request history with a sliding window counter
+    shared by every worker through Redis.
+    """
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = get_backend().hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class AuthRateThrottle(SlidingWindowAnonRateThrottle):
     """
     Throttle for authentication endpoints (login, register, password reset).
     More restrictive than general anon throttle to prevent brute force attacks.
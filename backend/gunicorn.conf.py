@@ -0,0 +1,18 @@
+import os
+import shutil
+
+# Shared directory for prometheus_client multiprocess mode. Must be set before
+# workers fork so every worker writes its samples to the same place.
+multiproc_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+
+
+def on_starting(server):
+    # Stale files from a previous run would be summed into the new counters
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
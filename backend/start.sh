@@ -9,4 +9,4 @@ echo "Running migrations..."
 python manage.py migrate --noinput
 
 echo "Starting gunicorn on port ${PORT:-8000}..."
-exec gunicorn --bind 0.0.0.0:${PORT:-8000} --workers 2 --log-level info --access-logfile - --error-logfile - config.wsgi:application
+exec gunicorn --bind 0.0.0.0:${PORT:-8000} --workers 2 --worker-class uvicorn_worker.UvicornWorker --log-level info --access-logfile - --error-logfile - config.asgi:application
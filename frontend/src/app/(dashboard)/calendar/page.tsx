@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import Link from 'next/link';
 import { useAuth } from '@/contexts/AuthContext';
 import { api } from '@/lib/api';
@@ -25,14 +25,17 @@ export default function CalendarPage() {
   const year = currentDate.getFullYear();
   const month = currentDate.getMonth();
 
+  const loadEvents = useCallback(async () => {
+    const startDate = new Date(year, month, 1).toISOString().split('T')[0];
+    const endDate = new Date(year, month + 1, 0).toISOString().split('T')[0];
+    setEvents(await api.getCalendarEvents(startDate, endDate));
+  }, [year, month]);
+
   useEffect(() => {
     const fetchEvents = async () => {
       setLoading(true);
       try {
-        const startDate = new Date(year, month, 1).toISOString().split('T')[0];
-        const endDate = new Date(year, month + 1, 0).toISOString().split('T')[0];
-        const data = await api.getCalendarEvents(startDate, endDate);
-        setEvents(data);
+        await loadEvents();
       } catch (err) {
         setError('Failed to load calendar events');
         console.error(err);
@@ -42,7 +45,17 @@ export default function CalendarPage() {
     };
 
     fetchEvents();
-  }, [year, month]);
+  }, [loadEvents]);
+
+  // Reload the month when one of its events changes elsewhere
+  useEffect(() => {
+    const monthPrefix = `${year}-${String(month + 1).padStart(2, '0')}`;
+    return api.subscribeToEventChanges((change) => {
+      if (change.reset || change.dates?.some((d) => d.startsWith(monthPrefix))) {
+        loadEvents().catch(console.error);
+      }
+    });
+  }, [loadEvents, year, month]);
 
   const daysInMonth = new Date(year, month + 1, 0).getDate();
   const firstDayOfMonth = new Date(year, month, 1).getDay();
@@ -108,6 +108,10 @@ export default function DashboardPage() {
     };
 
     fetchDashboard();
+    // Refresh when events change elsewhere
+    return api.subscribeToEventChanges(() => {
+      fetchDashboard();
+    });
   }, [isAdmin]);
 
   if (loading) {
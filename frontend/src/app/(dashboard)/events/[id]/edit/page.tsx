@@ -76,10 +76,10 @@ export default function EditEventPage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [eventData, clientsData, chefsData] = await Promise.all([
-          api.getEvent(eventId),
-          api.getClients(),
-          api.getChefs(),
+        const [eventData, clientsData, chefsData] = await api.batch<[Event, Client[], Chef[]]>([
+          `/api/events/${eventId}/`,
+          '/api/clients/',
+          '/api/chefs/',
         ]);
 
         const startTime = from24Hour(eventData.start_time);
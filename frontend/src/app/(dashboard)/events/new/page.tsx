@@ -61,9 +61,9 @@ export default function NewEventPage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [clientsData, chefsData] = await Promise.all([
-          api.getClients(),
-          api.getChefs(),
+        const [clientsData, chefsData] = await api.batch<[Client[], Chef[]]>([
+          '/api/clients/',
+          '/api/chefs/',
         ]);
         setClients(clientsData);
         setChefs(chefsData.filter(c => c.is_active));
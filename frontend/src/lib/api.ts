@@ -114,6 +114,22 @@ class ApiClient {
     return response.json();
   }
 
+  // Several GET requests in one round trip. Resolves to the bodies in
+  // order, or rejects with the first request that failed.
+  async batch<T extends unknown[]>(paths: string[]): Promise<T> {
+    const { responses } = await this.request<{
+      responses: { status: number; body: Record<string, unknown> }[];
+    }>('/api/batch/', {
+      method: 'POST',
+      body: JSON.stringify({ requests: paths.map((path) => ({ path })), concurrent: true }),
+    });
+    const failed = responses.find((response) => response.status >= 400);
+    if (failed) {
+      throw new ApiError(failed.status, (failed.body?.detail as string) || 'Request failed', failed.body);
+    }
+    return responses.map((response) => response.body) as T;
+  }
+
   // Auth endpoints
   async login(email: string, password: string) {
     const data = await this.request<{ access: string; refresh: string }>(
@@ -317,10 +333,71 @@ class ApiClient {
     return this.request(`/api/events/${id}/cancel/`, { method: 'POST' });
   }
 
-  async getCalendarEvents(start: string, end: string, chefId?: number) {
-    const params = new URLSearchParams({ start, end });
+  async getCalendarMonth(year: number, month: number, chefId?: number) {
+    const params = new URLSearchParams();
     if (chefId) params.set('chef_id', String(chefId));
-    return this.request<import('@/types').CalendarEvent[]>(`/api/events/calendar/?${params}`);
+    const query = params.toString() ? `?${params}` : '';
+    return this.request<{ month: string; events: import('@/types').CalendarEvent[] }>(
+      `/api/events/calendar/${year}/${month}/${query}`
+    );
+  }
+
+  async getCalendarEvents(start: string, end: string, chefId?: number) {
+    // Fetch the cached month shards covering the range in parallel
+    const months: [number, number][] = [];
+    let [year, month] = start.split('-').map(Number);
+    const [endYear, endMonth] = end.split('-').map(Number);
+    while (year < endYear || (year === endYear && month <= endMonth)) {
+      months.push([year, month]);
+      [year, month] = month === 12 ? [year + 1, 1] : [year, month + 1];
+    }
+    const shards = await Promise.all(
+      months.map(([y, m]) => this.getCalendarMonth(y, m, chefId))
+    );
+    return shards
+      .flatMap((shard) => shard.events)
+      .filter((event) => {
+        const day = event.start.slice(0, 10);
+        return day >= start && day <= end;
+      });
+  }
+
+  // Live event changes over server-sent events. Returns a function that
+  // closes the stream.
+  subscribeToEventChanges(onChange: (change: import('@/types').EventChange) => void) {
+    let source: EventSource | null = null;
+    let closed = false;
+    let opened = false;
+
+    const connect = async () => {
+      try {
+        const { url } = await this.request<{ url: string }>('/api/events/stream/ticket/', {
+          method: 'POST',
+        });
+        if (closed) return;
+        source = new EventSource(`${API_URL}${url}`);
+        // Changes may have been missed while reconnecting
+        source.onopen = () => {
+          if (opened) onChange({ reset: true });
+          opened = true;
+        };
+        source.onmessage = (message) => onChange(JSON.parse(message.data));
+        source.onerror = () => {
+          // EventSource retries by itself until the ticket has expired
+          if (source?.readyState === EventSource.CLOSED && !closed) {
+            setTimeout(connect, 5000);
+          }
+        };
+      } catch {
+        if (!closed) setTimeout(connect, 30000);
+      }
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      source?.close();
+    };
   }
 
   // Dashboard
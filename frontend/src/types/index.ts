@@ -98,6 +98,15 @@ export interface Event {
   updated_at: string;
 }
 
+// Live event change notification (reset: refetch everything)
+export interface EventChange {
+  events?: number[];
+  dates?: string[];
+  chefs?: number[];
+  removed?: boolean;
+  reset?: boolean;
+}
+
 // Calendar event (FullCalendar format)
 export interface CalendarEvent {
   id: number;